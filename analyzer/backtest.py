@@ -0,0 +1,203 @@
+import hashlib
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from lag_regression import INPUT_PATH, TARGET, load_frame
+
+# 금통위 회의일마다 그 전까지 알 수 있던 정보만으로 delta_bok 모델을 다시 추정하고 결정을 예측하는 walk-forward 백테스트.
+#   - 회의 일정은 r_decision.ipynb 에 박혀 있던 리스트 대신 bok_meeting_dates.csv (date, kind)
+#   - point-in-time 행렬: 월 M 의 행 = (월 M - lag 의 설명변수, 월 M 의 delta_bok, 그 달 회의일).
+#     회의일에 쓰는 설명변수는 회의 달보다 lag 개월 앞선 값 (cor_reg.ipynb 의 X(t-1) 과 같은 정렬)
+#     입력 파일 + 회의 일정 + 설정의 sha1 을 키로 parquet 캐시
+#   - 모델은 상수항 포함 OLS. 첫 min_train 개월로 한 번 풀고, 그다음부터는 한 달씩 recursive least squares
+#     (Sherman-Morrison rank-one 갱신) 로 계수 / (X'X)^-1 / SSR 을 갱신하므로 회의마다 다시 fit 하지 않는다
+#   - 회의 달에는 갱신 전에 예측: 예측 분포 N(x'β, σ²(1 + x'(X'X)^-1 x)) 로 인하 / 동결 / 인상 확률
+#     (동결 구간 = ±step/2) -> 적중률(확률 최대 클래스 = 실제), Brier 점수 (세 클래스 합)
+# 월별 거시 자료의 공표 시차 / 사후 수정은 반영하지 않는다 (빈티지 자료 없음). 공표가 늦는 변수는 lag 를 늘려서 맞출 것.
+
+MEETINGS_PATH = 'bok_meeting_dates.csv'
+OUTPUT_PATH = 'backtest_results.csv'
+CACHE_DIR = 'backtest_cache'
+
+FEATURES = ('delta_bok', 'cpi_infl_gap', 'output_gap', 'tone')  # cor_reg.ipynb 의 feature_cols_selected
+LAG = 1
+MIN_TRAIN = 36  # 첫 추정에 쓰는 최소 개월 수
+STEP = 0.25  # 기준금리 조정 폭 (%p)
+CLASSES = ('cut', 'hold', 'hike')
+
+
+def load_meetings(path=MEETINGS_PATH, kinds=('regular',)) -> pd.DatetimeIndex:
+    """bok_meeting_dates.csv -> 회의일 (정렬). kinds=None 이면 임시회의 등 전부"""
+    meetings = pd.read_csv(path, encoding='utf-8-sig')
+    if kinds is not None:
+        meetings = meetings[meetings['kind'].isin(list(kinds))]
+    return pd.DatetimeIndex(pd.to_datetime(meetings['date']).sort_values().unique(), name='meeting_date')
+
+
+def point_in_time_matrix(df: pd.DataFrame, meetings: pd.DatetimeIndex, features=FEATURES, target: str = TARGET,
+                         lag: int = LAG) -> pd.DataFrame:
+    """
+    월별 df (PeriodIndex) -> 월별 point-in-time 행렬.
+    컬럼: month / meeting_date (그 달 첫 회의일, 없으면 NaT) / features (lag 개월 전 값) / target (그 달 값)
+    """
+    if lag < 1:
+        raise ValueError(f"lag 는 1 이상이어야 회의 전에 알 수 있는 값만 씀: {lag}")
+    index = pd.period_range(df.index.min(), df.index.max(), freq='M')
+    monthly = df.reindex(index)
+    pit = monthly[list(features)].shift(lag)
+    pit.columns = [f'x_{c}' for c in features]
+    pit.insert(0, 'y', monthly[target].to_numpy())
+    meeting_months = pd.Series(meetings, index=meetings.to_period('M'))
+    meeting_months = meeting_months[~meeting_months.index.duplicated()]
+    pit.insert(0, 'meeting_date', meeting_months.reindex(index).to_numpy())
+    pit.insert(0, 'month', index.to_timestamp())
+    return pit.reset_index(drop=True)
+
+
+def load_point_in_time(input_path=INPUT_PATH, meetings_path=MEETINGS_PATH, features=FEATURES, target=TARGET,
+                       lag=LAG, kinds=('regular',), cache_dir=CACHE_DIR) -> pd.DataFrame:
+    """point_in_time_matrix + parquet 캐시. 입력 파일이나 설정이 바뀌면 키가 바뀌어 새로 만든다"""
+    digest = hashlib.sha1()
+    for path in (input_path, meetings_path):
+        if Path(path).is_dir():  # feature_store 폴더
+            from feature_store import FeatureStore
+            digest.update(FeatureStore(path).fingerprint('monthly').encode('utf-8'))
+        else:
+            digest.update(Path(path).read_bytes())
+    digest.update(repr((tuple(features), target, lag, kinds)).encode('utf-8'))
+    cache_path = Path(cache_dir) / f'pit_{digest.hexdigest()[:16]}.parquet'
+    if cache_path.exists():
+        return pd.read_parquet(cache_path)
+    columns = list(dict.fromkeys(list(features) + [target]))
+    pit = point_in_time_matrix(load_frame(input_path, columns), load_meetings(meetings_path, kinds),
+                               features, target, lag)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    pit.to_parquet(cache_path, index=False)
+    return pit
+
+
+class RecursiveOLS:
+    """상수항 포함 OLS 를 한 행씩 갱신 (β, P = (X'X)^-1, SSR)"""
+
+    def __init__(self, X: np.ndarray, y: np.ndarray):
+        X = np.column_stack([np.ones(len(y)), X])
+        self.P = np.linalg.inv(X.T @ X)
+        self.beta = self.P @ (X.T @ y)
+        resid = y - X @ self.beta
+        self.ssr = float(resid @ resid)
+        self.n, self.k = X.shape
+
+    def update(self, x: np.ndarray, y: float):
+        x = np.concatenate([[1.0], x])
+        Px = self.P @ x
+        denom = 1.0 + x @ Px
+        error = y - x @ self.beta  # 갱신 전 예측 오차
+        gain = Px / denom
+        self.beta = self.beta + gain * error
+        self.P = self.P - np.outer(gain, Px)
+        self.ssr += error * error / denom
+        self.n += 1
+
+    def predict(self, x: np.ndarray):
+        """-> (예측값, 예측 분산 σ²(1 + x'Px))"""
+        x = np.concatenate([[1.0], x])
+        sigma2 = self.ssr / max(self.n - self.k, 1)
+        return float(x @ self.beta), float(sigma2 * (1.0 + x @ self.P @ x))
+
+
+def class_probabilities(mean, sd, step: float = STEP) -> np.ndarray:
+    """정규 예측 분포 -> [P(인하), P(동결), P(인상)] (동결 = |Δ| <= step/2)"""
+    p_cut = stats.norm.cdf(-step / 2, mean, sd)
+    p_hike = stats.norm.sf(step / 2, mean, sd)
+    return np.array([p_cut, 1.0 - p_cut - p_hike, p_hike])
+
+
+def classify(values, step: float = STEP) -> np.ndarray:
+    """실제 delta_bok -> 클래스 번호 (0: 인하, 1: 동결, 2: 인상)"""
+    values = np.asarray(values, dtype=np.float64)
+    return np.where(values < -step / 2, 0, np.where(values > step / 2, 2, 1))
+
+
+def walk_forward(pit: pd.DataFrame, min_train: int = MIN_TRAIN, step: float = STEP,
+                 meetings_only: bool = False) -> pd.DataFrame:
+    """
+    point-in-time 행렬 -> 회의별 예측표.
+    월 순서대로 (1) 회의 달이면 지금까지 추정한 모델로 예측 (2) 그 달 delta_bok 이 나오면 모델에 추가.
+    meetings_only=True 면 회의 달 행만 학습에 씀 (기본은 cor_reg 처럼 모든 달).
+    컬럼: meeting_date / month / n_train / actual / forecast / forecast_sd / p_cut / p_hold / p_hike /
+          actual_class / predicted_class / hit / brier
+    """
+    x_cols = [c for c in pit.columns if c.startswith('x_')]
+    X = pit[x_cols].to_numpy(dtype=np.float64)
+    y = pit['y'].to_numpy(dtype=np.float64)
+    is_meeting = pit['meeting_date'].notna().to_numpy()
+    complete = ~np.isnan(X).any(axis=1) & ~np.isnan(y)
+
+    model = None
+    pending = []  # 첫 추정 전까지 모으는 행 번호
+    rows = []
+    for t in range(len(pit)):
+        if is_meeting[t] and model is not None and complete[t]:
+            mean, var = model.predict(X[t])
+            probs = class_probabilities(mean, np.sqrt(var), step)
+            actual_class = int(classify(y[t], step))
+            rows.append({
+                'meeting_date': pit['meeting_date'].iloc[t],
+                'month': pit['month'].iloc[t],
+                'n_train': model.n,
+                'actual': y[t],
+                'forecast': mean,
+                'forecast_sd': np.sqrt(var),
+                'p_cut': probs[0], 'p_hold': probs[1], 'p_hike': probs[2],
+                'actual_class': CLASSES[actual_class],
+                'predicted_class': CLASSES[int(probs.argmax())],
+                'hit': int(probs.argmax()) == actual_class,
+                'brier': float(np.sum((probs - np.eye(len(CLASSES))[actual_class]) ** 2)),
+            })
+        if not complete[t] or (meetings_only and not is_meeting[t]):
+            continue
+        if model is not None:
+            model.update(X[t], y[t])
+            continue
+        pending.append(t)
+        if len(pending) >= max(min_train, len(x_cols) + 2):
+            design = np.column_stack([np.ones(len(pending)), X[pending]])
+            if np.linalg.matrix_rank(design) == design.shape[1]:
+                model = RecursiveOLS(X[pending], y[pending])
+    return pd.DataFrame(rows)
+
+
+def summarize(results: pd.DataFrame) -> pd.DataFrame:
+    """적중률 / Brier 점수. 비교용으로 '항상 동결' 예측도 같이"""
+    hold = np.array([0.0, 1.0, 0.0])
+    actual = np.eye(len(CLASSES))[results['actual_class'].map(CLASSES.index).to_numpy()]
+    return pd.DataFrame([
+        {'model': 'walk_forward', 'n_meetings': len(results), 'hit_rate': results['hit'].mean(),
+         'brier': results['brier'].mean()},
+        {'model': 'always_hold', 'n_meetings': len(results), 'hit_rate': (results['actual_class'] == 'hold').mean(),
+         'brier': np.mean(np.sum((actual - hold) ** 2, axis=1))},
+    ])
+
+
+def main(input_path=INPUT_PATH, meetings_path=MEETINGS_PATH, output_path=OUTPUT_PATH, lag=LAG, min_train=MIN_TRAIN):
+    pit = load_point_in_time(input_path, meetings_path, lag=lag)
+    results = walk_forward(pit, min_train=min_train)
+    results.to_csv(output_path, index=False, encoding='utf-8-sig')
+    summary = summarize(results)
+    print(f"[DONE] 회의 {len(results)}회 walk-forward -> {output_path}")
+    print(summary.to_string(index=False))
+    return results, summary
+
+
+# 사용법: python backtest.py [final_monthly_merged_renamed.csv] [bok_meeting_dates.csv] [출력 csv] [lag] [min_train]
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(args[0] if len(args) > 0 else INPUT_PATH,
+         args[1] if len(args) > 1 else MEETINGS_PATH,
+         args[2] if len(args) > 2 else OUTPUT_PATH,
+         int(args[3]) if len(args) > 3 else LAG,
+         int(args[4]) if len(args) > 4 else MIN_TRAIN)
@@ -0,0 +1,350 @@
+import hashlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# 월별 분석 변수 저장소 (data_merge_final.ipynb 의 문자열 정리 + final_monthly_merged_renamed.csv 를 대체).
+# 원천 파일(macro.csv / final_monthly_tone_index.csv / call_rate.csv)은 ingest 때 한 번만 파싱해서
+# 타입이 정해진 parquet 로 저장하고, 분석 쪽은 필요한 컬럼 / 기간만 읽는다.
+#   STORE_DIR/<dataset>/year=YYYY/month=MM/part.parquet    (dataset: monthly, call_rate)
+#   STORE_DIR/<dataset>/_manifest.json                      (달별 컬럼 값 해시)
+#   STORE_DIR/_schema.json                                  (dataset 별 컬럼 / 타입 / rename_map)
+# - 컬럼 이름은 ingest 때 RENAME_MAP 적용 (cor_reg 등에서 쓰는 영문 이름), 타입은 SCHEMA 로 고정
+# - macro.csv 에 RENAME_MAP 에 없는 컬럼이 있으면 (노트북처럼) 원래 이름 그대로 float64 로 monthly schema 에
+#   추가하고 _schema.json 에 남김. 이때 기존 파티션은 전부 새 컬럼(NaN)을 넣어 다시 씀
+# - 같은 달을 다시 넣으면 그 달 파티션만 병합해서 다시 씀 (넣은 컬럼만 새 값으로).
+#   넣은 값의 해시가 manifest 와 같은 달은 파일을 열지도 않음
+#   -> 새 달 추가 / 수정된 달 반영이 그 달 파일 몇 개만 건드림
+# - monthly 의 date 는 월초 Timestamp 로 저장하고 load 때 월 PeriodIndex 로 돌려줌
+
+STORE_DIR = 'feature_store'
+MACRO_PATH = 'macro.csv'
+TONE_PATH = 'final_monthly_tone_index.csv'
+CALL_RATE_PATH = '../db/rates/call_rate.csv'
+MERGED_PATH = 'final_monthly_merged_renamed.csv'
+
+RENAME_MAP = {
+    "경제정책 불확실성 지수(EPU)": "epu_index",
+    "기준 금리": "bok_rate",
+    "기준 금리.1": "delta_bok",  # 타겟
+    "뉴스심리지수": "news_sentiment",
+    "산업생산지수 갭": "output_gap",
+    "산업생산증가율": "ip_growth",
+    "인플레이션 갭(소비자물가지수)": "cpi_infl_gap",
+    "콜 금리": "call_rate_m",
+    "final_monthly_tone": "tone",
+}
+SCHEMA = {
+    'monthly': {'date': 'datetime64[ns]', **{c: 'float64' for c in RENAME_MAP.values()}},
+    'call_rate': {'date': 'datetime64[ns]', 'call_rate': 'float64'},
+}
+FREQ = {'monthly': 'MS', 'call_rate': 'D'}
+
+_MONTH_RE = re.compile(r"(\d{4})[-./년](\d{1,2})")
+_PART_RE = re.compile(r"year=(\d{4})[\\/]month=(\d{2})$")
+
+
+def _to_numeric_safe(s: pd.Series) -> pd.Series:
+    if s.dtype != object and str(s.dtype) not in ('str', 'string'):
+        return pd.to_numeric(s, errors="coerce")
+    return pd.to_numeric(
+        s.astype(str)
+         .str.replace(",", "", regex=False)
+         .str.replace("%", "", regex=False)
+         .str.strip(),
+        errors="coerce"
+    )
+
+
+def parse_month(values: pd.Series) -> pd.Series:
+    """'2012년 1월' / '2012.01' / '2012/1' / '2012-01-15' -> 월초 Timestamp (못 읽으면 NaT)"""
+    parts = values.astype(str).str.replace(" ", "", regex=False).str.extract(_MONTH_RE)
+    year = pd.to_numeric(parts[0], errors='coerce')
+    month = pd.to_numeric(parts[1], errors='coerce')
+    month = month.where((month >= 1) & (month <= 12))
+    return pd.to_datetime(pd.DataFrame({'year': year, 'month': month, 'day': 1}), errors='coerce')
+
+
+class FeatureStore:
+    def __init__(self, root=STORE_DIR):
+        self.root = Path(root)
+        # SCHEMA + 예전 ingest 때 추가된 컬럼 (_schema.json)
+        self.schema = {dataset: dict(columns) for dataset, columns in SCHEMA.items()}
+        schema_path = self.root / '_schema.json'
+        if schema_path.exists():
+            stored = json.loads(schema_path.read_text(encoding='utf-8'))['datasets']
+            for dataset, columns in stored.items():
+                for col, dtype in columns.items():
+                    self.schema.setdefault(dataset, {}).setdefault(col, dtype)
+
+    # ---------- 쓰기 ----------
+    def _partition_path(self, dataset: str, year: int, month: int) -> Path:
+        return self.root / dataset / f'year={year:04d}' / f'month={month:02d}' / 'part.parquet'
+
+    def conform(self, frame: pd.DataFrame, dataset: str, extend: bool = False) -> pd.DataFrame:
+        """
+        schema 컬럼만 / schema 타입으로. schema 에 없는 컬럼이 있으면 ValueError
+        (extend=True 면 float64 컬럼으로 schema 에 추가)
+        """
+        schema = self.schema[dataset]
+        unknown = [c for c in frame.columns if c not in schema]
+        if unknown and not extend:
+            raise ValueError(f"{dataset} schema 에 없는 컬럼: {unknown}")
+        if unknown:
+            print(f"[INFO] {dataset} schema 에 컬럼 추가: {unknown}")
+            schema.update({c: 'float64' for c in unknown})
+        if 'date' not in frame.columns:
+            raise ValueError(f"{dataset}: date 컬럼이 필요합니다")
+        frame = frame.copy()
+        for col in frame.columns:
+            frame[col] = frame[col].astype(schema[col]) if col != 'date' else pd.to_datetime(frame[col])
+        frame['date'] = frame['date'].dt.to_period('M').dt.start_time if FREQ[dataset] == 'MS' \
+            else frame['date'].dt.normalize()
+        frame['date'] = frame['date'].astype('datetime64[ns]')
+        return frame
+
+    def upsert(self, dataset: str, frame: pd.DataFrame, extend: bool = False) -> int:
+        """
+        frame(date + 일부 컬럼)을 저장. 같은 date 가 있으면 frame 에 있는 컬럼만 새 값으로 바꿈.
+        달마다 넣은 컬럼 값의 해시가 manifest 와 같으면 파일을 열지 않고 건너뜀.
+        extend=True 면 schema 에 없는 컬럼을 추가 (기존 파티션도 전부 그 컬럼을 넣어 다시 씀)
+        반환: 다시 쓴 파티션(달) 수
+        """
+        n_columns = len(self.schema[dataset])
+        frame = self.conform(frame, dataset, extend)
+        if frame['date'].duplicated().any():
+            print(f"[WARN] {dataset}: 같은 날짜 {int(frame['date'].duplicated().sum())}행 -> 마지막 값 사용")
+            frame = frame.drop_duplicates('date', keep='last')
+        frame = frame.sort_values('date')
+        schema = self.schema[dataset]
+        value_cols = [c for c in frame.columns if c != 'date']
+        manifest = self._read_manifest(dataset)
+
+        # 달마다 넣은 값의 해시를 manifest 와 비교해서 바뀐 달만 고름
+        dates = frame['date'].to_numpy(dtype='datetime64[ns]')
+        values = {c: frame[c].to_numpy(dtype=np.float64) for c in value_cols}
+        keys, bounds = _month_bounds(dates)
+        changed = {}
+        for key, lo, hi in zip(keys, bounds[:-1], bounds[1:]):
+            path = self._partition_path(dataset, int(key[:4]), int(key[5:]))
+            stored = manifest.get(key, {})
+            if path.exists() and all(stored.get(c) == _column_hash(dates[lo:hi], values[c][lo:hi]) for c in value_cols):
+                continue
+            changed[key] = path
+        if len(schema) > n_columns:
+            # 새 컬럼: 모든 파티션이 schema 의 컬럼을 다 갖도록 기존 달도 다시 씀
+            changed.update({f'{period.year:04d}-{period.month:02d}': path
+                            for period, path in self.partitions(dataset)})
+        if not changed:
+            return 0
+
+        # 바뀐 달의 기존 파일을 한 번에 읽어서 병합 (넣은 컬럼만 새 값으로)
+        new = frame[np.isin(_month_keys(dates), list(changed))].set_index('date')
+        existing = [pq.read_table(path).to_pandas() for path in changed.values() if path.exists()]
+        if existing:
+            merged = pd.concat(existing).set_index('date')
+            merged = merged.reindex(merged.index.union(new.index))
+            merged.loc[new.index, value_cols] = new[value_cols]
+        else:
+            merged = new
+        columns = [c for c in schema if c != 'date']
+        merged = merged.reindex(columns=columns).sort_index().astype({c: schema[c] for c in columns})
+
+        m_dates = merged.index.to_numpy(dtype='datetime64[ns]')
+        m_values = {c: merged[c].to_numpy(dtype=np.float64) for c in columns}
+        arrow_schema = self._arrow_schema(dataset)
+        m_keys, m_bounds = _month_bounds(m_dates)
+        for key, lo, hi in zip(m_keys, m_bounds[:-1], m_bounds[1:]):
+            path = changed[key]
+            table = pa.table({'date': m_dates[lo:hi], **{c: m_values[c][lo:hi] for c in columns}}, schema=arrow_schema)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix('.tmp')
+            pq.write_table(table, tmp)
+            os.replace(tmp, path)
+            manifest[key] = {c: _column_hash(m_dates[lo:hi], m_values[c][lo:hi]) for c in columns}
+        self._write_manifest(dataset, manifest)
+        self._write_schema()
+        return len(changed)
+
+    def _read_manifest(self, dataset: str) -> dict:
+        path = self.root / dataset / '_manifest.json'
+        return json.loads(path.read_text(encoding='utf-8')) if path.exists() else {}
+
+    def _write_manifest(self, dataset: str, manifest: dict):
+        path = self.root / dataset / '_manifest.json'
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(manifest, sort_keys=True, indent=1), encoding='utf-8')
+        os.replace(tmp, path)
+
+    def _write_schema(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        meta = {'datasets': self.schema, 'freq': FREQ, 'rename_map': RENAME_MAP}
+        (self.root / '_schema.json').write_text(json.dumps(meta, ensure_ascii=False, indent=1), encoding='utf-8')
+
+    def _arrow_schema(self, dataset: str) -> pa.Schema:
+        return pa.schema([(c, pa.timestamp('ns') if t.startswith('datetime') else pa.from_numpy_dtype(np.dtype(t)))
+                          for c, t in self.schema[dataset].items()])
+
+    # ---------- 읽기 ----------
+    def partitions(self, dataset: str, start=None, end=None) -> list:
+        """[(월 Period, 파일 경로), ...] (start / end: 'YYYY-MM' 등, 그 달 포함)"""
+        start = pd.Period(start, 'M') if start is not None else None
+        end = pd.Period(end, 'M') if end is not None else None
+        out = []
+        for path in (self.root / dataset).glob('year=*/month=*/part.parquet'):
+            m = _PART_RE.search(str(path.parent))
+            if not m:
+                continue
+            period = pd.Period(year=int(m.group(1)), month=int(m.group(2)), freq='M')
+            if (start is None or period >= start) and (end is None or period <= end):
+                out.append((period, path))
+        return sorted(out)
+
+    def load(self, dataset: str = 'monthly', columns=None, start=None, end=None) -> pd.DataFrame:
+        """
+        필요한 컬럼 / 기간만 읽기. monthly 는 월 PeriodIndex, call_rate 는 DatetimeIndex (이름 date).
+        start / end 는 날짜 단위까지 자름 (daily 데이터)
+        """
+        schema = self.schema[dataset]
+        columns = [c for c in schema if c != 'date'] if columns is None else list(columns)
+        unknown = [c for c in columns if c not in schema]
+        if unknown:
+            raise ValueError(f"{dataset} schema 에 없는 컬럼: {unknown}")
+        tables = [pq.read_table(path, columns=['date'] + columns) for _, path in self.partitions(dataset, start, end)]
+        if tables:
+            df = pa.concat_tables(tables).to_pandas()
+        else:
+            df = pd.DataFrame({c: pd.Series(dtype=schema[c]) for c in ['date'] + columns})
+        if FREQ[dataset] != 'MS':
+            if start is not None:
+                df = df[df['date'] >= pd.Timestamp(start)]
+            if end is not None:
+                df = df[df['date'] <= pd.Timestamp(end)]
+        df = df.set_index('date').sort_index()
+        if FREQ[dataset] == 'MS':
+            df.index = df.index.to_period('M')
+        return df
+
+    def asof(self, left: pd.DataFrame, dataset: str = 'call_rate', columns=None, on: str = 'date',
+             direction: str = 'backward', tolerance=None) -> pd.DataFrame:
+        """
+        left 의 각 날짜에 그 시점 기준 값 붙이기 (pd.merge_asof). backward: 그날 또는 그 이전 마지막 값.
+        monthly 는 월초 날짜 기준 (그 달 값은 그 달 1일부터 있는 것으로 봄)
+        """
+        right = self.load(dataset, columns)
+        if isinstance(right.index, pd.PeriodIndex):
+            right.index = right.index.to_timestamp()
+        right = right.reset_index().rename(columns={'date': on}).dropna(subset=list(right.columns), how='all')
+        index = left.index
+        left = left.reset_index(drop=True)
+        left[on] = pd.to_datetime(left[on]).astype('datetime64[ns]')
+        order = np.argsort(left[on].to_numpy(), kind='stable')
+        merged = pd.merge_asof(left.iloc[order], right, on=on, direction=direction,
+                               tolerance=pd.Timedelta(tolerance) if tolerance is not None else None)
+        merged.index = order
+        merged = merged.sort_index()
+        merged.index = index
+        return merged
+
+    def fingerprint(self, dataset: str = 'monthly') -> str:
+        """manifest(달별 컬럼 해시)의 sha1 (캐시 키용). 내용이 바뀐 달이 있을 때만 바뀜"""
+        manifest = json.dumps(self._read_manifest(dataset), sort_keys=True)
+        return hashlib.sha1(f'{dataset}:{manifest}'.encode('utf-8')).hexdigest()
+
+
+def _month_keys(dates: np.ndarray) -> np.ndarray:
+    """datetime64 배열 -> 'YYYY-MM' 문자열 배열"""
+    return np.datetime_as_string(dates.astype('datetime64[M]'), unit='M')
+
+
+def _month_bounds(dates: np.ndarray):
+    """정렬된 날짜 -> (달 키 목록, 경계 위치). 달 i 는 [bounds[i], bounds[i + 1])"""
+    keys, starts = np.unique(_month_keys(dates), return_index=True)
+    return keys, np.append(starts, len(dates))
+
+
+def _column_hash(dates: np.ndarray, values: np.ndarray) -> str:
+    """(date, 값) 쌍의 sha1. 날짜가 다르거나 값이 하나라도 다르면 달라짐 (NaN 포함)"""
+    digest = hashlib.sha1(np.ascontiguousarray(dates, dtype='datetime64[ns]').tobytes())
+    digest.update(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+# ---------- 원천 파일 ingest ----------
+def read_macro(path=MACRO_PATH) -> pd.DataFrame:
+    """macro.csv -> date + 숫자형 컬럼 (RENAME_MAP 에 있으면 영문 이름, 없으면 원래 이름 그대로)"""
+    macro = pd.read_csv(path, encoding="utf-8-sig")
+    macro.columns = macro.columns.str.strip()
+    macro['date'] = parse_month(macro['Date'])
+    macro = macro.dropna(subset=['date']).drop(columns=['Date'])
+    macro = macro.rename(columns=RENAME_MAP)
+    for c in macro.columns.drop('date'):
+        macro[c] = _to_numeric_safe(macro[c])
+    return macro
+
+
+def read_tone(path=TONE_PATH) -> pd.DataFrame:
+    """final_monthly_tone_index.csv -> date / tone (z_ 컬럼 제외)"""
+    tone = pd.read_csv(path, encoding="utf-8-sig")
+    tone.columns = tone.columns.str.strip()
+    tone['date'] = pd.to_datetime(tone['date'], errors='coerce')
+    tone = tone.dropna(subset=['date'])
+    return tone.rename(columns=RENAME_MAP)[['date', 'tone']]
+
+
+def read_call_rate(path=CALL_RATE_PATH) -> pd.DataFrame:
+    """call_rate.csv ('2012.01.02', call_rate) -> 일별 date / call_rate"""
+    rate_df = pd.read_csv(path)
+    rate_df['date'] = pd.to_datetime(rate_df['date'].str.replace('.', '-'))
+    return rate_df[['date', 'call_rate']].sort_values('date')
+
+
+def ingest(store: FeatureStore, macro_path=MACRO_PATH, tone_path=TONE_PATH, call_rate_path=CALL_RATE_PATH) -> dict:
+    """있는 원천 파일만 반영. 반환: 원천별 다시 쓴 파티션 수"""
+    # macro 는 노트북처럼 모든 컬럼을 유지 (이름 표에 없는 컬럼은 schema 에 추가)
+    sources = (('macro', 'monthly', read_macro, macro_path, True),
+               ('tone', 'monthly', read_tone, tone_path, False),
+               ('call_rate', 'call_rate', read_call_rate, call_rate_path, False))
+    written = {}
+    for name, dataset, reader, path, extend in sources:
+        if path is None or not Path(path).exists():
+            print(f"[WARN] {name} 파일 없음 -> 건너뜀: {path}")
+            continue
+        written[name] = store.upsert(dataset, reader(path), extend)
+        print(f"[INFO] {name}: 파티션 {written[name]}개 갱신")
+    return written
+
+
+def export_merged(store: FeatureStore, output_path=MERGED_PATH) -> pd.DataFrame:
+    """예전 노트북 산출물(final_monthly_merged_renamed.csv) 형식으로 내보내기"""
+    df = store.load('monthly')
+    df.reset_index().to_csv(output_path, index=False, encoding="utf-8-sig")
+    return df
+
+
+# 사용법:
+#   python feature_store.py ingest [macro.csv] [final_monthly_tone_index.csv] [call_rate.csv]
+#   python feature_store.py export [final_monthly_merged_renamed.csv]
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else 'ingest'
+    store = FeatureStore()
+    if command == 'ingest':
+        args = sys.argv[2:]
+        ingest(store,
+               args[0] if len(args) > 0 else MACRO_PATH,
+               args[1] if len(args) > 1 else TONE_PATH,
+               args[2] if len(args) > 2 else CALL_RATE_PATH)
+        df = store.load('monthly')
+        print(f"[DONE] 기간: {df.index.min()} ~ {df.index.max()} / {len(df)}개월 -> {STORE_DIR}")
+    else:
+        output_path = sys.argv[2] if len(sys.argv) > 2 else MERGED_PATH
+        export_merged(store, output_path)
+        print(f"✅ 저장 완료: {output_path}")
@@ -0,0 +1,279 @@
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+# 시차(lag) x 변수 조합(subset) OLS 를 한꺼번에 푸는 모듈 (cor_reg.ipynb 의 run_final_analysis 를 여러 모델로 확장).
+# 노트북은 shift(1) 하나, |corr| >= 0.2 로 고른 변수 하나의 조합만 statsmodels 로 한 번씩 fit 했는데,
+# 여기서는
+#   - 시차별로 shift 한 설명변수 텐서 (lag x 월 x 변수) 를 한 번만 만들고
+#   - 같은 행(dropna 결과)과 같은 변수 개수를 쓰는 모델끼리 묶어 (모델 x 월 x 변수) 배열로 쌓은 다음
+#   - np.linalg.qr 배치 분해로 계수 / 표준오차를 한꺼번에 구한다.
+# 값은 statsmodels OLS 와 같은 식:
+#   R² = 1 - SSR / 중심화 TSS,  adj R² = 1 - (n - 1) / (n - p) * (1 - R²)
+#   llf = -n/2 * (log(2π) + log(SSR / n) + 1),  AIC = -2 llf + 2p,  BIC = -2 llf + log(n) p   (p: 상수항 포함)
+#   nonrobust: cov = (X'X)^-1 * SSR / (n - p), p-value 는 t(n - p)
+#   HC1:       cov = (X'X)^-1 X' diag(e²) X (X'X)^-1 * n / (n - p), p-value 는 정규분포 (statsmodels 기본값)
+# features 에 target(delta_bok) 을 넣으면 ΔBOK(t-lag) 가 설명변수로 들어가고 y 는 shift 하지 않은 ΔBOK(t).
+# (노트북은 df_ana[feature_cols].shift(1) 에서 y 컬럼까지 같이 밀려서 ΔBOK(t-1) 을 자기 자신에 회귀하고 있었음)
+# 변수끼리 완전 공선이라 rank 가 모자라는 모델은 (statsmodels 의 pinv 대신) 결과를 NaN 으로 둔다.
+
+INPUT_PATH = 'final_monthly_merged_renamed.csv'
+OUTPUT_PATH = 'lag_regression_results.csv'
+
+TARGET = 'delta_bok'
+LAGS = tuple(range(1, 13))
+MODELS_PER_CHUNK = 2048  # QR 한 번에 쌓는 모델 수 (모델 x 월 x 변수 배열 크기)
+RANK_TOL = 1e-10
+
+_worker = {}
+
+
+def _to_numeric_safe(s: pd.Series) -> pd.Series:
+    return pd.to_numeric(
+        s.astype(str)
+         .str.replace(",", "", regex=False)
+         .str.replace("%", "", regex=False)
+         .str.strip(),
+        errors="coerce"
+    )
+
+
+def load_frame(path=INPUT_PATH, columns=None, start=None, end=None) -> pd.DataFrame:
+    """
+    final_monthly_merged_renamed.csv -> 월 PeriodIndex, 숫자 컬럼만 (z_ 컬럼 제외, cor_reg.ipynb 와 같음).
+    path 가 feature_store 폴더면 다시 파싱하지 않고 columns / start~end 만 읽음
+    """
+    if Path(path).is_dir():
+        from feature_store import FeatureStore  # pyarrow 는 feature_store 폴더를 읽을 때만 필요
+        return FeatureStore(path).load('monthly', columns, start, end)
+    df = pd.read_csv(path)
+    df.columns = df.columns.str.strip()
+    df["date"] = pd.to_datetime(df["date"], errors="coerce").dt.to_period("M")
+    df = df.dropna(subset=["date"]).sort_values("date").set_index("date")
+    for c in df.columns:
+        if df[c].dtype == object:
+            df[c] = _to_numeric_safe(df[c])
+    df = df.select_dtypes(include=[np.number])
+    df = df.drop(columns=[c for c in df.columns if c.lower().startswith("z_")])
+    if columns is not None:
+        df = df[list(columns)]
+    return df.loc[start:end] if start is not None or end is not None else df
+
+
+def build_design(df: pd.DataFrame, target: str, features, lags=LAGS):
+    """
+    -> (y (월,), X (lag x 월 x 변수), lags 배열).
+    X[i] 는 features 를 shift(lags[i]) 한 값 (y 는 그대로). 결측은 NaN 으로 남겨 두고 모델마다 dropna
+    """
+    lags = np.asarray(lags, dtype=np.int64)
+    values = df[list(features)].to_numpy(dtype=np.float64)
+    X = np.full((len(lags), len(df), values.shape[1]), np.nan)
+    for i, lag in enumerate(lags):
+        if lag < len(df):
+            X[i, lag:] = values[:len(df) - lag]
+    return df[target].to_numpy(dtype=np.float64), X, lags
+
+
+def subsets(features, min_size: int = 1, max_size: int = None, always=()) -> list:
+    """
+    features 의 변수 조합 목록 (각 조합은 변수 이름 튜플). always 의 변수는 모든 조합에 들어감.
+    예: always=('delta_bok',) 면 노트북처럼 ΔBOK(t-1) 을 항상 포함
+    """
+    always = [f for f in features if f in set(always)]
+    rest = [f for f in features if f not in set(always)]
+    max_size = len(features) if max_size is None else max_size
+    out = []
+    for k in range(max(min_size - len(always), 0), min(max_size - len(always), len(rest)) + 1):
+        for combo in combinations(rest, k):
+            if always or combo:
+                out.append(tuple(f for f in features if f in set(always) | set(combo)))
+    return out
+
+
+def fit_models(X: np.ndarray, y: np.ndarray, cols: np.ndarray, cov_type: str = 'nonrobust') -> dict:
+    """
+    같은 행을 쓰는 모델 묶음 OLS.
+    X: (n, 상수항 포함 변수), y: (n,), cols: (모델 x p) 각 모델이 쓰는 X 열 번호 (같은 p).
+    -> {'params', 'bse', 'ssr', 'r2', 'adj_r2', 'llf', 'aic', 'bic'} (모델 축이 첫 번째)
+    """
+    n, p = len(y), cols.shape[1]
+    XS = np.ascontiguousarray(np.moveaxis(X[:, cols], 0, 1))  # (모델, n, p)
+    q, r = np.linalg.qr(XS)
+    diag = np.abs(np.diagonal(r, axis1=1, axis2=2))
+    deficient = diag.min(axis=1) <= RANK_TOL * np.maximum(np.linalg.norm(XS, axis=1).max(axis=1), 1.0)
+    r[deficient] = np.eye(p)
+
+    params = np.linalg.solve(r, np.einsum('mnp,n->mp', q, y)[..., None])[..., 0]
+    resid = y - np.einsum('mnp,mp->mn', XS, params)
+    ssr = np.einsum('mn,mn->m', resid, resid)
+    r_inv = np.linalg.inv(r)
+    xtx_inv = r_inv @ np.swapaxes(r_inv, 1, 2)
+    df_resid = max(n - p, 1)
+    if cov_type == 'nonrobust':
+        cov = xtx_inv * (ssr / df_resid)[:, None, None]
+    elif cov_type == 'HC1':
+        meat = np.einsum('mnp,mn,mnq->mpq', XS, resid ** 2, XS)
+        cov = xtx_inv @ meat @ xtx_inv * (n / df_resid)
+    else:
+        raise ValueError(f"cov_type 은 'nonrobust' 또는 'HC1': {cov_type}")
+
+    centered_tss = np.sum((y - y.mean()) ** 2)
+    r2 = 1 - ssr / centered_tss
+    llf = -n / 2 * (np.log(2 * np.pi) + np.log(ssr / n) + 1)
+    result = {
+        'params': params,
+        'bse': np.sqrt(np.diagonal(cov, axis1=1, axis2=2)),
+        'ssr': ssr,
+        'r2': r2,
+        'adj_r2': 1 - (n - 1) / df_resid * (1 - r2),
+        'llf': llf,
+        'aic': -2 * llf + 2 * p,
+        'bic': -2 * llf + np.log(n) * p,
+    }
+    for value in result.values():
+        value[deficient] = np.nan
+    return result
+
+
+def _standardize(X: np.ndarray, columns):
+    """노트북의 standardize_cols 와 같이, 쓰는 행 기준 z-score (ddof=0, 표준편차 0 이면 그대로)"""
+    X = X.copy()
+    for c in columns:
+        std = X[:, c].std()
+        if std == 0 or np.isnan(std):
+            continue
+        X[:, c] = (X[:, c] - X[:, c].mean()) / std
+    return X
+
+
+def _init_worker(y, X, lags, model_cols, standardize_idx, cov_type):
+    _worker.update(y=y, X=X, lags=lags, model_cols=model_cols, standardize_idx=standardize_idx, cov_type=cov_type)
+
+
+def fit_lag(i: int):
+    """
+    (프로세스 풀에서 실행) lag 하나의 모든 모델 -> (lag, 모델별 결과 dict, 모델별 nobs, 첫 행, 마지막 행)
+    model_cols 의 열 번호는 상수항이 0, features 가 1부터. 길이가 다른 조합은 -1 로 채움
+    """
+    y, model_cols, cov_type = _worker['y'], _worker['model_cols'], _worker['cov_type']
+    n_models, n_cols = len(model_cols), _worker['X'].shape[2] + 1
+    X = np.column_stack([np.ones(len(y)), _worker['X'][i]])
+
+    # 모델별로 쓰는 행 (y 와 그 모델 변수가 모두 있는 달) -> 같은 행 / 같은 변수 개수끼리 묶음
+    used = np.zeros((n_models, n_cols), dtype=bool)
+    rows, slots = np.nonzero(model_cols >= 0)
+    used[rows, model_cols[rows, slots]] = True
+    bad = np.isnan(X).astype(np.int64) @ used.T.astype(np.int64) > 0
+    masks = ~bad & ~np.isnan(y)[:, None]
+    sizes = used.sum(axis=1)
+    _, group = np.unique(np.vstack([masks, sizes[None, :]]).T, axis=0, return_inverse=True)
+    group = group.ravel()
+
+    keys = ('params', 'bse', 'ssr', 'r2', 'adj_r2', 'llf', 'aic', 'bic')
+    out = {k: np.full((n_models, n_cols) if k in ('params', 'bse') else n_models, np.nan) for k in keys}
+    for g in np.unique(group):
+        members = np.flatnonzero(group == g)
+        mask = masks[:, members[0]]
+        p = sizes[members[0]]
+        if mask.sum() <= p:  # 관측치가 변수 수 이하면 fit 불가 -> NaN
+            continue
+        Xg = _standardize(X[mask], _worker['standardize_idx'])
+        for s in range(0, len(members), MODELS_PER_CHUNK):
+            chunk = members[s:s + MODELS_PER_CHUNK]
+            cols = model_cols[chunk, :p]
+            res = fit_models(Xg, y[mask], cols, cov_type)
+            for k in keys:
+                if k in ('params', 'bse'):
+                    out[k][chunk[:, None], cols] = res[k]
+                else:
+                    out[k][chunk] = res[k]
+    nobs = masks.sum(axis=0)
+    first = np.where(nobs > 0, masks.argmax(axis=0), -1)
+    last = np.where(nobs > 0, len(y) - 1 - masks[::-1].argmax(axis=0), -1)
+    return _worker['lags'][i], out, nobs, first, last
+
+
+def search(df: pd.DataFrame, target: str = TARGET, features=None, lags=LAGS, models=None, min_size: int = 1,
+           max_size: int = None, always=(), cov_type: str = 'nonrobust', standardize_cols=None,
+           workers: int = 1) -> pd.DataFrame:
+    """
+    lag x 변수 조합 OLS 결과표 (한 행 = 모델).
+    컬럼: lag / variables / n_vars / nobs / start / end / r2 / adj_r2 / aic / bic /
+          coef_{변수} / t_{변수} / p_{변수} (상수항은 const, 모델에 없는 변수는 NaN)
+    - features 기본값: target 을 포함한 df 의 모든 컬럼 (target 자신은 ΔBOK(t-lag) 로 들어감)
+    - models 를 주면 그 조합들만, 아니면 subsets(features, min_size, max_size, always) 전부
+    - standardize_cols: 노트북처럼 모델이 쓰는 행 기준으로 z-score 할 변수 (계수만 바뀜)
+    - workers > 1 이면 lag 마다 프로세스 풀에 나눠서 계산
+    """
+    features = list(df.columns) if features is None else list(features)
+    models = subsets(features, min_size, max_size, always) if models is None else [tuple(m) for m in models]
+    position = {f: j + 1 for j, f in enumerate(features)}
+    model_cols = np.full((len(models), max(len(m) for m in models) + 1), -1, dtype=np.int64)
+    for i, m in enumerate(models):
+        model_cols[i, :len(m) + 1] = [0] + [position[f] for f in m]
+    standardize_idx = [position[c] for c in (standardize_cols or ()) if c in position]
+
+    y, X, lags = build_design(df, target, features, lags)
+    print(f"[INFO] lag {len(lags)}개 x 모델 {len(models):,}개 = {len(lags) * len(models):,}개 OLS")
+    init_args = (y, X, lags, model_cols, standardize_idx, cov_type)
+    if workers == 1 or len(lags) == 1:
+        _init_worker(*init_args)
+        results = list(map(fit_lag, range(len(lags))))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init_args) as pool:
+            results = list(pool.map(fit_lag, range(len(lags))))
+
+    names = ['const'] + features
+    index = df.index
+    tables = []
+    for lag, out, nobs, first, last in results:
+        n_params = (model_cols >= 0).sum(axis=1)
+        tvalues = out['params'] / out['bse']
+        if cov_type == 'nonrobust':
+            pvalues = 2 * stats.t.sf(np.abs(tvalues), np.maximum(nobs - n_params, 1)[:, None])
+        else:
+            pvalues = 2 * stats.norm.sf(np.abs(tvalues))
+        table = pd.DataFrame({
+            'lag': lag,
+            'variables': ['+'.join(m) for m in models],
+            'n_vars': [len(m) for m in models],
+            'nobs': nobs,
+            'start': [index[i] if i >= 0 else None for i in first],
+            'end': [index[i] if i >= 0 else None for i in last],
+            'r2': out['r2'],
+            'adj_r2': out['adj_r2'],
+            'aic': out['aic'],
+            'bic': out['bic'],
+        })
+        coef = pd.DataFrame(out['params'], columns=[f'coef_{c}' for c in names])
+        t = pd.DataFrame(tvalues, columns=[f't_{c}' for c in names])
+        p = pd.DataFrame(pvalues, columns=[f'p_{c}' for c in names])
+        tables.append(pd.concat([table, coef, t, p], axis=1))
+    return pd.concat(tables, ignore_index=True)
+
+
+def main(input_path=INPUT_PATH, output_path=OUTPUT_PATH, max_lag=LAGS[-1], cov_type='HC1', workers=None):
+    df = load_frame(input_path)
+    results = search(df, TARGET, lags=range(1, max_lag + 1), always=(TARGET,), cov_type=cov_type,
+                     workers=workers or os.cpu_count())
+    results = results.sort_values('aic').reset_index(drop=True)
+    results.to_csv(output_path, index=False, encoding='utf-8-sig')
+    best = results.iloc[0]
+    print(f"[DONE] {len(results):,}개 모델 -> {output_path}")
+    print(f"AIC 최소: lag {best['lag']} | {best['variables']} | R²={best['r2']:.4f} | AIC={best['aic']:.2f}")
+    return results
+
+
+# 사용법: python lag_regression.py [final_monthly_merged_renamed.csv] [출력 csv] [최대 lag] [nonrobust|HC1]
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(args[0] if len(args) > 0 else INPUT_PATH,
+         args[1] if len(args) > 1 else OUTPUT_PATH,
+         int(args[2]) if len(args) > 2 else LAGS[-1],
+         args[3] if len(args) > 3 else 'HC1')
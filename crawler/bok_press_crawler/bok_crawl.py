@@ -3,8 +3,14 @@ from bs4 import BeautifulSoup
 from urllib.parse import urljoin #상대경로 완전한 url로
 import html
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # crawler/ 공용 모듈
+from pdf_downloader import PdfDownloader, make_session
+from http_cache import HttpCache, ttl_for_period
 
 
 BASE_URL ="https://www.bok.or.kr"
@@ -25,10 +31,14 @@ def make_year_url(year):
 def make_download_url():
     return BASE_URL+ download_path
 
-def fetch_year_html(year):
+def fetch_year_html(year, session=None, cache=None):
     url = make_year_url(year)
     headers = {"User-agent": "Mozilla/5.0"}
-    r = requests.get(url, headers=headers, timeout=30)
+    if cache is not None:
+        # 지난 연도 목록은 더 바뀌지 않으므로 만료 없음, 올해만 재검증
+        r = cache.get(url, headers=headers, timeout=30, ttl=ttl_for_period(date(year, 12, 31)))
+    else:
+        r = (session or requests).get(url, headers=headers, timeout=30)
     r.raise_for_status()
     return r.text
 
@@ -67,49 +77,38 @@ def extract_pdf_link(html_text):
 
     return result
 
-def collect_year_link(year):
-    html_text = fetch_year_html(year)
+def collect_year_link(year, session=None, cache=None):
+    html_text = fetch_year_html(year, session, cache)
     links = extract_pdf_link(html_text)
     return links
 
 
 #실행부
 if __name__ == "__main__":
-    
-    pdf_links = []
 
-    for year in range(2012, 2026):  # 2005~2025
-        links = collect_year_link(year)
+    years = range(2012, 2026)  # 2005~2025
+    max_workers = 8
+    session = make_session(pool_size=max_workers)
+    # --offline: 네트워크 없이 캐시된 목록 페이지만 재생
+    cache = HttpCache("http_cache.sqlite", session=session, offline="--offline" in sys.argv)
+
+    # 연도 페이지 병렬 수집 (결과는 연도 순서대로)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        year_links = list(executor.map(lambda y: collect_year_link(y, session, cache), years))
+    print("CACHE:", cache.stats())
+
+    pdf_links = []
+    for year, links in zip(years, year_links):
         print(year, "count:", len(links))
         pdf_links.extend([(year, name, url) for (name, url) in links])
 
     print("TOTAL:", len(pdf_links))
 
     save_root = "bok_pdfs"
-    os.makedirs(save_root, exist_ok=True)
-
-    
-    save_root = "bok_pdfs"
-    os.makedirs(save_root, exist_ok=True)
 
-    headers = {"User-Agent": "Mozilla/5.0"}
-
-    for year, name, url in pdf_links:
-        year_dir = os.path.join(save_root, str(year))
-        os.makedirs(year_dir, exist_ok=True)
-
-        file_path = os.path.join(year_dir, name)
-
-        # 이미 받았으면 건너뛰기
-        if os.path.exists(file_path):
-            continue
-
-        r = requests.get(url, headers=headers, timeout=60)
-        r.raise_for_status()
-
-        with open(file_path, "wb") as f:
-            f.write(r.content)
-
-        print("downloaded:", file_path, "bytes:", len(r.content))
-    
+    # 이미 받은 파일은 manifest(size, sha256) 기준으로 건너뛰고, 받다 만 .part 는 이어받기
+    downloader = PdfDownloader(save_root, session=session, max_workers=max_workers)
+    jobs = [(url, os.path.join(save_root, str(year), name)) for year, name, url in pdf_links]
+    summary = downloader.download_all(jobs)
 
+    print("DONE:", summary)
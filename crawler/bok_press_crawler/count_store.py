@@ -0,0 +1,181 @@
+import csv
+import os
+import time
+from array import array
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+# 문서별 토큰 빈도를 (doc_id, token_id, count) int32 세 컬럼의 Parquet 파일들로 저장.
+# (token, pos) 문자열은 vocab.csv 에 한 번만 저장하고 정수 id 로 참조한다.
+COUNT_SCHEMA = pa.schema([
+    ("doc_id", pa.int32()),
+    ("token_id", pa.int32()),
+    ("count", pa.int32()),
+])
+
+
+class Vocab:
+    """(token, pos) -> token_id. id 는 한 번 정해지면 바뀌지 않음 (증분 실행 간 공유)"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.ids = {}
+        self.items = []
+        if self.path.exists():
+            with open(self.path, encoding="utf-8-sig", newline="") as f:
+                for row in csv.DictReader(f):
+                    self.ids[(row["token"], row["pos"])] = int(row["token_id"])
+                    self.items.append((row["token"], row["pos"]))
+        self._saved = len(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def id(self, token: str, pos: str) -> int:
+        key = (token, pos)
+        token_id = self.ids.get(key)
+        if token_id is None:
+            token_id = self.ids[key] = len(self.items)
+            self.items.append(key)
+        return token_id
+
+    def save(self):
+        """새로 생긴 단어만 뒤에 추가 (fsync 까지 하고 반환 -> 이 id 를 참조하는 parquet 을 그다음에 공개)"""
+        if self._saved == len(self.items):
+            return
+        new_file = not self.path.exists()
+        with open(self.path, "a", encoding="utf-8-sig" if new_file else "utf-8", newline="") as f:
+            writer = csv.writer(f)
+            if new_file:
+                writer.writerow(["token_id", "token", "pos"])
+            writer.writerows((i, t, p) for i, (t, p) in enumerate(self.items[self._saved:], start=self._saved))
+            f.flush()
+            os.fsync(f.fileno())
+        self._saved = len(self.items)
+
+
+class CountWriter:
+    """
+    문서별 Counter 를 받아 batch_rows 행마다 row group 하나로 기록.
+    메모리에는 아직 쓰지 않은 batch 한 개(int32 배열 3개)만 남는다.
+    close() 전까지는 .tmp 로 쓰므로 중간에 죽어도 반쯤 쓴 파일이 읽히지 않음.
+    close() 는 vocab 을 먼저 저장한 뒤에 rename -> 공개된 part 파일의 token_id 는 항상 vocab.csv 에 있음.
+    """
+
+    def __init__(self, counts_dir: Path, vocab: Vocab, batch_rows: int = 200_000):
+        self.counts_dir = Path(counts_dir)
+        self.counts_dir.mkdir(parents=True, exist_ok=True)
+        self.vocab = vocab
+        self.batch_rows = batch_rows
+        self.path = self.counts_dir / f"part-{time.strftime('%Y%m%d%H%M%S')}-{os.getpid()}.parquet"
+        self._tmp = self.path.with_suffix(".parquet.tmp")
+        self._writer = None
+        self._reset()
+        self.rows = 0
+
+    def _reset(self):
+        self._doc_ids, self._token_ids, self._counts = array("i"), array("i"), array("i")
+
+    def add(self, doc_id: int, counter):
+        """counter: Counter({(token, pos): count}) -> 빈도 내림차순으로 추가"""
+        for (token, pos), count in counter.most_common():
+            self._doc_ids.append(doc_id)
+            self._token_ids.append(self.vocab.id(token, pos))
+            self._counts.append(count)
+        if len(self._doc_ids) >= self.batch_rows:
+            self._flush()
+
+    def _flush(self):
+        if not self._doc_ids:
+            return
+        table = pa.table([pa.array(self._doc_ids, pa.int32()), pa.array(self._token_ids, pa.int32()),
+                          pa.array(self._counts, pa.int32())], schema=COUNT_SCHEMA)
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self._tmp, COUNT_SCHEMA)
+        self._writer.write_table(table)
+        self.rows += len(self._doc_ids)
+        self._reset()
+
+    def close(self):
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+            self.vocab.save()
+            os.replace(self._tmp, self.path)
+
+
+def part_files(counts_dir: Path) -> list:
+    return sorted(Path(counts_dir).glob("part-*.parquet"))
+
+
+def drop_docs(counts_dir: Path, doc_ids) -> int:
+    """doc_ids 문서의 행을 지움. 해당 문서가 들어 있는 파일만 row group 단위로 다시 씀. 반환: 지운 행 수"""
+    if not doc_ids:
+        return 0
+    drop = pa.array(sorted(doc_ids), pa.int32())
+    removed = 0
+    for path in part_files(counts_dir):
+        pf = pq.ParquetFile(path)
+        hit = pc.is_in(pf.read(columns=["doc_id"]).column("doc_id"), value_set=drop)
+        n_hit = pc.sum(hit).as_py() or 0
+        if not n_hit:
+            continue
+        removed += n_hit
+        if n_hit == pf.metadata.num_rows:
+            path.unlink()
+            continue
+        tmp = path.with_suffix(".parquet.tmp")
+        with pq.ParquetWriter(tmp, COUNT_SCHEMA) as writer:
+            for i in range(pf.num_row_groups):
+                table = pf.read_row_group(i)
+                writer.write_table(table.filter(pc.invert(pc.is_in(table.column("doc_id"), value_set=drop))))
+        os.replace(tmp, path)
+    return removed
+
+
+def clear(counts_dir: Path):
+    for path in part_files(counts_dir):
+        path.unlink()
+
+
+def iter_batches(counts_dir: Path, batch_size: int = 200_000):
+    """(doc_id, token_id, count) RecordBatch 를 파일 순서대로"""
+    for path in part_files(counts_dir):
+        yield from pq.ParquetFile(path).iter_batches(batch_size=batch_size)
+
+
+def export_csv(counts_dir: Path, vocab: Vocab, filenames: dict, out_path: Path, batch_size: int = 200_000) -> int:
+    """
+    기존 all_docs_token_counts.csv 형식(doc_id, filename, token, pos, count)으로 내보내기.
+    batch 단위로 변환해서 쓰므로 전체를 메모리에 올리지 않음. 반환: 행 수
+    """
+    out_path = Path(out_path)
+    tmp = out_path.with_suffix(".tmp")
+    rows = 0
+    with open(tmp, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["doc_id", "filename", "token", "pos", "count"])
+        for batch in iter_batches(counts_dir, batch_size):
+            doc_ids, token_ids, counts = (batch.column(i).to_pylist() for i in range(3))
+            writer.writerows(
+                (d, filenames.get(d, ""), *vocab.items[t], c) for d, t, c in zip(doc_ids, token_ids, counts)
+            )
+            rows += batch.num_rows
+    os.replace(tmp, out_path)
+    return rows
+
+
+def load_csr(counts_dir: Path, n_docs: int = None, n_terms: int = None):
+    """doc x term 희소 행렬(scipy CSR). 행 = doc_id, 열 = token_id"""
+    from scipy import sparse
+    paths = part_files(counts_dir)
+    table = pa.concat_tables([pq.read_table(p) for p in paths]) if paths else COUNT_SCHEMA.empty_table()
+    doc_ids = table.column("doc_id").to_numpy()
+    token_ids = table.column("token_id").to_numpy()
+    counts = table.column("count").to_numpy()
+    shape = (n_docs or (int(doc_ids.max()) + 1 if len(doc_ids) else 0),
+             n_terms or (int(token_ids.max()) + 1 if len(token_ids) else 0))
+    return sparse.csr_matrix((counts, (doc_ids, token_ids)), shape=shape)
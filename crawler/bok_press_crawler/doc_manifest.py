@@ -0,0 +1,93 @@
+import json
+import os
+from pathlib import Path
+
+from text_extract import file_sha256
+
+
+class DocManifest:
+    """
+    처리한 PDF 목록 (OUT_DIR/manifest.json).
+    {상대경로: {doc_id, mtime, size, sha256}} 를 저장해서
+    - 새 PDF / 내용이 바뀐 PDF 만 다시 처리하고, 사라진 PDF 는 결과에서 뺀다.
+    - doc_id 는 한 번 정해지면 유지 (새 문서가 추가돼도 기존 번호가 밀리지 않음)
+    """
+
+    def __init__(self, path: Path, root: Path):
+        self.path = Path(path)
+        self.root = Path(root)
+        self.entries = {}
+        self.next_doc_id = 1
+        if self.path.exists():
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            self.entries = data["files"]
+            self.next_doc_id = data["next_doc_id"]
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def key(self, pdf_path: Path) -> str:
+        return Path(pdf_path).relative_to(self.root).as_posix()
+
+    def doc_id(self, pdf_path: Path) -> int:
+        return self.entries[self.key(pdf_path)]["doc_id"]
+
+    def scan(self, pdf_files):
+        """
+        현재 PDF 목록과 manifest 비교.
+        반환: (todo, deleted_ids)
+          todo        : 다시 처리할 PDF (새 파일 + 내용이 바뀐 파일)
+          deleted_ids : 결과에서 지울 doc_id (삭제된 파일 + 바뀐 파일의 이전 결과)
+        mtime/size 가 같으면 해시를 계산하지 않으므로 변경이 없을 때는 거의 즉시 끝난다.
+        """
+        todo, deleted_ids = [], set()
+        current = {self.key(p): p for p in pdf_files}
+        gone = {k: e for k, e in self.entries.items() if k not in current}
+        gone_by_hash = {e["sha256"]: k for k, e in gone.items()}
+
+        for key, pdf_path in current.items():
+            st = pdf_path.stat()
+            entry = self.entries.get(key)
+            if entry and entry["mtime"] == st.st_mtime and entry["size"] == st.st_size:
+                continue
+
+            digest = file_sha256(pdf_path)
+            if entry and entry["sha256"] == digest:
+                entry["mtime"] = st.st_mtime  # touch 만 된 파일
+                continue
+
+            if entry:
+                deleted_ids.add(entry["doc_id"])
+                doc_id = entry["doc_id"]
+            elif digest in gone_by_hash:
+                # 이름/위치만 바뀐 파일: doc_id 를 이어받고, 결과는 파일명이 바뀌었으니 다시 만든다
+                old = gone.pop(gone_by_hash.pop(digest))
+                deleted_ids.add(old["doc_id"])
+                doc_id = old["doc_id"]
+            else:
+                doc_id = self.next_doc_id
+                self.next_doc_id += 1
+
+            self.entries[key] = {"doc_id": doc_id, "mtime": st.st_mtime, "size": st.st_size, "sha256": digest}
+            todo.append(pdf_path)
+
+        for key, entry in gone.items():
+            deleted_ids.add(entry["doc_id"])
+        for key in [k for k in self.entries if k not in current]:
+            del self.entries[key]
+        return todo, deleted_ids
+
+    def filenames(self) -> dict:
+        """{doc_id: 파일명}"""
+        return {e["doc_id"]: Path(k).name for k, e in self.entries.items()}
+
+    def forget(self, pdf_path: Path):
+        """처리 중 예외가 난 파일: 다음 실행에서 다시 시도하도록 mtime/해시를 비움 (doc_id 는 유지)"""
+        entry = self.entries[self.key(pdf_path)]
+        entry["mtime"] = entry["sha256"] = None
+
+    def save(self):
+        tmp = self.path.with_suffix(".tmp")
+        data = {"next_doc_id": self.next_doc_id, "files": self.entries}
+        tmp.write_text(json.dumps(data, ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(tmp, self.path)
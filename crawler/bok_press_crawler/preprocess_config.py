@@ -8,6 +8,25 @@ TEXT_DIR = OUT_DIR / "extracted_text"
 
 SAVE_EXTRACTED_TXT = False
 
+# 토큰 빈도: token_counts/*.parquet (doc_id, token_id, count) + vocab.csv (token_id, token, pos)
+COUNTS_DIR = OUT_DIR / "token_counts"
+VOCAB_PATH = OUT_DIR / "vocab.csv"
+COUNT_BATCH_ROWS = 200_000
+SAVE_DOC_COUNT_CSV = True    # 문서별 CSV (doc_token_counts/*.csv)
+SAVE_ALL_COUNTS_CSV = True   # all_docs_token_counts.csv (parquet 에서 변환)
+
+# True: manifest.json 기준으로 새/바뀐 PDF 만 처리해서 기존 결과에 합침
+# False: 전체 다시 처리 (doc_id 는 manifest 기준으로 유지)
+INCREMENTAL = True
+
+# PDF 텍스트 추출: 프로세스 병렬 + 내용 해시 캐시
+EXTRACT_WORKERS = None            # None 이면 CPU 코어 수
+TEXT_CACHE_DIR = OUT_DIR / "text_cache"
+EXTRACTOR_VERSION = "v1"         # 추출 방식이 바뀌면 올려서 캐시 무효화
+# 추출 백엔드: "pdfplumber"(기준, 느림) / "pdfium"(pypdfium2) / "pdfminer"(레이아웃 분석 없음)
+# 바꾸기 전에 timetest/preprocessing_multiprocessing/pdf_backend_benchmark.py 로 일치율 확인
+PDF_BACKEND = "pdfplumber"
+
 KEEP_POS = {"NNG", "NNP", "NNB", "VV", "VA", "MAG", "SL", "SN"}
 MIN_TOKEN_LEN = 2
 DROP_NUM_ONLY = True
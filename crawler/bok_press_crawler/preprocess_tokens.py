@@ -1,4 +1,5 @@
 import json
+from collections import Counter
 from pathlib import Path
 
 import pandas as pd
@@ -6,6 +7,9 @@ from tqdm import tqdm
 
 import preprocess_config as cfg
 import preprocess_utils as ut
+import text_extract as te
+import count_store
+from doc_manifest import DocManifest
 print("[DEBUG] preprocess_utils file:", ut.__file__)
 print("[DEBUG] has load_tagger:", hasattr(ut, "load_tagger"))
 
@@ -14,94 +18,159 @@ print("[DEBUG] preprocess_config file:", cfg.__file__)
 print("[DEBUG] attrs:", [a for a in dir(cfg) if a.isupper()])
 
 
-def main():
+DOCS_TOKENS_COLUMNS = ["doc_id", "date", "content", "tokens", "category", "source"]
+
+
+def process_doc(doc_id, pdf_path, raw_text, pos_fn):
+    """
+    PDF 한 개 -> (docs_tokens 행, Counter({(token, pos): count})). 텍스트/토큰이 없으면 None.
+    SAVE_DOC_COUNT_CSV 면 문서별 빈도 CSV(doc_token_counts/*.csv)도 여기서 저장.
+    """
+    text = ut.clean_text(raw_text)
+    if not text:
+        return None
+
+    if cfg.SAVE_EXTRACTED_TXT:
+        (cfg.TEXT_DIR / f"{pdf_path.stem}.txt").write_text(text, encoding="utf-8")
+
+    date = ut.parse_date_from_name(pdf_path.name) or ut.parse_date_from_name(str(pdf_path.parent))
+    category, source = ut.infer_category_source(pdf_path)
+
+    pos_list = pos_fn(text)
+    pos_list = ut.filter_tokens(
+        pos_list,
+        keep_pos=cfg.KEEP_POS,
+        min_len=cfg.MIN_TOKEN_LEN,
+        drop_num_only=cfg.DROP_NUM_ONLY
+    )
+    if not pos_list:
+        return None
+
+    # (1) docs_tokens.csv용: tokens는 JSON 문자열로 저장
+    tokens_only = [t for (t, _p) in pos_list]
+    doc_row = {
+        "doc_id": doc_id,
+        "date": date,
+        "content": text,
+        "tokens": json.dumps(tokens_only, ensure_ascii=False),
+        "category": category,
+        "source": source
+    }
+
+    # (2) 빈도 집계 (token_counts parquet / doc_token_counts/*.csv 용)
+    counter = Counter(pos_list)
+
+    # 문서별 저장 (선택)
+    if cfg.SAVE_DOC_COUNT_CSV:
+        out_doc_csv = cfg.DOC_COUNTS_DIR / f"{pdf_path.stem}.csv"
+        counts = pd.DataFrame([(t, p, c) for (t, p), c in counter.most_common()], columns=["token", "pos", "count"])
+        counts.to_csv(out_doc_csv, index=False, encoding="utf-8-sig")
+
+    return doc_row, counter
+
+
+def merge_output(path: Path, new_rows, columns, drop_ids, rebuild: bool) -> pd.DataFrame:
+    """기존 결과에서 drop_ids 문서를 빼고 새 행을 합쳐 doc_id 순으로 저장 (tmp 파일에 쓴 뒤 교체)"""
+    new = pd.DataFrame(new_rows, columns=columns)
+    if not rebuild and path.exists():
+        old = pd.read_csv(path, encoding="utf-8-sig")
+        old = old[~old["doc_id"].isin(drop_ids)]
+        new = pd.concat([old, new], ignore_index=True)
+    merged = new.sort_values("doc_id", kind="stable")
+    tmp = path.with_suffix(".tmp")
+    merged.to_csv(tmp, index=False, encoding="utf-8-sig")
+    tmp.replace(path)
+    return merged
+
+
+def main(incremental: bool = cfg.INCREMENTAL):
     cfg.OUT_DIR.mkdir(parents=True, exist_ok=True)
     cfg.DOC_COUNTS_DIR.mkdir(parents=True, exist_ok=True)
     cfg.TEXT_DIR.mkdir(parents=True, exist_ok=True)
 
-    tagger_name, pos_fn = ut.load_tagger()
-    print(f"[INFO] Tagger: {tagger_name}")
     print(f"[INFO] PDF_ROOT: {cfg.PDF_ROOT}")
 
     pdf_files = sorted(cfg.PDF_ROOT.rglob("*.pdf"))
     if not pdf_files:
         raise FileNotFoundError(f"PDF를 찾지 못했습니다: {cfg.PDF_ROOT}")
 
-    docs_tokens_rows = []   # date, content, tokens, category, source
-    all_count_rows = []     # doc_id, filename, token, pos, count
+    # doc_id 는 manifest 에서 관리 (처음 실행하면 정렬 순서대로 1, 2, ...)
+    manifest = DocManifest(cfg.OUT_DIR / "manifest.json", cfg.PDF_ROOT)
+    rebuild = not incremental or not manifest.exists()
+    todo, drop_ids = manifest.scan(pdf_files)
+    if rebuild:
+        todo = pdf_files
+    # 이번에 다시 처리하는 문서의 이전 결과도 지움 (지난 실행이 manifest 저장 전에 죽었을 때 중복 방지)
+    drop_ids |= {manifest.doc_id(p) for p in todo}
+    print(f"[INFO] {'전체' if rebuild else '증분'} 처리: {len(todo)}/{len(pdf_files)}개, 제거 {len(drop_ids)}개")
+    if not todo and not drop_ids:
+        manifest.save()  # touch 만 된 파일의 mtime 갱신
+        print("[DONE] 변경된 PDF 가 없습니다.")
+        return
 
-    for doc_id, pdf_path in enumerate(tqdm(pdf_files, desc="Preprocess Tokens"), start=1):
-        try:
-            raw_text, _page_count = ut.extract_text_from_pdf(pdf_path)
-            text = ut.clean_text(raw_text)
-            if not text:
-                continue
+    tagger_name, pos_fn = ut.load_tagger()
+    print(f"[INFO] Tagger: {tagger_name}")
 
-            if cfg.SAVE_EXTRACTED_TXT:
-                (cfg.TEXT_DIR / f"{pdf_path.stem}.txt").write_text(text, encoding="utf-8")
+    # PDF 텍스트 추출은 프로세스 풀에서 한 번에 (내용이 같은 PDF 는 캐시 재사용)
+    text_cache = te.TextCache(cfg.TEXT_CACHE_DIR, cfg.EXTRACTOR_VERSION, cfg.PDF_BACKEND)
+    extracted = te.extract_texts(todo, cache=text_cache, workers=cfg.EXTRACT_WORKERS,
+                                 backend=cfg.PDF_BACKEND)
 
-            date = ut.parse_date_from_name(pdf_path.name) or ut.parse_date_from_name(str(pdf_path.parent))
-            category, source = ut.infer_category_source(pdf_path)
+    # 토큰 빈도: 기존 결과에서 지울 문서를 빼고, 새 문서는 batch 단위로 parquet 에 바로 기록
+    vocab = count_store.Vocab(cfg.VOCAB_PATH)
+    if rebuild:
+        count_store.clear(cfg.COUNTS_DIR)
+    else:
+        count_store.drop_docs(cfg.COUNTS_DIR, drop_ids)
+    count_writer = count_store.CountWriter(cfg.COUNTS_DIR, vocab, cfg.COUNT_BATCH_ROWS)
 
-            pos_list = pos_fn(text)
-            pos_list = ut.filter_tokens(
-                pos_list,
-                keep_pos=cfg.KEEP_POS,
-                min_len=cfg.MIN_TOKEN_LEN,
-                drop_num_only=cfg.DROP_NUM_ONLY
-            )
-            if not pos_list:
-                continue
+    docs_tokens_rows = []   # doc_id, date, content, tokens, category, source
 
-            # (1) docs_tokens.csv용: tokens는 JSON 문자열로 저장
-            tokens_only = [t for (t, _p) in pos_list]
-            docs_tokens_rows.append({
-                "date": date,
-                "content": text,
-                "tokens": json.dumps(tokens_only, ensure_ascii=False),
-                "category": category,
-                "source": source
-            })
-
-            # (2) doc_token_counts/*.csv + all_docs_token_counts.csv용: 빈도 집계
-            df = pd.DataFrame(pos_list, columns=["token", "pos"])
-            counts = (
-                df.value_counts(["token", "pos"])
-                  .reset_index(name="count")
-                  .sort_values("count", ascending=False)
-            )
-
-            # 문서별 저장
-            out_doc_csv = cfg.DOC_COUNTS_DIR / f"{pdf_path.stem}.csv"
-            counts.to_csv(out_doc_csv, index=False, encoding="utf-8-sig")
-
-            # 전체 통합 저장
-            for row in counts.itertuples(index=False):
-                all_count_rows.append({
-                    "doc_id": doc_id,
-                    "filename": pdf_path.name,
-                    "token": row.token,
-                    "pos": row.pos,
-                    "count": int(row.count),
-                })
+    for pdf_path in tqdm(todo, desc="Preprocess Tokens"):
+        try:
+            if pdf_path not in extracted:
+                manifest.forget(pdf_path)
+                continue  # 추출 실패 (경고는 이미 출력)
+            raw_text, _page_count = extracted[pdf_path]
+            result = process_doc(manifest.doc_id(pdf_path), pdf_path, raw_text, pos_fn)
+            if result is None:
+                continue
+            doc_row, counter = result
+            docs_tokens_rows.append(doc_row)
+            count_writer.add(doc_row["doc_id"], counter)
 
         except Exception as e:
+            manifest.forget(pdf_path)
             print(f"[WARN] 실패: {pdf_path.name} / {e}")
 
-    # 저장: docs_tokens.csv (요청한 5컬럼)
-    if docs_tokens_rows:
-        out_docs_tokens = cfg.OUT_DIR / "docs_tokens.csv"
-        pd.DataFrame(docs_tokens_rows).to_csv(out_docs_tokens, index=False, encoding="utf-8-sig")
-        print(f"[DONE] Saved: {out_docs_tokens}")
+    # 저장: docs_tokens.csv
+    out_docs_tokens = cfg.OUT_DIR / "docs_tokens.csv"
+    docs = merge_output(out_docs_tokens, docs_tokens_rows, DOCS_TOKENS_COLUMNS, drop_ids, rebuild)
+    print(f"[DONE] Saved: {out_docs_tokens} ({len(docs)} docs, 새로 처리 {len(docs_tokens_rows)})")
 
-    # 저장: all_docs_token_counts.csv
-    if all_count_rows:
+    # 저장: vocab.csv -> token_counts/*.parquet (part 파일이 참조하는 id 가 먼저 저장되도록 vocab 부터)
+    vocab.save()
+    count_writer.close()
+    print(f"[DONE] Saved: {cfg.COUNTS_DIR} (+{count_writer.rows} rows, vocab {len(vocab)})")
+
+    # 저장: all_docs_token_counts.csv (선택, parquet 에서 batch 단위 변환)
+    filenames = manifest.filenames()
+    if cfg.SAVE_ALL_COUNTS_CSV:
         out_all_counts = cfg.OUT_DIR / "all_docs_token_counts.csv"
-        pd.DataFrame(all_count_rows).to_csv(out_all_counts, index=False, encoding="utf-8-sig")
-        print(f"[DONE] Saved: {out_all_counts}")
-        print(f"[DONE] Per-doc dir: {cfg.DOC_COUNTS_DIR}")
+        n_rows = count_store.export_csv(cfg.COUNTS_DIR, vocab, filenames, out_all_counts)
+        print(f"[DONE] Saved: {out_all_counts} ({n_rows} rows)")
+
+    # 삭제된 PDF 의 문서별 CSV 정리
+    live_stems = {Path(name).stem for name in filenames.values()}
+    for doc_csv in cfg.DOC_COUNTS_DIR.glob("*.csv"):
+        if doc_csv.stem not in live_stems:
+            doc_csv.unlink()
+    print(f"[DONE] Per-doc dir: {cfg.DOC_COUNTS_DIR}")
+
+    # 결과를 다 쓴 다음에 manifest 저장 -> 중간에 죽으면 다음 실행에서 다시 처리
+    manifest.save()
 
-    if not docs_tokens_rows and not all_count_rows:
+    if docs.empty:
         print("[DONE] 저장할 결과가 없습니다(텍스트 추출 실패 또는 토큰이 전부 필터링됨).")
 
 
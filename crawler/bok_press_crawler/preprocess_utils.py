@@ -28,16 +28,78 @@ def load_tagger():
         return "Okt(konlpy)", pos_fn
 
 
-def extract_text_from_pdf(pdf_path: Path) -> tuple[str, int]:
-    """PDF 전체 페이지 텍스트 추출. (text, page_count) 반환"""
-    texts = []
+# ---------- PDF 텍스트 추출 백엔드 ----------
+# 모든 백엔드는 같은 형태: fn(pdf_path, start=0, end=None) -> (페이지별 텍스트 리스트, 전체 페이지 수)
+# end=0 이면 페이지 수만 확인. pdfplumber 가 기준(reference), 나머지는 속도를 위한 대안.
+def _page_range(page_count: int, start: int, end):
+    return range(start, page_count if end is None else min(end, page_count))
+
+
+def pages_pdfplumber(pdf_path: Path, start: int = 0, end=None):
     with pdfplumber.open(pdf_path) as pdf:
         page_count = len(pdf.pages)
-        for page in pdf.pages:
-            t = page.extract_text() or ""
-            if t.strip():
-                texts.append(t)
-    return "\n".join(texts), page_count
+        texts = [pdf.pages[i].extract_text() or "" for i in _page_range(page_count, start, end)]
+    return texts, page_count
+
+
+def pages_pdfium(pdf_path: Path, start: int = 0, end=None):
+    """pypdfium2 (PDFium C 라이브러리). 가장 빠르지만 줄바꿈/공백 규칙이 pdfplumber 와 다름"""
+    import pypdfium2 as pdfium
+    pdf = pdfium.PdfDocument(str(pdf_path))
+    try:
+        page_count = len(pdf)
+        texts = []
+        for i in _page_range(page_count, start, end):
+            page = pdf[i]
+            textpage = page.get_textpage()
+            texts.append(textpage.get_text_range().replace("\r\n", "\n").replace("\r", "\n"))
+            textpage.close()
+            page.close()
+    finally:
+        pdf.close()
+    return texts, page_count
+
+
+def pages_pdfminer(pdf_path: Path, start: int = 0, end=None):
+    """pdfminer 저수준 API, 레이아웃 분석(LAParams) 끔: 글자를 내용 스트림 순서대로 이어붙임"""
+    from io import StringIO
+    from pdfminer.converter import TextConverter
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+
+    with open(pdf_path, "rb") as fp:
+        pages = list(PDFPage.get_pages(fp))
+        page_count = len(pages)
+        rsrcmgr = PDFResourceManager(caching=True)
+        out = StringIO()
+        device = TextConverter(rsrcmgr, out, laparams=None)
+        interpreter = PDFPageInterpreter(rsrcmgr, device)
+        texts = []
+        for i in _page_range(page_count, start, end):
+            interpreter.process_page(pages[i])
+            texts.append(out.getvalue().rstrip("\f"))
+            out.seek(0)
+            out.truncate(0)
+        device.close()
+    return texts, page_count
+
+
+PDF_BACKENDS = {
+    "pdfplumber": pages_pdfplumber,
+    "pdfium": pages_pdfium,
+    "pdfminer": pages_pdfminer,
+}
+
+
+def join_pages(page_texts) -> str:
+    """빈 페이지는 빼고 줄바꿈으로 연결"""
+    return "\n".join(t for t in page_texts if t.strip())
+
+
+def extract_text_from_pdf(pdf_path: Path, backend: str = "pdfplumber") -> tuple[str, int]:
+    """PDF 전체 페이지 텍스트 추출. (text, page_count) 반환"""
+    texts, page_count = PDF_BACKENDS[backend](pdf_path)
+    return join_pages(texts), page_count
 
 
 def clean_text(text: str) -> str:
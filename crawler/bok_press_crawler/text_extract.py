@@ -0,0 +1,121 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import preprocess_utils as ut
+
+PAGES_PER_TASK = 4  # 작업 단위: PDF 한 개의 연속된 페이지 몇 장
+
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def pdf_page_count(task):
+    """(pdf_path, backend) -> 페이지 수. 열 수 없는 PDF 는 None"""
+    pdf_path, backend = task
+    try:
+        return ut.PDF_BACKENDS[backend](pdf_path, 0, 0)[1]
+    except Exception as e:
+        print(f"[WARN] 실패: {Path(pdf_path).name} / {e}")
+        return None
+
+
+def extract_pages(task):
+    """(pdf_path, start, end, backend) -> [page_text, ...]  (프로세스 풀에서 실행). 실패하면 None"""
+    pdf_path, start, end, backend = task
+    try:
+        return ut.PDF_BACKENDS[backend](pdf_path, start, end)[0]
+    except Exception as e:
+        print(f"[WARN] 실패: {Path(pdf_path).name} p.{start + 1}-{end} / {e}")
+        return None
+
+
+class TextCache:
+    """
+    PDF 내용 해시 + 백엔드 + 추출기 버전을 키로 추출 텍스트 저장.
+    파일 이름/위치가 바뀌어도 내용이 같으면 재사용하고, 백엔드나 추출 방식(version)이 바뀌면 다시 추출.
+    """
+
+    def __init__(self, cache_dir: Path, version: str, backend: str = "pdfplumber"):
+        self.cache_dir = Path(cache_dir)
+        self.version = version
+        self.backend = backend
+
+    def _path(self, digest: str) -> Path:
+        return self.cache_dir / digest[:2] / f"{digest}_{self.backend}-{self.version}.json"
+
+    def get(self, digest: str):
+        p = self._path(digest)
+        if not p.exists():
+            return None
+        data = json.loads(p.read_text(encoding="utf-8"))
+        return data["text"], data["page_count"]
+
+    def put(self, digest: str, text: str, page_count: int):
+        p = self._path(digest)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"text": text, "page_count": page_count}, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, p)
+
+
+def extract_texts(pdf_files, cache: TextCache = None, workers: int = None, backend: str = "pdfplumber") -> dict:
+    """
+    PDF 목록 전체 텍스트 추출. 반환: {pdf_path: (text, page_count)}
+    - backend: preprocess_utils.PDF_BACKENDS 의 이름 (cache 를 주면 cache.backend 와 같아야 함)
+    - 캐시에 있으면 바로 사용
+    - 없는 PDF 는 페이지 묶음 단위로 프로세스 풀에서 병렬 추출 후 캐시에 저장
+    """
+    if cache is not None and cache.backend != backend:
+        raise ValueError(f"cache backend({cache.backend}) != backend({backend})")
+    results = {}
+    digests = {}
+    todo = []
+    for pdf_path in pdf_files:
+        if cache is not None:
+            digests[pdf_path] = file_sha256(pdf_path)
+            hit = cache.get(digests[pdf_path])
+            if hit is not None:
+                results[pdf_path] = hit
+                continue
+        todo.append(pdf_path)
+
+    print(f"[INFO] 텍스트 캐시: {len(results)}개 재사용 / {len(todo)}개 추출")
+    if not todo:
+        return results
+
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        page_counts = dict(zip(todo, pool.map(pdf_page_count, [(p, backend) for p in todo])))
+        failed = {pdf_path for pdf_path, n in page_counts.items() if n is None}
+
+        tasks = []
+        for pdf_path in todo:
+            n = page_counts[pdf_path] or 0
+            for start in range(0, n, PAGES_PER_TASK):
+                tasks.append((pdf_path, start, min(start + PAGES_PER_TASK, n), backend))
+
+        # 작은 작업이 많으므로 chunksize 로 프로세스 간 통신 횟수를 줄임
+        chunksize = max(1, len(tasks) // (workers * 8))
+        pages = {pdf_path: [] for pdf_path in todo}
+        for (pdf_path, _s, _e, _b), texts in zip(tasks, pool.map(extract_pages, tasks, chunksize=chunksize)):
+            if texts is None:
+                failed.add(pdf_path)
+                continue
+            pages[pdf_path].extend(texts)  # map 은 입력 순서를 유지하므로 페이지 순서 그대로
+
+    for pdf_path in todo:
+        if pdf_path in failed:
+            continue  # 결과에서 빠짐 (캐시에도 저장하지 않음)
+        text = ut.join_pages(pages[pdf_path])
+        results[pdf_path] = (text, page_counts[pdf_path])
+        if cache is not None:
+            cache.put(digests[pdf_path], text, page_counts[pdf_path])
+    return results
@@ -0,0 +1,209 @@
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urljoin, urlsplit
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+from pdf_downloader import PdfDownloader, make_session
+
+LIST_URL = "https://finance.naver.com/research/debenture_list.naver"
+BASE_URL = "https://finance.naver.com/research/"
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Referer': 'https://finance.naver.com/research/debenture_list.naver',
+}
+INDEX_COLUMNS = ['날짜', '증권사', '제목', '링크']
+PENDING_COLUMNS = INDEX_COLUMNS + ['시도']  # PDF 를 아직 못 받은 리포트 + 실패 횟수
+MAX_ATTEMPTS = 5
+DATE_RE = re.compile(r'^\d{2}\.\d{2}\.\d{2}$')
+
+
+def report_nid(link) -> int:
+    """상세 링크(debenture_read.naver?nid=10267&page=1)의 nid. 리포트 고유번호이며 최신일수록 큼"""
+    nid = parse_qs(urlsplit(str(link)).query).get('nid')
+    return int(nid[0]) if nid else -1
+
+
+def parse_list_page(html_text) -> list:
+    """목록 페이지 -> [[날짜(YYYY-MM-DD), 증권사, 제목, 상세링크], ...] (페이지 순서 그대로, 최신이 먼저)"""
+    soup = BeautifulSoup(html_text, 'lxml')
+    rows = []
+    for row in soup.select('table.type_1 tr'):
+        tds = row.find_all('td')
+        if len(tds) < 4:
+            continue
+        title_tag = tds[0].find('a')
+        if not title_tag:
+            continue
+        date_td = row.select_one('td.date')
+        raw_date = (date_td or tds[-1]).text.strip()
+        if not DATE_RE.match(raw_date):
+            # td.date 가 없으면 날짜 형식인 칸을 찾음 (조회수 칸을 날짜로 읽지 않도록)
+            raw_date = next((td.text.strip() for td in tds if DATE_RE.match(td.text.strip())), "")
+        date = f"20{raw_date[0:2]}-{raw_date[3:5]}-{raw_date[6:8]}" if raw_date else ""
+        rows.append([date, tds[1].text.strip(), title_tag.text.strip(), urljoin(BASE_URL, title_tag['href'])])
+    return rows
+
+
+def parse_pdf_url(html_text):
+    """상세 페이지에서 첫 번째 .pdf 링크"""
+    soup = BeautifulSoup(html_text, 'lxml')
+    for a in soup.find_all('a', href=True):
+        if '.pdf' in a['href'].lower():
+            return a['href']
+    return None
+
+
+def pdf_file_name(date, company, title, nid):
+    safe_title = re.sub(r'[^가-힣0-9a-zA-Z]', '', title)
+    return f"{date.replace('-', '')}_{company.replace(' ', '')}_{nid}_{safe_title[:20]}.pdf"
+
+
+class BondReportCollector:
+    """
+    네이버 채권 리포트 수집기.
+    - Session 하나를 재사용하고, 목록/상세 페이지를 max_workers 개씩 병렬 요청
+    - 목록 인덱스(naver_bond_all_list.csv)에 있는 가장 최신 nid 를 만나면 중단 (증분 수집)
+    - PDF 는 PdfDownloader 로 스트리밍 저장 + manifest 기록
+    - 상세 페이지 / PDF 링크 / 다운로드가 실패한 리포트는 pending_csv 에 남겨 다음 실행 때 먼저 다시 시도
+      (MAX_ATTEMPTS 번 실패하면 경고 후 제외). 인덱스는 목록 중단 위치 표시용이라 성공 여부와 무관하게 갱신
+    """
+
+    def __init__(self, index_csv="naver_bond_all_list.csv", pdf_dir="bond_reports",
+                 max_workers: int = 8, session=None, pending_csv="naver_bond_pending.csv"):
+        self.index_csv = index_csv
+        self.pending_csv = pending_csv
+        self.pdf_dir = pdf_dir
+        self.max_workers = max_workers
+        self.session = session or make_session(pool_size=max_workers, headers=HEADERS)
+
+    def _get(self, url):
+        res = self.session.get(url, headers=HEADERS, timeout=30)
+        res.raise_for_status()
+        res.encoding = 'euc-kr'
+        return res.text
+
+    def load_index(self) -> pd.DataFrame:
+        if os.path.exists(self.index_csv):
+            return pd.read_csv(self.index_csv, encoding='utf-8-sig')
+        return pd.DataFrame(columns=INDEX_COLUMNS)
+
+    def fetch_list_page(self, page):
+        return parse_list_page(self._get(f"{LIST_URL}?page={page}"))
+
+    def collect_new_reports(self, known_max_nid: int = -1, max_pages: int = 2000) -> list:
+        """
+        1페이지부터 max_workers 페이지씩 묶어 병렬로 받고, 페이지 순서대로 확인하면서
+        known_max_nid 이하(이미 가진 리포트)가 나오면 멈춘다.
+        """
+        new_rows = []
+        seen = set()
+        page = 1
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while page <= max_pages:
+                pages = range(page, min(page + self.max_workers, max_pages + 1))
+                for p, rows in zip(pages, executor.map(self.fetch_list_page, pages)):
+                    fresh = [r for r in rows if report_nid(r[3]) not in seen]
+                    # 빈 페이지 / 마지막 페이지 반복(이미 본 리포트만 있음) -> 끝
+                    if not fresh:
+                        print(f"[INFO] page {p}: 더 이상 새 리포트 없음")
+                        return new_rows
+                    for r in fresh:
+                        nid = report_nid(r[3])
+                        if nid <= known_max_nid:
+                            print(f"[INFO] page {p}: 기존 인덱스(nid {known_max_nid})에 도달")
+                            return new_rows
+                        seen.add(nid)
+                        new_rows.append(r)
+                    print(f"[INFO] page {p}: {len(fresh)}건 (누적 {len(new_rows)}건)")
+                page += self.max_workers
+        return new_rows
+
+    def update_index(self, new_rows) -> pd.DataFrame:
+        """새 행을 인덱스 앞에 붙이고(nid 기준 중복 제거) tmp 파일에 쓴 뒤 교체"""
+        index = self.load_index()
+        merged = pd.concat([pd.DataFrame(new_rows, columns=INDEX_COLUMNS), index], ignore_index=True)
+        # 링크의 page 파라미터는 수집 시점마다 달라지므로 nid 로 중복 판단
+        merged = merged.loc[~merged['링크'].map(report_nid).duplicated(keep='first')]
+        tmp = self.index_csv + ".tmp"
+        merged.to_csv(tmp, index=False, encoding='utf-8-sig')
+        os.replace(tmp, self.index_csv)
+        return merged
+
+    def load_pending(self) -> pd.DataFrame:
+        if os.path.exists(self.pending_csv):
+            return pd.read_csv(self.pending_csv, encoding='utf-8-sig')
+        return pd.DataFrame(columns=PENDING_COLUMNS)
+
+    def save_pending(self, pending: pd.DataFrame):
+        tmp = self.pending_csv + ".tmp"
+        pending[PENDING_COLUMNS].to_csv(tmp, index=False, encoding='utf-8-sig')
+        os.replace(tmp, self.pending_csv)
+
+    def _pdf_job(self, row):
+        date, company, title, link = row
+        try:
+            pdf_url = parse_pdf_url(self._get(link))
+        except Exception as e:
+            print(f"[WARN] 상세 페이지 실패: {title[:20]} / {e}")
+            return None
+        if not pdf_url:
+            return None
+        return pdf_url, os.path.join(self.pdf_dir, pdf_file_name(date, company, title, report_nid(link)))
+
+    def download_pdfs(self, rows):
+        """
+        상세 페이지를 병렬로 열어 PDF 주소를 찾고, PdfDownloader 로 병렬 스트리밍 다운로드.
+        반환: (상태별 개수, 실패한 행 목록) -- 상세 페이지 실패 / PDF 링크 없음 / 다운로드 실패
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            row_jobs = list(zip(rows, executor.map(self._pdf_job, rows)))
+        failed = [row for row, job in row_jobs if job is None]
+        jobs = [job for _, job in row_jobs if job]
+        print(f"[INFO] PDF 링크 {len(jobs)}/{len(rows)}개")
+        row_by_path = {job[1]: row for row, job in row_jobs if job}
+
+        def on_result(url, path, status):
+            if status == "failed":
+                failed.append(row_by_path[path])
+
+        downloader = PdfDownloader(self.pdf_dir, session=self.session, max_workers=self.max_workers)
+        summary = downloader.download_all(jobs, on_result=on_result)
+        summary["no_pdf"] = len(rows) - len(jobs)
+        return summary, failed
+
+    def run(self, max_pages: int = 2000, download: bool = True):
+        index = self.load_index()
+        known_max_nid = max((report_nid(l) for l in index['링크']), default=-1)
+        new_rows = self.collect_new_reports(known_max_nid, max_pages=max_pages)
+        print(f"[INFO] 새 리포트 {len(new_rows)}건")
+
+        # 지난 실행에서 못 받은 리포트 + 새 리포트 (nid 기준 중복 제거)
+        pending = self.load_pending()
+        attempts = {report_nid(l): int(a) for l, a in zip(pending['링크'], pending['시도'])}
+        rows = [list(r) for r in pending[INDEX_COLUMNS].itertuples(index=False, name=None)]
+        rows += [r for r in new_rows if report_nid(r[3]) not in attempts]
+        if rows and download:
+            print(f"[INFO] 다시 시도 {len(pending)}건 + 새 리포트 -> PDF {len(rows)}건")
+            summary, failed = self.download_pdfs(rows)
+            print(f"[DONE] {summary}")
+            still_pending = []
+            for r in failed:
+                n = attempts.get(report_nid(r[3]), 0) + 1
+                if n >= MAX_ATTEMPTS:
+                    print(f"[WARN] {MAX_ATTEMPTS}번 실패해서 제외: {r[2][:20]} ({r[3]})")
+                    continue
+                still_pending.append(list(r) + [n])
+        else:
+            still_pending = [list(r) + [attempts.get(report_nid(r[3]), 0)] for r in rows]
+        # pending 을 먼저 저장하고 인덱스 갱신 -> 사이에 죽어도 인덱스에만 있고 PDF 는 없는 리포트가 생기지 않음
+        self.save_pending(pd.DataFrame(still_pending, columns=PENDING_COLUMNS))
+        if new_rows:
+            self.update_index(new_rows)
+        return new_rows
+
+
+if __name__ == "__main__":
+    BondReportCollector().run()
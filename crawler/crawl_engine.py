@@ -0,0 +1,203 @@
+import asyncio
+import math
+import random
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+import requests
+
+from pdf_downloader import make_session
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+def percentile(sorted_values, q):
+    """정렬된 리스트의 q 분위수(nearest-rank)"""
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, math.ceil(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[idx]
+
+
+class TokenBucket:
+    """
+    호스트별 토큰 버킷. rate(초당 요청 수)만큼 토큰이 차고, capacity 만큼 순간 버스트 허용.
+    429/5xx 를 받으면 rate 를 절반으로 줄이고 잠시 막았다가(backoff), 성공할 때마다 조금씩 회복.
+    """
+
+    def __init__(self, rate: float, capacity: float = None, min_rate: float = 0.2, recover_step: float = 0.05):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate
+        self.recover_step = recover_step
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def penalize(self, attempt: int, retry_after: float = None):
+        """차단/서버오류 신호: 속도 절반 + 지수 백오프(또는 Retry-After) 동안 정지"""
+        self.rate = max(self.min_rate, self.rate / 2)
+        delay = retry_after if retry_after is not None else min(60.0, 2 ** attempt) + random.uniform(0, 1)
+        self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+        self.tokens = 0.0
+
+    def reward(self):
+        self.rate = min(self.max_rate, self.rate + self.recover_step)
+
+
+class CrawlStats:
+    """요청 수, 상태코드, 지연시간(ms) 집계 -> 초당 요청 수 / 백분위 지연 리포트"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.latencies = []
+        self.status = Counter()
+        self.retries = 0
+        self.errors = 0
+        self.cache_hits = 0
+
+    def record(self, status, latency):
+        self.status[status] += 1
+        self.latencies.append(latency * 1000)
+
+    def report(self) -> dict:
+        elapsed = time.perf_counter() - self.started
+        lat = sorted(self.latencies)
+        n = len(lat)
+        return {
+            "requests": n,
+            "elapsed_s": round(elapsed, 2),
+            "req_per_s": round(n / elapsed, 2) if elapsed > 0 else 0.0,
+            "p50_ms": round(percentile(lat, 50), 1),
+            "p90_ms": round(percentile(lat, 90), 1),
+            "p99_ms": round(percentile(lat, 99), 1),
+            "retries": self.retries,
+            "errors": self.errors,
+            "cache_hits": self.cache_hits,
+            "status": dict(self.status),
+        }
+
+
+class CrawlEngine:
+    """
+    asyncio 기반 크롤 엔진.
+    - 호스트별 TokenBucket 으로 속도 제한 (sleep 고정 대기 대신)
+    - 429/5xx/네트워크 오류는 백오프 후 재시도
+    - 실제 HTTP 는 커넥션 풀 Session 을 스레드에서 실행 (requests 그대로 사용)
+    - cache(HttpCache)를 주면 캐시 적중 요청은 토큰을 쓰지 않음
+    """
+
+    def __init__(self, rate: float = 5.0, concurrency: int = 16, max_retries: int = 5,
+                 session: requests.Session = None, cache=None, host_rates: dict = None):
+        self.rate = rate
+        self.host_rates = host_rates or {}
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.session = session or make_session(pool_size=concurrency)
+        self.cache = cache
+        self.stats = CrawlStats()
+        self._buckets = {}
+        self._sem = None
+
+    def bucket(self, host) -> TokenBucket:
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.host_rates.get(host, self.rate))
+        return self._buckets[host]
+
+    def _get(self, url, params, headers, timeout, ttl, use_cache):
+        if use_cache and self.cache is not None:
+            return self.cache.get(url, params=params, headers=headers, timeout=timeout, ttl=ttl)
+        return self.session.get(url, params=params, headers=headers, timeout=timeout)
+
+    async def fetch(self, url, params=None, headers=None, timeout=15, ttl=None, use_cache=True):
+        """
+        속도 제한 + 재시도가 적용된 GET. 재시도 후에도 실패하면 마지막 응답(또는 예외)을 돌려준다.
+        use_cache=False 면 캐시를 거치지 않음 (기사 본문처럼 한 번만 받는 페이지)
+        """
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.concurrency)
+
+        use_cache = use_cache and self.cache is not None
+        if use_cache:
+            cached = self.cache.peek(url, params, ttl)
+            if cached is not None:
+                self.stats.cache_hits += 1
+                return cached
+
+        bucket = self.bucket(urlsplit(url).netloc)
+        for attempt in range(1, self.max_retries + 1):
+            await bucket.acquire()
+            t0 = time.perf_counter()
+            try:
+                async with self._sem:
+                    res = await asyncio.to_thread(self._get, url, params, headers, timeout, ttl, use_cache)
+            except requests.RequestException:
+                self.stats.errors += 1
+                bucket.penalize(attempt)
+                if attempt == self.max_retries:
+                    raise
+                self.stats.retries += 1
+                continue
+
+            self.stats.record(res.status_code, time.perf_counter() - t0)
+            if res.status_code in RETRY_STATUS:
+                # 마지막 시도여도 감속은 하고 reward 없이 돌려줌 (거절 중인 호스트에 속도를 올리지 않음)
+                retry_after = res.headers.get("Retry-After")
+                bucket.penalize(attempt, float(retry_after) if retry_after and retry_after.isdigit() else None)
+                if attempt == self.max_retries:
+                    return res
+                self.stats.retries += 1
+                continue
+
+            bucket.reward()
+            return res
+
+    async def run_jobs(self, job_fn, jobs, workers: int = None, on_result=None):
+        """
+        jobs 각각에 대해 await job_fn(job) 를 workers 개의 코루틴이 나눠서 실행.
+        on_result(job, result) 가 있으면 끝나는 순서대로 호출 (중간 저장용).
+        반환: {job: result} (예외가 난 job 은 None)
+        """
+        queue = asyncio.Queue()
+        for job in jobs:
+            queue.put_nowait(job)
+        results = {}
+
+        async def worker():
+            while True:
+                try:
+                    job = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    result = await job_fn(job)
+                except Exception as e:
+                    print(f"[WARN] 실패: {job} / {e}")
+                    result = None
+                results[job] = result
+                if on_result is not None:
+                    on_result(job, result)
+
+        await asyncio.gather(*(worker() for _ in range(workers or self.concurrency)))
+        return results
+
+    def host_report(self) -> dict:
+        """호스트별 현재(백오프 반영) 속도"""
+        return {host: round(bucket.rate, 2) for host, bucket in self._buckets.items()}
@@ -0,0 +1,201 @@
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+PENDING = "pending"
+IN_FLIGHT = "in_flight"
+DONE = "done"
+FAILED = "failed"
+
+
+class Frontier:
+    """
+    크롤 대상 URL 상태 저장소 (SQLite, WAL 모드).
+    - urls: url 별 상태(pending/in_flight/done/failed), 재시도 횟수
+    - articles: 수집한 본문 (여러 건을 한 트랜잭션으로 저장)
+    CSV 를 다시 읽어 중복을 거르는 대신 기본키 조회로 seen 여부를 판단하므로
+    이미 모은 기사 수와 무관하게 재시작 비용이 일정하다.
+    """
+
+    def __init__(self, path="news_frontier.sqlite", batch_size: int = 200, max_retries: int = 3):
+        self.path = str(path)
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self._lock = threading.Lock()
+        self._pending_articles = []
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS urls (
+                url TEXT PRIMARY KEY,
+                office TEXT,
+                date TEXT,
+                state TEXT NOT NULL DEFAULT 'pending',
+                retries INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                updated_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_urls_state ON urls(state, office);
+            CREATE TABLE IF NOT EXISTS articles (
+                url TEXT PRIMARY KEY,
+                title TEXT,
+                date TEXT,
+                content TEXT
+            );
+            """
+        )
+        self._conn.commit()
+        # 이전 실행이 중간에 죽었으면 in_flight 로 남은 URL 을 다시 대기열로
+        self.reset_in_flight()
+
+    # ---------- URL 등록 / 조회 ----------
+    def add_urls(self, urls, office, date) -> int:
+        """새 URL 등록 (이미 있으면 무시). 반환: 새로 추가된 개수"""
+        now = time.time()
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO urls (url, office, date, state, updated_at) VALUES (?, ?, ?, ?, ?)",
+                [(u, office, date, PENDING, now) for u in urls],
+            )
+            self._conn.commit()
+            return self._conn.total_changes - before
+
+    def seen(self, url) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM urls WHERE url = ?", (url,)).fetchone() is not None
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM urls LIMIT 1").fetchone() is None
+
+    def counts(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute("SELECT state, COUNT(*) FROM urls GROUP BY state").fetchall()
+        return dict(rows)
+
+    def claim(self, limit: int = 1000, office=None) -> list:
+        """pending URL 을 최대 limit 개 가져오면서 in_flight 로 표시"""
+        with self._lock:
+            if office is None:
+                rows = self._conn.execute(
+                    "SELECT url FROM urls WHERE state = ? LIMIT ?", (PENDING, limit)).fetchall()
+            else:
+                rows = self._conn.execute(
+                    "SELECT url FROM urls WHERE state = ? AND office = ? LIMIT ?", (PENDING, office, limit)).fetchall()
+            urls = [r[0] for r in rows]
+            self._conn.executemany(
+                "UPDATE urls SET state = ?, updated_at = ? WHERE url = ?",
+                [(IN_FLIGHT, time.time(), u) for u in urls],
+            )
+            self._conn.commit()
+        return urls
+
+    def reset_in_flight(self):
+        with self._lock:
+            self._conn.execute("UPDATE urls SET state = ? WHERE state = ?", (PENDING, IN_FLIGHT))
+            self._conn.commit()
+
+    # ---------- 결과 기록 ----------
+    def done(self, article: dict):
+        """본문 수집 성공. batch_size 개씩 모아서 한 트랜잭션으로 저장"""
+        with self._lock:
+            self._pending_articles.append(article)
+            if len(self._pending_articles) >= self.batch_size:
+                self._flush_locked()
+
+    def fail(self, url, error: str = ""):
+        """실패: 재시도 횟수 증가, max_retries 에 도달하면 failed"""
+        with self._lock:
+            self._conn.execute(
+                """UPDATE urls
+                   SET retries = retries + 1,
+                       state = CASE WHEN retries + 1 >= ? THEN ? ELSE ? END,
+                       last_error = ?, updated_at = ?
+                   WHERE url = ?""",
+                (self.max_retries, FAILED, PENDING, error[:500], time.time(), url),
+            )
+            self._conn.commit()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending_articles:
+            return
+        now = time.time()
+        with self._conn:  # 하나의 트랜잭션: 본문 저장 + 상태 변경이 같이 반영되거나 같이 취소됨
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO articles (url, title, date, content) VALUES (:url, :title, :date, :content)",
+                self._pending_articles,
+            )
+            self._conn.executemany(
+                "UPDATE urls SET state = ?, updated_at = ? WHERE url = ?",
+                [(DONE, now, a["url"]) for a in self._pending_articles],
+            )
+        self._pending_articles = []
+
+    # ---------- 기존 CSV 이관 / 내보내기 ----------
+    def import_legacy_csv(self, out_dir, offices):
+        """예전 news_urls_{언론사}.csv / news_contents_{언론사}.csv 를 한 번만 가져오기"""
+        for office in offices:
+            urls_file = os.path.join(out_dir, f"news_urls_{office}.csv")
+            contents_file = os.path.join(out_dir, f"news_contents_{office}.csv")
+            if os.path.exists(urls_file):
+                for chunk in pd.read_csv(urls_file, chunksize=50000):
+                    with self._lock:
+                        self._conn.executemany(
+                            "INSERT OR IGNORE INTO urls (url, office, date, state, updated_at) VALUES (?, ?, ?, ?, ?)",
+                            [(u, office, d, PENDING, time.time()) for u, d in zip(chunk['url'], chunk['date'])],
+                        )
+                        self._conn.commit()
+            if os.path.exists(contents_file):
+                cols = ['title', 'date', 'content', 'url']
+                # 깨진 행(중간에 죽으며 잘린 줄)은 건너뜀
+                for chunk in pd.read_csv(contents_file, chunksize=20000, on_bad_lines='skip'):
+                    chunk = chunk[cols].dropna(subset=['url'])
+                    with self._lock:
+                        with self._conn:
+                            self._conn.executemany(
+                                "INSERT OR IGNORE INTO urls (url, office, state, updated_at) VALUES (?, ?, ?, ?)",
+                                [(u, office, DONE, time.time()) for u in chunk['url']],
+                            )
+                            self._conn.executemany(
+                                "INSERT OR REPLACE INTO articles (url, title, date, content) VALUES (?, ?, ?, ?)",
+                                chunk[['url', 'title', 'date', 'content']].itertuples(index=False, name=None),
+                            )
+                            self._conn.executemany(
+                                "UPDATE urls SET state = ? WHERE url = ?", [(DONE, u) for u in chunk['url']],
+                            )
+            print(f"[INFO] {office}: 기존 CSV 이관 완료")
+
+    def export_csv(self, out_dir, offices, chunksize: int = 20000):
+        """언론사별 news_contents_{언론사}.csv 로 내보내기 (tmp 파일에 쓴 뒤 교체)"""
+        self.flush()
+        for office in offices:
+            out_file = os.path.join(out_dir, f"news_contents_{office}.csv")
+            tmp_file = out_file + ".tmp"
+            query = ("SELECT a.title, a.date, a.content, a.url FROM articles a "
+                     "JOIN urls u ON u.url = a.url WHERE u.office = ? ORDER BY u.date DESC")
+            header = True
+            with self._lock:
+                chunks = pd.read_sql_query(query, self._conn, params=(office,), chunksize=chunksize)
+                for chunk in chunks:
+                    chunk.to_csv(tmp_file, index=False, encoding='utf-8-sig' if header else 'utf-8',
+                                 mode='w' if header else 'a', header=header)
+                    header = False
+            if header:
+                continue  # 저장된 기사 없음
+            os.replace(tmp_file, out_file)
+            print(f"[DONE] Saved: {out_file}")
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
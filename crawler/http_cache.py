@@ -0,0 +1,170 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from datetime import date, datetime
+from urllib.parse import urlencode
+
+import requests
+
+NEVER_EXPIRE = float("inf")
+DEFAULT_TTL = 6 * 3600  # 진행 중인 기간(이번 달 등)의 기본 재검증 주기(초)
+
+
+class OfflineCacheMiss(LookupError):
+    """오프라인(replay) 모드에서 캐시에 없는 URL 을 요청한 경우"""
+
+
+def cache_key(url: str, params=None) -> str:
+    query = urlencode(sorted((params or {}).items()), doseq=True)
+    return hashlib.sha1(f"{url}?{query}".encode("utf-8")).hexdigest()
+
+
+def ttl_for_period(period_end, open_ttl: float = DEFAULT_TTL) -> float:
+    """
+    기간(연도/날짜) 단위 TTL 정책.
+    이번 달 1일보다 먼저 끝난 기간은 더 이상 바뀌지 않으므로 만료 없음, 그 외는 open_ttl.
+    """
+    if isinstance(period_end, datetime):
+        period_end = period_end.date()
+    month_start = date.today().replace(day=1)
+    return NEVER_EXPIRE if period_end < month_start else open_ttl
+
+
+class CachedResponse:
+    """requests.Response 와 같은 방식으로 쓰는 최소 응답 객체 (status_code, text, content, json())"""
+
+    def __init__(self, url, status_code, content, encoding, headers=None, from_cache=False):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.encoding = encoding
+        self.headers = headers or {}
+        self.from_cache = from_cache
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}")
+
+
+class HttpCache:
+    """
+    목록 페이지용 디스크 HTTP 캐시 (SQLite 한 파일).
+    - URL + params 를 키로 본문 저장
+    - TTL 이 지나면 ETag / Last-Modified 로 조건부 GET (304 면 본문 재사용)
+    - offline=True 면 네트워크 없이 캐시만 재생 (없으면 OfflineCacheMiss)
+    여러 스레드에서 같이 써도 된다.
+    """
+
+    def __init__(self, path="http_cache.sqlite", session: requests.Session = None,
+                 default_ttl: float = DEFAULT_TTL, offline: bool = False):
+        self.session = session or requests.Session()
+        self.default_ttl = default_ttl
+        self.offline = offline
+        self.hits = 0          # 네트워크 없이 반환
+        self.revalidated = 0   # 304
+        self.fetched = 0       # 200 새로 받음
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                   key TEXT PRIMARY KEY,
+                   url TEXT NOT NULL,
+                   params TEXT,
+                   status INTEGER NOT NULL,
+                   etag TEXT,
+                   last_modified TEXT,
+                   encoding TEXT,
+                   fetched_at REAL NOT NULL,
+                   body BLOB NOT NULL
+               )"""
+        )
+        self._conn.commit()
+
+    def _load(self, key):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT status, etag, last_modified, encoding, fetched_at, body FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+    def _store(self, key, url, params, res):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, json.dumps(params or {}, ensure_ascii=False, sort_keys=True), res.status_code,
+                 res.headers.get("ETag"), res.headers.get("Last-Modified"),
+                 res.encoding or res.apparent_encoding, time.time(), res.content),
+            )
+            self._conn.commit()
+
+    def _touch(self, key):
+        with self._lock:
+            self._conn.execute("UPDATE responses SET fetched_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+
+    def peek(self, url, params=None, ttl: float = None):
+        """네트워크 없이 쓸 수 있는 캐시 응답이 있으면 반환, 없으면 None (요청 전에 rate limit 여부 판단용)"""
+        ttl = self.default_ttl if ttl is None else ttl
+        row = self._load(cache_key(url, params))
+        if row is None:
+            if self.offline:
+                raise OfflineCacheMiss(url)
+            return None
+        status, _etag, _last_modified, encoding, fetched_at, body = row
+        if self.offline or time.time() - fetched_at < ttl:
+            self.hits += 1
+            return CachedResponse(url, status, body, encoding, from_cache=True)
+        return None
+
+    def get(self, url, params=None, headers=None, timeout=30, ttl: float = None) -> CachedResponse:
+        """
+        캐시를 거치는 GET. ttl 을 주지 않으면 default_ttl 사용.
+        200 응답만 저장하고, 그 외 상태코드는 저장하지 않고 그대로 돌려준다.
+        """
+        cached = self.peek(url, params, ttl)
+        if cached is not None:
+            return cached
+
+        key = cache_key(url, params)
+        row = self._load(key)
+
+        req_headers = dict(headers or {})
+        if row is not None:
+            status, etag, last_modified, encoding, _fetched_at, body = row
+            if etag:
+                req_headers["If-None-Match"] = etag
+            if last_modified:
+                req_headers["If-Modified-Since"] = last_modified
+
+        res = self.session.get(url, params=params, headers=req_headers, timeout=timeout)
+        if res.status_code == 304 and row is not None:
+            self._touch(key)
+            self.revalidated += 1
+            return CachedResponse(url, status, body, encoding, from_cache=True)
+
+        if res.status_code == 200:
+            self._store(key, url, params, res)
+            self.fetched += 1
+        return CachedResponse(url, res.status_code, res.content, res.encoding or res.apparent_encoding,
+                              headers=dict(res.headers))
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "revalidated": self.revalidated, "fetched": self.fetched}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
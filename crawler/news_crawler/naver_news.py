@@ -0,0 +1,147 @@
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # crawler/ 공용 모듈
+from crawl_engine import CrawlEngine
+from frontier import Frontier
+from http_cache import HttpCache, ttl_for_period
+from news_extract import load_extractor
+
+SEARCH_URL = "https://s.search.naver.com/p/newssearch/3/api/tab/more"
+SEARCH_HEADERS = {'User-Agent': 'Mozilla/5.0', 'Referer': 'https://search.naver.com/'}
+ARTICLE_HEADERS = {'User-Agent': 'Mozilla/5.0', 'Referer': 'https://news.naver.com/'}
+
+OFFICES = {"매일경제": "1009", "한국경제": "1015", "머니투데이": "1008"}
+KEYWORD = "금리"
+MAX_START = 2000
+
+# 호스트별 초당 요청 수 (검색 API 가 더 민감함)
+HOST_RATES = {"s.search.naver.com": 3.0, "n.news.naver.com": 8.0}
+
+# 본문 파싱 백엔드 (lxml 이 없으면 bs4)
+EXTRACTOR, parse_article, extract_urls = load_extractor()
+
+
+def generate_date_list(start, end):
+    date_list = []
+    curr = end
+    while curr >= start:
+        date_list.append(curr.strftime("%Y.%m.%d"))
+        curr -= timedelta(days=1)
+    return date_list
+
+
+def search_params(date, office_id, start, query=KEYWORD):
+    return {
+        'abt': 'null',
+        'de': date,
+        'ds': date,
+        'field': '0',
+        'is_dts': '0',
+        'is_sug_officeid': '0',
+        'mynews': '1',
+        'news_office_checked': office_id,
+        'nqx_theme': '{"theme":{"sub":[{"name":"finance"}]}}',
+        'nso': f'so:r,p:from{date.replace(".","")}to{date.replace(".","")},a:all',
+        'office_category': '0',
+        'office_section_code': '3',
+        'office_type': '1',
+        'pd': '3',
+        'photo': '0',
+        'query': query,
+        'rev': '0',
+        'service_area': '0',
+        'sm': 'tab_smr',
+        'sort': '2',
+        'spq': '0',
+        'ssc': 'tab.news.all',
+        'start': start
+    }
+
+
+async def get_urls_bydate(engine: CrawlEngine, date, office_id):
+    """한 날짜/언론사의 검색 결과 페이지를 끝까지 넘기며 기사 URL 수집 (페이지끼리는 순서대로)"""
+    collected_urls = []
+    ttl = ttl_for_period(datetime.strptime(date, "%Y.%m.%d"))
+    for start in range(1, MAX_START, 10):
+        res = await engine.fetch(SEARCH_URL, params=search_params(date, office_id, start),
+                                 headers=SEARCH_HEADERS, timeout=10, ttl=ttl)
+        if res.status_code != 200 or not res.text.strip():
+            break
+        page_urls = extract_urls(res.json())
+        if not page_urls:
+            break
+        collected_urls.extend(page_urls)
+    return list(set(collected_urls))
+
+
+async def news_content(engine: CrawlEngine, url):
+    res = await engine.fetch(url, headers=ARTICLE_HEADERS, timeout=15, use_cache=False)
+    if res.status_code != 200:
+        return None
+    return parse_article(res.text, url)
+
+
+async def crawl(dates, frontier: Frontier, offices=OFFICES, engine: CrawlEngine = None, claim_size=5000):
+    """
+    (날짜 x 언론사) 전체를 동시에 URL 수집 -> frontier 에 등록 -> pending 본문 수집.
+    진행 상태는 전부 frontier(SQLite)에 남으므로 중간에 멈춰도 이어서 실행된다.
+    """
+    engine = engine or CrawlEngine(host_rates=HOST_RATES)
+    office_names = {office_id: office for office, office_id in offices.items()}
+
+    # 1) URL 수집
+    def save_urls(job, urls):
+        date, office_id = job
+        if urls:
+            frontier.add_urls(urls, office_names[office_id], date)
+
+    url_jobs = [(date, office_id) for date in dates for office_id in offices.values()]
+    await engine.run_jobs(lambda job: get_urls_bydate(engine, *job), url_jobs, on_result=save_urls)
+    print(f"[INFO] URL 수집 완료: {frontier.counts()} / {engine.stats.report()}")
+
+    # 2) 본문 수집
+    async def crawl_article(url):
+        try:
+            data = await news_content(engine, url)
+        except Exception as e:
+            frontier.fail(url, str(e))
+            return
+        if data is None:
+            frontier.fail(url, "status != 200")
+        else:
+            frontier.done(data)
+
+    while True:
+        urls_to_crawl = frontier.claim(claim_size)
+        if not urls_to_crawl:
+            break
+        await engine.run_jobs(crawl_article, urls_to_crawl)
+        frontier.flush()
+        print(f"[INFO] 진행: {frontier.counts()}")
+
+    report = engine.stats.report()
+    print(f"[DONE] {report}")
+    print(f"[DONE] host rates: {engine.host_report()}")
+    return report
+
+
+if __name__ == "__main__":
+    s_dt = datetime(2012, 1, 1)
+    e_dt = datetime(2025, 12, 30)
+    out_dir = "."
+
+    frontier = Frontier(os.path.join(out_dir, 'news_frontier.sqlite'))
+    if frontier.is_empty():
+        frontier.import_legacy_csv(out_dir, OFFICES)
+
+    cache = HttpCache('naver_search_cache.sqlite')
+    engine = CrawlEngine(host_rates=HOST_RATES, cache=cache)
+    asyncio.run(crawl(generate_date_list(s_dt, e_dt), frontier, engine=engine))
+
+    # 후속 전처리 노트북이 읽는 CSV 형식으로 내보내기
+    frontier.export_csv(out_dir, OFFICES)
+    frontier.close()
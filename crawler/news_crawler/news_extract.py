@@ -0,0 +1,139 @@
+import html
+import re
+
+# 본문/제목/날짜 추출기 모음.
+# - bs4  : 기존 노트북 방식 그대로 (BeautifulSoup + html.parser). 결과 비교 기준(reference)
+# - lxml : lxml 로 필요한 노드만 xpath 로 찾고, 텍스트 결합 규칙은 bs4 get_text 와 동일하게 맞춘 버전
+# 두 백엔드는 같은 dict {'title', 'date', 'content', 'url'} 를 돌려준다.
+
+NO_TITLE = "제목 없음"
+NO_DATE = "날짜 없음"
+NO_CONTENT = "본문 없음"
+NEWS_HOST = 'n.news.naver.com'
+
+
+# ---------- bs4 (reference) ----------
+def parse_article_bs4(html_text, url):
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html_text, 'html.parser')
+
+    title = soup.select_one("h2#title_area")
+    title = title.get_text(strip=True) if title else NO_TITLE
+
+    date_tag = soup.select_one("span.media_end_head_info_datestamp_time")
+    if date_tag and date_tag.has_attr('data-date-time'):
+        date_str = date_tag['data-date-time']
+    else:
+        date_str = date_tag.get_text(strip=True) if date_tag else NO_DATE
+    content = soup.select_one("#newsct_article")  # 또는 "#dic_area"
+
+    if content:
+        content = content.get_text(" ", strip=True)
+    else:
+        content = NO_CONTENT
+    return {'title': title, 'date': date_str, 'content': content, 'url': url}
+
+
+def extract_urls_bs4(json_data):
+    from bs4 import BeautifulSoup
+    urls = []
+    for item in json_data.get('collection', []):
+        html_str = item.get('html', '')
+        soup = BeautifulSoup(html_str, 'html.parser')
+        links = soup.find_all('a', href=True)
+        for link in links:
+            if NEWS_HOST in link['href']:
+                urls.append(link['href'])
+    unique_urls = list(set(urls))
+    return unique_urls
+
+
+# ---------- lxml (fast) ----------
+# bs4 get_text 가 건너뛰는 문자열(스크립트/스타일/템플릿/루비 주석)
+_SKIP_TEXT_TAGS = {"script", "style", "template", "rt", "rp"}
+
+_XP_TITLE = "//h2[@id='title_area']"
+_XP_DATE = ("//span[contains(concat(' ', normalize-space(@class), ' '), "
+            "' media_end_head_info_datestamp_time ')]")
+_XP_CONTENT = "//*[@id='newsct_article']"
+
+
+def _iter_strings(el):
+    """bs4 _all_strings 와 같은 순서로 텍스트 조각을 돌려줌 (주석/스크립트 제외, tail 포함)"""
+    if isinstance(el.tag, str) and el.tag.lower() not in _SKIP_TEXT_TAGS and el.text:
+        yield el.text
+    for child in el:
+        # 주석/PI 는 tag 가 함수. 건너뛰는 태그는 안쪽 요소까지 통째로 제외 (bs4 와 같음)
+        if isinstance(child.tag, str) and child.tag.lower() not in _SKIP_TEXT_TAGS:
+            yield from _iter_strings(child)
+        if child.tail:
+            yield child.tail
+
+
+def _get_text(el, sep=""):
+    return sep.join(s for s in (t.strip() for t in _iter_strings(el)) if s)
+
+
+def _first(doc, xpath):
+    found = doc.xpath(xpath)
+    return found[0] if found else None
+
+
+def parse_article_lxml(html_text, url):
+    import lxml.html
+    try:
+        doc = lxml.html.fromstring(html_text)
+    except ValueError:
+        # encoding 선언이 있는 str 은 lxml 이 거부 -> bytes 로 다시
+        doc = lxml.html.fromstring(html_text.encode("utf-8"))
+
+    title = _first(doc, _XP_TITLE)
+    title = _get_text(title) if title is not None else NO_TITLE
+
+    date_tag = _first(doc, _XP_DATE)
+    if date_tag is not None and 'data-date-time' in date_tag.attrib:
+        date_str = date_tag.get('data-date-time')
+    else:
+        date_str = _get_text(date_tag) if date_tag is not None else NO_DATE
+
+    content = _first(doc, _XP_CONTENT)
+    content = _get_text(content, " ") if content is not None else NO_CONTENT
+    return {'title': title, 'date': date_str, 'content': content, 'url': url}
+
+
+# <a ... href="..."> 의 href 만 정규식으로 바로 추출 (검색 결과 조각은 구조가 단순함)
+_HREF_RE = re.compile(r"""<a\b[^>]*?\shref\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.IGNORECASE)
+
+
+def extract_urls_fast(json_data):
+    urls = set()
+    for item in json_data.get('collection', []):
+        html_str = item.get('html', '')
+        if NEWS_HOST not in html_str:
+            continue
+        for m in _HREF_RE.finditer(html_str):
+            href = html.unescape(m.group(1) or m.group(2) or m.group(3) or "")
+            if NEWS_HOST in href:
+                urls.add(href)
+    return list(urls)
+
+
+EXTRACTORS = {
+    "bs4": (parse_article_bs4, extract_urls_bs4),
+    "lxml": (parse_article_lxml, extract_urls_fast),
+}
+
+
+def load_extractor(name: str = None):
+    """
+    lxml 우선, 설치가 안 되어 있으면 bs4 로 폴백.
+    반환: (extractor_name, parse_article_fn, extract_urls_fn)
+    """
+    if name is None:
+        try:
+            import lxml.html  # noqa: F401
+            name = "lxml"
+        except ImportError:
+            name = "bs4"
+    parse_fn, urls_fn = EXTRACTORS[name]
+    return name, parse_fn, urls_fn
@@ -0,0 +1,241 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0"}
+CHUNK_SIZE = 1 << 16          # 64KB 단위로 스트리밍
+PART_SUFFIX = ".part"         # 받는 중인 파일 확장자 (완료 후 원래 이름으로 rename)
+PART_META_SUFFIX = ".part.json"  # .part 를 받기 시작할 때의 ETag / Last-Modified (이어받기 If-Range 용)
+MANIFEST_NAME = "manifest.json"
+
+_CONTENT_RANGE_RE = re.compile(r"bytes (\d+)-(\d+)/(\d+|\*)")
+
+
+def make_session(pool_size: int = 16, headers: dict = None, retries: int = 3) -> requests.Session:
+    """커넥션 풀을 재사용하는 Session 생성 (스레드 여러 개가 같이 사용)"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(headers or DEFAULT_HEADERS)
+    return session
+
+
+def sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class Manifest:
+    """
+    다운로드 완료 기록. save_root/manifest.json 에 {상대경로: {url, size, sha256}} 형태로 저장.
+    파일은 .part 로 받은 뒤 rename 하므로, manifest에 있는 파일은 항상 완전한 파일이다.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root).resolve()
+        self.path = self.root / MANIFEST_NAME
+        self._lock = threading.Lock()
+        self.entries = {}
+        if self.path.exists():
+            self.entries = json.loads(self.path.read_text(encoding="utf-8"))
+
+    def key(self, file_path: Path) -> str:
+        return Path(file_path).resolve().relative_to(self.root).as_posix()
+
+    def get(self, file_path: Path):
+        return self.entries.get(self.key(file_path))
+
+    def is_complete(self, file_path: Path) -> bool:
+        entry = self.get(file_path)
+        if entry is None or not file_path.exists():
+            return False
+        return file_path.stat().st_size == entry["size"]
+
+    def record(self, file_path: Path, url: str, size: int, sha256: str):
+        with self._lock:
+            self.entries[self.key(file_path)] = {"url": url, "size": size, "sha256": sha256}
+
+    def save(self):
+        # tmp에 쓰고 교체 -> 저장 도중 죽어도 manifest가 깨지지 않음
+        with self._lock:
+            data = json.dumps(self.entries, ensure_ascii=False, indent=1, sort_keys=True)
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(data, encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+class PdfDownloader:
+    """
+    세션 풀 + 스레드 병렬 다운로드.
+    - 청크 단위로 .part 파일에 스트리밍 저장 후 os.replace 로 원자적 rename
+    - .part 가 남아 있으면 HTTP Range + If-Range(받기 시작할 때의 ETag / Last-Modified)로 이어받기.
+      서버 파일이 바뀌었으면 200 이 오므로 처음부터 다시 받음
+    - 크기를 확인할 수 없는 응답(Content-Length 없음, HEAD 도 실패, chunked 도 아님)은 완료로 치지 않음
+    - 완료 파일은 manifest(size, sha256)에 기록 -> 재실행 시 바로 건너뜀
+    """
+
+    def __init__(self, save_root, session: requests.Session = None,
+                 max_workers: int = 8, timeout: int = 60, save_every: int = 20):
+        self.save_root = Path(save_root)
+        self.save_root.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max_workers
+        self.session = session or make_session(pool_size=max_workers)
+        self.timeout = timeout
+        self.save_every = save_every
+        self.manifest = Manifest(self.save_root)
+
+    def _remote_size(self, url: str):
+        try:
+            r = self.session.head(url, timeout=self.timeout, allow_redirects=True)
+            if r.ok and r.headers.get("Content-Length"):
+                return int(r.headers["Content-Length"])
+        except requests.RequestException:
+            pass
+        return None
+
+    @staticmethod
+    def _read_part_meta(meta_path: Path) -> dict:
+        try:
+            return json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _if_range(meta: dict):
+        """If-Range 에 쓸 validator. weak ETag 는 If-Range 에 쓸 수 없으므로 Last-Modified 로"""
+        etag = meta.get("etag")
+        if etag and not etag.startswith("W/"):
+            return etag
+        return meta.get("last_modified")
+
+    def _restart(self, url: str, file_path: Path, part_path: Path, meta_path: Path) -> str:
+        """.part 를 버리고 처음부터"""
+        part_path.unlink(missing_ok=True)
+        meta_path.unlink(missing_ok=True)
+        return self.download(url, file_path)
+
+    def _adopt_existing(self, url: str, file_path: Path) -> bool:
+        """manifest 없이 이미 있는 파일(예전 방식으로 받은 파일): 서버 크기와 같을 때만 완료로 인정"""
+        size = file_path.stat().st_size
+        if size > 0 and self._remote_size(url) == size:
+            self.manifest.record(file_path, url, size, sha256_file(file_path))
+            return True
+        return False
+
+    def download(self, url: str, file_path) -> str:
+        """파일 하나 다운로드. 반환: 'skipped' | 'downloaded' | 'resumed'"""
+        file_path = Path(file_path)
+        if self.manifest.is_complete(file_path):
+            return "skipped"
+        if file_path.exists() and self.manifest.get(file_path) is None and self._adopt_existing(url, file_path):
+            return "skipped"
+
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        part_path = file_path.with_name(file_path.name + PART_SUFFIX)
+        meta_path = file_path.with_name(file_path.name + PART_META_SUFFIX)
+        offset = part_path.stat().st_size if part_path.exists() else 0
+        validator = self._if_range(self._read_part_meta(meta_path)) if offset else None
+        if offset and validator is None:
+            # 받기 시작할 때의 validator 가 없으면 .part 가 같은 파일인지 알 수 없음
+            return self._restart(url, file_path, part_path, meta_path)
+
+        headers = {"Range": f"bytes={offset}-", "If-Range": validator} if offset else {}
+        r = self.session.get(url, headers=headers, stream=True, timeout=self.timeout)
+        try:
+            if offset and r.status_code == 416:
+                # 범위 오류: .part 를 신뢰할 수 없으므로 처음부터 다시
+                r.close()
+                return self._restart(url, file_path, part_path, meta_path)
+            r.raise_for_status()
+
+            expected = None
+            resumed = offset > 0 and r.status_code == 206
+            if resumed:
+                match = _CONTENT_RANGE_RE.match(r.headers.get("Content-Range", ""))
+                if match is None or int(match.group(1)) != offset:
+                    r.close()
+                    return self._restart(url, file_path, part_path, meta_path)
+                if match.group(3) != "*":
+                    expected = int(match.group(3))
+            else:
+                # 200: 처음 받거나, If-Range 가 안 맞아서(서버 파일이 바뀜) 전체가 옴 -> 처음부터
+                offset = 0
+                meta = {"url": url, "etag": r.headers.get("ETag"), "last_modified": r.headers.get("Last-Modified")}
+                meta_path.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+
+            length = r.headers.get("Content-Length")
+            if expected is None and length:
+                expected = offset + int(length)
+            chunked = "chunked" in r.headers.get("Transfer-Encoding", "").lower()
+
+            hasher = hashlib.sha256()
+            if resumed:
+                with open(part_path, "rb") as f:
+                    for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                        hasher.update(chunk)
+
+            size = offset
+            with open(part_path, "ab" if resumed else "wb") as f:
+                for chunk in r.iter_content(chunk_size=CHUNK_SIZE):
+                    if chunk:
+                        f.write(chunk)
+                        hasher.update(chunk)
+                        size += len(chunk)
+        finally:
+            r.close()
+
+        if expected is None and not chunked:
+            # 길이 정보 없이 연결 종료로 끝난 응답은 중간에 끊겨도 구분이 안 되므로 HEAD 로 크기 확인
+            expected = self._remote_size(url)
+            if expected is None:
+                raise IOError(f"cannot verify download size (no Content-Length): {url}")
+        if expected is not None and size != expected:
+            # 연결이 중간에 끊긴 경우: .part 는 남겨두고 다음 실행 때 이어받기
+            raise IOError(f"incomplete download ({size}/{expected} bytes): {url}")
+
+        os.replace(part_path, file_path)
+        meta_path.unlink(missing_ok=True)
+        self.manifest.record(file_path, url, size, hasher.hexdigest())
+        return "resumed" if resumed else "downloaded"
+
+    def download_all(self, jobs, on_result=None) -> dict:
+        """
+        jobs: [(url, file_path), ...] 병렬 다운로드.
+        on_result(url, file_path, status) 가 있으면 끝나는 순서대로 호출 (status 에 'failed' 포함)
+        반환: 상태별 개수 {'skipped': n, 'downloaded': n, 'resumed': n, 'failed': n}
+        """
+        summary = {"skipped": 0, "downloaded": 0, "resumed": 0, "failed": 0}
+        done = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            future_to_job = {executor.submit(self.download, url, path): (url, path) for url, path in jobs}
+            for future in as_completed(future_to_job):
+                url, path = future_to_job[future]
+                try:
+                    status = future.result()
+                    if status != "skipped":
+                        print(f"[INFO] {status}: {path}")
+                except Exception as e:
+                    status = "failed"
+                    print(f"[WARN] 실패: {path} / {e}")
+                summary[status] += 1
+                if on_result is not None:
+                    on_result(url, path, status)
+
+                done += 1
+                if done % self.save_every == 0:
+                    self.manifest.save()
+
+        self.manifest.save()
+        return summary
@@ -0,0 +1,118 @@
+import csv
+
+from ngram_utils import KEEP_TAGS, NEWS_KEEP_TAGS
+
+# 사전(total_lexicon.csv)의 n-gram 단어('금리/NNG;인상/NNG')를 품사 태그 unigram 트라이로 바꿔서
+# MPCK.tokenize 결과에 바로 맞춰 보는 매처.
+# 지금까지는 문장마다 ngramize 로 ';' 로 이은 n-gram 문자열을 전부 만들어 저장하고 tone 계산 때 set 에 넣어 봤는데,
+# 그 n-gram 대부분은 사전에 없다. 트라이로 보면 첫 토큰이 사전에 없는 구간은 바로 건너뛰고 문자열도 만들지 않는다.
+#   - count_cover: ngramize(긴 것 우선 greedy cover) 가 만드는 구간 = 왼쪽부터 max_n 개씩 + 마지막 꼬리 하나.
+#                  각 구간이 사전 단어인지 트라이로 확인 (ngramize 결과를 set 으로 센 것과 같음)
+#   - count_all:   all_ngrams(겹치는 n-gram 전부) 버전. 위치마다 트라이를 max_n 깊이까지 따라가며 셈
+# 트라이 노드는 dict (토큰 -> 자식 노드), 단어 끝 노드는 None 키에 극성(+1 hawkish / -1 dovish)
+
+SEP = ';'
+HAWKISH, DOVISH = 1, -1
+_POLARITY = {'hawkish': HAWKISH, 'dovish': DOVISH}
+
+
+class LexiconTrie:
+    def __init__(self, words_with_polarity=()):
+        """words_with_polarity: [(단어, +1 / -1), ...]. 단어는 ';' 로 이은 '형태소/품사' n-gram"""
+        self.root = {}
+        self.size = 0
+        self.max_depth = 0
+        for word, polarity in words_with_polarity:
+            self.add(word, polarity)
+
+    def add(self, word: str, polarity: int):
+        parts = word.split(SEP)
+        node = self.root
+        for part in parts:
+            node = node.setdefault(part, {})
+        if None not in node:
+            self.size += 1
+        node[None] = polarity
+        self.max_depth = max(self.max_depth, len(parts))
+
+    @classmethod
+    def from_sets(cls, hawkish_set, dovish_set):
+        """tone.ipynb 의 hawkish_set / dovish_set 으로 만들기"""
+        return cls([(w, HAWKISH) for w in hawkish_set] + [(w, DOVISH) for w in dovish_set])
+
+    @classmethod
+    def from_csv(cls, path):
+        """total_lexicon.csv (첫 열: 단어, label 열: hawkish / dovish)"""
+        with open(path, encoding='utf-8-sig', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            label_idx = header.index('label')
+            return cls((row[0], _POLARITY[row[label_idx]]) for row in reader if row[label_idx] in _POLARITY)
+
+    def match(self, tokens, start: int, end: int) -> int:
+        """tokens[start:end] 가 사전 단어면 극성, 아니면 0"""
+        node = self.root
+        for i in range(start, end):
+            node = node.get(tokens[i])
+            if node is None:
+                return 0
+        return node.get(None, 0)
+
+    def count_cover(self, tokens, max_n: int = 5, keep_tags=KEEP_TAGS):
+        """
+        MPCK.tokenize 결과 -> (hawkish 수, dovish 수).
+        len([w for w in ngramize(tokens, max_n, keep_tags) if w in hawkish_set]) 와 같은 값 (dovish 도)
+        """
+        keep = keep_tags if isinstance(keep_tags, frozenset) else frozenset(keep_tags)
+        filtered = [w for w in tokens if w.split('/', 2)[1] in keep]
+        root = self.root
+        n_h = n_d = 0
+        # 왼쪽부터 max_n 개씩 자르면 마지막 조각이 곧 꼬리(길이 L % max_n)
+        for s in range(0, len(filtered), max_n):
+            node = root
+            for w in filtered[s:s + max_n]:
+                node = node.get(w)
+                if node is None:
+                    break
+            else:
+                p = node.get(None)
+                if p == HAWKISH:
+                    n_h += 1
+                elif p == DOVISH:
+                    n_d += 1
+        return n_h, n_d
+
+    def count_all(self, tokens, max_n: int = 5, keep_tags=NEWS_KEEP_TAGS):
+        """all_ngrams(겹치는 n-gram 전부) 결과를 사전과 맞춘 (hawkish 수, dovish 수)"""
+        keep = keep_tags if isinstance(keep_tags, frozenset) else frozenset(keep_tags)
+        filtered = [w for w in tokens if w.split('/', 2)[1] in keep]
+        root = self.root
+        n_h = n_d = 0
+        length = len(filtered)
+        for pos in range(length):
+            node = root
+            for i in range(pos, min(pos + max_n, length)):
+                node = node.get(filtered[i])
+                if node is None:
+                    break
+                p = node.get(None)
+                if p == HAWKISH:
+                    n_h += 1
+                elif p == DOVISH:
+                    n_d += 1
+        return n_h, n_d
+
+    def count_many(self, token_lists, mode: str = 'cover', max_n: int = 5, keep_tags=None):
+        """여러 문장 -> ([hawkish 수, ...], [dovish 수, ...])"""
+        if mode == 'cover':
+            count, keep = self.count_cover, frozenset(keep_tags or KEEP_TAGS)
+        elif mode == 'all':
+            count, keep = self.count_all, frozenset(keep_tags or NEWS_KEEP_TAGS)
+        else:
+            raise ValueError(f"mode 는 'cover' 또는 'all': {mode}")
+        n_h, n_d = [], []
+        for tokens in token_lists:
+            h, d = count(tokens, max_n, keep)
+            n_h.append(h)
+            n_d.append(d)
+        return n_h, n_d
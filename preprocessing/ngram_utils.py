@@ -0,0 +1,53 @@
+# n-gram 공용 함수. 노트북/스크립트마다 복사돼 있던 ngramize 를 이 파일 하나로 모음.
+#
+# 기존 ngramize: 가능한 모든 (시작위치, 길이) n-gram 을 dict 로 만들고, 길이 내림차순으로 정렬한 뒤
+# 아직 덮이지 않은 n-gram 을 앞에서부터 고름 (긴 것 우선 greedy cover).
+# 길이가 같으면 시작위치 순이고, 처음에는 전체가 빈 구간 하나이므로 결과는 항상
+#   - 왼쪽부터 max_n 개씩 자른 n-gram 들, 그다음
+#   - 남은 꼬리(길이 L % max_n) 하나
+# 가 된다. 여기서는 dict/정렬/set 없이 빈 구간(run)을 길이별로 잘라서 같은 결과를 바로 만든다.
+
+KEEP_TAGS = ('NNG', 'VA', 'VAX', 'MAG', 'VV')
+NEWS_KEEP_TAGS = ('NNG', 'VV', 'VA', 'MAG')  # news_preprocess / meeting_preprocess 노트북
+
+
+def filter_tags(tokens, keep_tags=KEEP_TAGS):
+    """'단어/품사' 토큰 중 품사가 keep_tags 인 것만 (기존과 같이 '/' 가 없으면 IndexError)"""
+    keep = frozenset(keep_tags)
+    return [w for w in tokens if w.split('/', 2)[1] in keep]
+
+
+def cover_ngrams(filtered, max_n=5):
+    """이미 필터링된 토큰 -> 긴 것 우선 greedy cover n-gram (기존 ngramize 와 같은 순서)"""
+    runs = [(0, len(filtered))]  # 아직 덮이지 않은 구간들 (시작위치 순)
+    result = []
+    for n in range(max_n, 0, -1):
+        next_runs = []
+        for start, end in runs:
+            k = (end - start) // n
+            for s in range(start, start + k * n, n):
+                result.append(";".join(filtered[s:s + n]))
+            if start + k * n < end:
+                next_runs.append((start + k * n, end))
+        runs = next_runs
+        if not runs:
+            break
+    return result
+
+
+def ngramize(tokens, max_n=5, keep_tags=KEEP_TAGS):
+    return cover_ngrams(filter_tags(tokens, keep_tags), max_n)
+
+
+def ngramize_batch(token_lists, max_n=5, keep_tags=KEEP_TAGS):
+    """여러 문장의 토큰 리스트를 한 번에 (keep_tags 집합을 한 번만 만듦)"""
+    keep = frozenset(keep_tags)
+    return [cover_ngrams([w for w in tokens if w.split('/', 2)[1] in keep], max_n) for tokens in token_lists]
+
+
+def all_ngrams(tokens, max_n=5, keep_tags=NEWS_KEEP_TAGS):
+    """겹치는 n-gram 전부 (시작위치 순, 같은 위치는 짧은 것부터). news_preprocess 노트북의 ngramize"""
+    filtered = filter_tags(tokens, keep_tags)
+    length = len(filtered)
+    return [";".join(filtered[pos:pos + n])
+            for pos in range(length) for n in range(1, min(max_n, length - pos) + 1)]
@@ -1,10 +1,16 @@
 import json
+import os
 import re
 import ast
+import sys
 from collections import Counter
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 
 IN_PATH  = Path(r"db\press_conference_pdfs\processed\docs_tokens.csv")
 OUT_PATH = Path(r"db\press_conference_pdfs\processed\docs_tokens_clean_v2.csv")
@@ -104,47 +110,175 @@ def should_drop(surface: str) -> bool:
 
     return False
 
-def main():
-    if not IN_PATH.exists():
-        raise FileNotFoundError(f"입력 파일 없음: {IN_PATH}")
+class TokenCleaner:
+    """
+    토큰 정제 엔진. 제거 여부는 표면형에만 달려 있으므로
+    - chunk 의 토큰을 한 줄로 펴서(flat) 고유 토큰으로 factorize
+    - 처음 보는 고유 토큰만 split_surface_pos + should_drop 으로 판정 (결과는 chunk 간에 재사용)
+    - 판정 결과를 고유 토큰 번호로 인덱싱해서 전체 토큰에 마스크로 적용
+    removed 통계(소문자 표면형별 제거 횟수)는 토큰 하나씩 처리하던 방식과 같다.
+    """
 
-    df = pd.read_csv(IN_PATH)
-    if TOK_COL not in df.columns:
-        raise KeyError(f"'{TOK_COL}' 컬럼이 없습니다. 현재 컬럼: {list(df.columns)}")
+    def __init__(self):
+        self.decisions = {}      # 원래 토큰 -> (정제된 토큰 또는 None(제거), 제거 시 removed 키)
+        self.removed = Counter()
+        self.n_docs = 0
+        self.tokens_before = 0
+        self.tokens_after = 0
 
-    removed = Counter()
-
-    def clean_cell(cell):
-        toks = safe_load_tokens(cell)
-        out = []
-
-        for tok in toks:
+    def _decide(self, uniques):
+        for tok in uniques:
+            if tok in self.decisions:
+                continue
             surf, pos = split_surface_pos(tok)
             if should_drop(surf):
-                removed[surf.lower()] += 1
-                continue
+                self.decisions[tok] = (None, surf.lower())
+            else:
+                # 원래 형식 유지: POS가 있으면 surf/POS로 저장
+                self.decisions[tok] = (f"{surf}/{pos}" if pos else surf, None)
+
+    def clean_lists(self, token_lists) -> list:
+        """토큰 리스트들 -> 정제된 토큰 리스트들 (행 순서 그대로)"""
+        lengths = np.fromiter((len(t) for t in token_lists), dtype=np.int64, count=len(token_lists))
+        self.n_docs += len(token_lists)
+        self.tokens_before += int(lengths.sum())
+
+        flat = [str(t) for toks in token_lists for t in toks]
+        if not flat:
+            return [[] for _ in token_lists]
+        codes, uniques = pd.factorize(np.array(flat, dtype=object))
+        self._decide(uniques)
+
+        cleaned = np.array([self.decisions[u][0] for u in uniques], dtype=object)
+        keep = np.array([c is not None for c in cleaned])[codes]
+
+        # 제거 횟수: 고유 토큰별로 센 뒤 처음 나온 순서대로 더함
+        drop_counts = np.bincount(codes[~keep], minlength=len(uniques))
+        for u in np.flatnonzero(drop_counts):
+            self.removed[self.decisions[uniques[u]][1]] += int(drop_counts[u])
+
+        kept = cleaned[codes[keep]]
+        kept_cum = np.concatenate([[0], np.cumsum(keep)])
+        ends = np.cumsum(lengths)
+        kept_lengths = kept_cum[ends] - kept_cum[ends - lengths]
+        self.tokens_after += int(kept_lengths.sum())
+        return [part.tolist() for part in np.split(kept, np.cumsum(kept_lengths)[:-1])]
+
+    def report(self, top=30):
+        before_avg = self.tokens_before / self.n_docs if self.n_docs else float("nan")
+        after_avg = self.tokens_after / self.n_docs if self.n_docs else float("nan")
+        print(f"[INFO] docs: {self.n_docs}")
+        print(f"[INFO] avg token_len: {before_avg:.1f} -> {after_avg:.1f}")
+        print("[INFO] top removed surfaces:")
+        for k, v in self.removed.most_common(top):
+            print(f"  {k}: {v}")
 
-            # 원래 형식 유지: POS가 있으면 surf/POS로 저장
-            if pos:
-                out.append(f"{surf}/{pos}")
+
+def load_token_column(cells) -> list:
+    """
+    tokens 컬럼 -> 리스트들. 문자열 셀은 chunk 전체를 JSON 배열 하나로 묶어 한 번에 파싱하고,
+    JSON 이 아닌 셀(파이썬 리스트 표기 등)이 섞여 있으면 셀마다 safe_load_tokens 로 다시 파싱
+    """
+    cells = list(cells)
+    if all(isinstance(c, str) for c in cells):
+        try:
+            parsed = json.loads("[" + ",".join(c if c.strip() else "[]" for c in cells) + "]")
+            if len(parsed) == len(cells):
+                return [v if isinstance(v, list) else [] for v in parsed]
+        except ValueError:
+            pass
+    # 이미 리스트/배열(parquet list 컬럼)이거나 섞인 경우
+    return [list(c) if isinstance(c, (list, tuple, np.ndarray)) else safe_load_tokens(c) for c in cells]
+
+
+def part_files(folder: Path) -> list:
+    """폴더 안 part 파일들 (*.parquet). batch_2 가 batch_10 보다 먼저 오도록 정렬"""
+    return sorted(folder.glob("*.parquet"), key=lambda p: (len(p.stem), p.stem))
+
+
+def parquet_schema(path: Path):
+    """parquet 파일 / part 폴더의 스키마. part 마다 조금 다를 수 있어서(전부 null 인 컬럼 등) 합친 스키마"""
+    files = part_files(path) if path.is_dir() else [path]
+    if not files:
+        return None
+    return pa.unify_schemas([pq.read_schema(f) for f in files], promote_options="permissive")
+
+
+def iter_chunks(path: Path, chunksize: int):
+    if path.is_dir():
+        # sentence_split / run_production 출력 폴더: part 순서대로 합친 스키마로 맞춰 스트리밍
+        files = part_files(path)
+        if not files:
+            return
+        schema = parquet_schema(path)
+        dataset = ds.dataset([str(f) for f in files], schema=schema, format="parquet")
+        for fragment in dataset.get_fragments():
+            for batch in fragment.to_batches(schema=schema, batch_size=chunksize):
+                yield batch.to_pandas()
+    elif path.suffix.lower() == ".parquet":
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+
+def clean_file(in_path: Path, out_path: Path, cleaner: TokenCleaner = None, chunksize: int = 50_000,
+               tok_col: str = TOK_COL) -> TokenCleaner:
+    """
+    CSV(press docs_tokens.csv), Parquet(문장 단위 코퍼스) 또는 part parquet 폴더를 chunk 단위로 정제.
+    CSV 는 tokens 를 JSON 문자열로, Parquet/폴더는 list<string> 컬럼의 parquet 하나로 저장.
+    """
+    cleaner = cleaner or TokenCleaner()
+    is_parquet = in_path.is_dir() or in_path.suffix.lower() == ".parquet"
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out_path.with_suffix(out_path.suffix + ".tmp")
+    writer = None
+    first = True
+    try:
+        for df in iter_chunks(in_path, chunksize):
+            if tok_col not in df.columns:
+                raise KeyError(f"'{tok_col}' 컬럼이 없습니다. 현재 컬럼: {list(df.columns)}")
+            cleaned = cleaner.clean_lists(load_token_column(df[tok_col]))
+            if is_parquet:
+                df[tok_col] = cleaned
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                if writer is None:
+                    # 첫 chunk 가 아니라 입력 스키마 기준 (첫 chunk 에서 전부 null 인 컬럼이 null 타입이 되지 않게)
+                    in_schema = parquet_schema(in_path)
+                    schema = pa.schema([in_schema.field(f.name) if f.name in in_schema.names and f.name != tok_col
+                                        else f for f in table.schema], metadata=table.schema.metadata)
+                    schema = schema.set(schema.get_field_index(tok_col), pa.field(tok_col, pa.list_(pa.string())))
+                    writer = pq.ParquetWriter(tmp, schema)
+                writer.write_table(table.cast(writer.schema))
             else:
-                out.append(surf)
+                df[tok_col] = [json.dumps(toks, ensure_ascii=False) for toks in cleaned]
+                df.to_csv(tmp, index=False, encoding="utf-8-sig" if first else "utf-8",
+                          mode="w" if first else "a", header=first)
+            first = False
+    finally:
+        if writer is not None:
+            writer.close()
+    if first:  # 빈 입력
+        if is_parquet:
+            pq.write_table(pa.table({tok_col: pa.array([], pa.list_(pa.string()))}), tmp)
+        else:
+            pd.DataFrame(columns=[tok_col]).to_csv(tmp, index=False, encoding="utf-8-sig")
+    os.replace(tmp, out_path)
+    return cleaner
 
-        return json.dumps(out, ensure_ascii=False)
 
-    before_avg = df[TOK_COL].apply(lambda x: len(safe_load_tokens(x))).mean()
-    df[TOK_COL] = df[TOK_COL].apply(clean_cell)
-    after_avg = df[TOK_COL].apply(lambda x: len(safe_load_tokens(x))).mean()
+def main(in_path: Path = IN_PATH, out_path: Path = OUT_PATH):
+    if not in_path.exists():
+        raise FileNotFoundError(f"입력 파일/폴더 없음: {in_path}")
 
-    OUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(OUT_PATH, index=False, encoding="utf-8-sig")
+    cleaner = clean_file(in_path, out_path)
 
-    print(f"[DONE] saved: {OUT_PATH}")
-    print(f"[INFO] docs: {len(df)}")
-    print(f"[INFO] avg token_len: {before_avg:.1f} -> {after_avg:.1f}")
-    print("[INFO] top removed surfaces:")
-    for k, v in removed.most_common(30):
-        print(f"  {k}: {v}")
+    print(f"[DONE] saved: {out_path}")
+    cleaner.report()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # 사용법: python clean_tokens_v2.py [입력(csv|parquet|part parquet 폴더)] [출력]
+    if len(sys.argv) > 2:
+        main(Path(sys.argv[1]), Path(sys.argv[2]))
+    else:
+        main()
@@ -1,10 +1,19 @@
 import pandas as pd
+import hashlib
 import os
-import numpy as np
+import queue
 import sys
+import threading
+import time
+from collections import Counter, deque
+import pyarrow as pa
+import pyarrow.parquet as pq
 from ekonlpy.sentiment import MPCK
 from multiprocessing import Pool
 from tqdm import tqdm
+from ngram_utils import ngramize
+from lexicon_matcher import LexiconTrie
+from token_cache import TokenCache, format_stats, normalize_sentence
 
 # [패치] 윈도우 인코딩 에러 방지
 if sys.platform == 'win32':
@@ -19,126 +28,224 @@ os.environ['PYTHONUTF8'] = '1'
 
 
 worker_mpck = None
+worker_cache = None
+worker_matcher = None  # 사전 매칭 모드: n-gram 리스트 대신 (hawkish 수, dovish 수) 만 계산
+
+# 토큰화 캐시 버전: MPCK 사전이나 ngramize 규칙을 바꾸면 올려서 기존 캐시를 무효화
+TOKEN_CACHE_VERSION = "mpck-ngram5-v1"
+TOKEN_CACHE_FILE = 'token_cache.sqlite'
+
+
+def tokenizer_version():
+    import ekonlpy
+    return f"{TOKEN_CACHE_VERSION}-ekonlpy{getattr(ekonlpy, '__version__', '')}"
+
+
+def lexicon_version(lexicon_path):
+    """사전 매칭 결과 캐시 키에 넣을 사전 파일 해시 (사전이 바뀌면 새로 셈)"""
+    with open(lexicon_path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()[:16]
+
 
 # 2. 일꾼들이 처음 출근했을 때 딱 한 번만 실행할 함수
-def init_worker():
-    global worker_mpck
+def init_worker(cache_path=TOKEN_CACHE_FILE, lexicon_path=None):
+    global worker_mpck, worker_cache, worker_matcher
     from ekonlpy.sentiment import MPCK
     if worker_mpck is None:
         worker_mpck = MPCK()
-
-# --- [1. ngramize 함수] ---
-def ngramize(tokens, max_n=5):
-    keep_tags = ['NNG', 'VA', 'VAX', 'MAG', 'VV']
-    filtered = [w for w in tokens if w.split('/')[1] in keep_tags]
-    all_ngrams = []
-    for pos in range(len(filtered)):
-        for n in range(1, max_n + 1):
-            if pos + n <= len(filtered):
-                ngram = ";".join(filtered[pos : pos + n])
-                all_ngrams.append({'ngram': ngram, 'start': pos, 'end': pos + n, 'len': n})   
-    final_ngrams = []
-    sorted_ngrams = sorted(all_ngrams, key=lambda x: x['len'], reverse=True)
-    covered_ranges = set()
-    for ngram in sorted_ngrams:
-        is_covered = False
-        for i in range(ngram['start'], ngram['end']):
-            if i in covered_ranges:
-                is_covered = True
-                break
-        if not is_covered:
-            final_ngrams.append(ngram['ngram'])
-            for i in range(ngram['start'], ngram['end']):
-                covered_ranges.add(i)
-    return final_ngrams
+    version = tokenizer_version()
+    if lexicon_path and worker_matcher is None:
+        worker_matcher = LexiconTrie.from_csv(lexicon_path)
+        version = f"{version}-lexicon{lexicon_version(lexicon_path)}"
+    if worker_cache is None and cache_path:
+        worker_cache = TokenCache(cache_path, version)
 
 # --- [2. 멀티프로세싱용 개별 일꾼(Worker) 함수] ---
-def worker_task(text_list):
-    global worker_mpck
-    batch_results = []
-    for text in text_list:
+def tokenize_sentence(text):
+    tokens = worker_mpck.tokenize(text)
+    if worker_matcher is not None:
+        return list(worker_matcher.count_cover(tokens, max_n=5))
+    return ngramize(tokens, max_n=5)
+
+
+# 작업 단위: (batch 번호, batch 안의 시작 위치, 문장 리스트)
+# 반환: (batch 번호, 시작 위치, 결과 리스트, 에러 [(위치, 메시지)], 캐시 통계)
+# 문장 하나가 실패하면 그 문장만 [] 로 두고 나머지는 그대로 처리 (실패한 문장은 캐시에 저장하지 않음)
+def worker_task(task):
+    batch_idx, offset, text_list = task
+    failures = {}
+
+    def safe_tokenize(text):
         try:
-            tokens = worker_mpck.tokenize(text)
-            final = ngramize(tokens, max_n=5)
-            batch_results.append(final)
+            return tokenize_sentence(text)
         except Exception as e:
-            print(f"에러 발견: {e}")
-            raise e
-    return batch_results
+            failures[text] = f"{type(e).__name__}: {e}"
+            return None
+
+    valid = [i for i, text in enumerate(text_list) if isinstance(text, str) and text.strip()]
+    # 캐시를 쓰든 안 쓰든 같은 문장(공백 정리한 것)을 토큰화 -> 캐시 on/off 결과가 같음
+    texts = [normalize_sentence(text_list[i]) for i in valid]
+    stats = Counter()
+    if worker_cache is None:
+        outputs = [safe_tokenize(text) for text in texts]
+    else:
+        before = worker_cache.stats.copy()
+        outputs = worker_cache.lookup(texts, safe_tokenize)
+        stats = worker_cache.stats - before
+
+    results = [[] for _ in text_list]
+    errors = [(offset + i, "빈 문장") for i, text in enumerate(text_list)
+              if not (isinstance(text, str) and text.strip())]
+    for i, text, out in zip(valid, texts, outputs):
+        if out is None:
+            errors.append((offset + i, failures.get(text, "")))
+        else:
+            results[i] = out
+    return batch_idx, offset, results, errors, stats
+
 
 # --- [3. 메인 실행 제어기] ---
-def run_production(df, output_folder='./processed_batches', batch_size=2000):
+NUM_WORKERS = None          # None 이면 os.cpu_count()
+CHUNK_CHARS = 20_000        # 작업 하나에 담을 문장 글자 수 (긴 문장이 많으면 작업이 작아짐)
+CHUNK_MAX_SENTENCES = 256
+
+
+def iter_record_batches(source, batch_size):
+    """parquet 경로면 Arrow record batch 로 나눠 읽고, DataFrame 이면 같은 크기로 잘라서"""
+    if isinstance(source, (str, os.PathLike)):
+        yield from pq.ParquetFile(source).iter_batches(batch_size=batch_size)
+    else:
+        yield from pa.Table.from_pandas(source, preserve_index=False).to_batches(max_chunksize=batch_size)
+
+
+def split_chunks(texts):
+    """글자 수 기준으로 문장 리스트를 작업 단위로 자름 -> [(시작 위치, 문장들), ...]"""
+    chunks, start, chars = [], 0, 0
+    for i, text in enumerate(texts):
+        chars += len(text) if isinstance(text, str) else 0
+        if chars >= CHUNK_CHARS or i + 1 - start >= CHUNK_MAX_SENTENCES:
+            chunks.append((start, texts[start:i + 1]))
+            start, chars = i + 1, 0
+    if start < len(texts):
+        chunks.append((start, texts[start:]))
+    return chunks
+
+
+def run_production(source, output_folder='./processed_batches', batch_size=2000, cache_path=TOKEN_CACHE_FILE,
+                   num_workers=NUM_WORKERS, max_inflight_batches=None, lexicon_path=None):
+    """
+    source(parquet 경로 또는 DataFrame)를 batch_size 행씩 읽어 batch_{i}.parquet 로 저장.
+    - 입력은 record batch 단위로 읽고, 동시에 처리 중인 batch 는 max_inflight_batches 개로 제한 (메모리 일정)
+    - 각 batch 를 글자 수 기준 작업으로 잘라 imap_unordered 로 분배 -> 느린 작업 하나를 다 같이 기다리지 않음
+    - 다 모인 batch 는 writer 스레드가 batch 번호 순서대로 저장 (저장하는 동안에도 토큰화는 계속)
+    - 이미 있는 batch 파일은 건너뜀 (이어서 실행)
+    - lexicon_path(total_lexicon.csv)를 주면 n-gram 리스트(tokens) 대신 사전 매칭 개수 n_h_feat / n_d_feat 만 저장
+      (tone_engine.compute_tone 에 바로 넣을 수 있음)
+    """
     if not os.path.exists(output_folder):
         os.makedirs(output_folder)
 
-    num_cores = 8
-    total_batches = int(np.ceil(len(df) / batch_size))
-    
-    print(f"⚙️ 총 {len(df)}건 데이터를 {num_cores}개 코어로 처리합니다.")
+    num_workers = num_workers or os.cpu_count()
+    max_inflight_batches = max_inflight_batches or num_workers * 2
+    print(f"⚙️ {num_workers}개 코어로 처리합니다. (batch {batch_size}행, 동시 처리 batch 최대 {max_inflight_batches}개)")
 
-    with Pool(num_cores, initializer=init_worker) as pool:
-        total_batches = int(np.ceil(len(df) / batch_size))
-        for i in tqdm(range(total_batches), desc="Processing Batches"):
-            batch_file = os.path.join(output_folder, f"batch_{i}.parquet")
-            if os.path.exists(batch_file):
+    inflight = threading.BoundedSemaphore(max_inflight_batches)
+    pending = {}                  # batch 번호 -> {'batch', 'tokens', 'remaining'}
+    submitted = deque()           # 작업을 넣은 batch 번호 (저장 순서)
+    write_queue = queue.Queue()
+    errors = []
+    counters = Counter()
+
+    def batch_file(i):
+        return os.path.join(output_folder, f"batch_{i}.parquet")
+
+    def tasks():
+        for i, record_batch in enumerate(iter_record_batches(source, batch_size)):
+            if os.path.exists(batch_file(i)) or record_batch.num_rows == 0:
                 continue
-                
-            start = i * batch_size
-            end = min((i + 1) * batch_size, len(df))
-            chunk = df.iloc[start:end].copy()
-            
-            split_chunks = np.array_split(chunk['content'], num_cores)
-            results = pool.map(worker_task, split_chunks)
-            
-            # 쪼개진 결과 합쳐서 컬럼에 넣기
-            flat_results = [item for sublist in results for item in sublist]
-            chunk['tokens'] = flat_results
-            
-            # Parquet 형식으로 저장 (csv보다 빠르고 용량이 작음)
-            chunk.to_parquet(batch_file)
+            inflight.acquire()  # writer 가 저장을 끝내야 다음 batch 를 읽음
+            texts = record_batch.column(record_batch.schema.get_field_index('content')).to_pylist()
+            pending[i] = {'batch': record_batch, 'tokens': [None] * len(texts), 'remaining': len(texts)}
+            submitted.append(i)
+            for start, chunk in split_chunks(texts):
+                yield i, start, chunk
+
+    def writer():
+        ready = {}
+        while True:
+            item = write_queue.get()
+            if item is None:
+                break
+            batch_idx, record_batch, tokens = item
+            ready[batch_idx] = (record_batch, tokens)
+            while submitted and submitted[0] in ready:
+                i = submitted.popleft()
+                record_batch, tokens = ready.pop(i)
+                try:
+                    chunk = record_batch.to_pandas()
+                    if lexicon_path:
+                        chunk = chunk.drop(columns=['tokens'], errors='ignore')
+                        chunk['n_h_feat'] = [t[0] if t else 0 for t in tokens]
+                        chunk['n_d_feat'] = [t[1] if t else 0 for t in tokens]
+                    else:
+                        chunk['tokens'] = tokens
+                    chunk.to_parquet(batch_file(i))  # Parquet 형식으로 저장 (csv보다 빠르고 용량이 작음)
+                    counters['batches'] += 1
+                except Exception as e:
+                    # 저장 실패: 파일이 없으니 다음 실행에서 이 batch 만 다시 처리됨
+                    print(f"❌ batch_{i} 저장 실패: {e}")
+                    counters['write_errors'] += 1
+                inflight.release()
+
+    writer_thread = threading.Thread(target=writer, daemon=True)
+    writer_thread.start()
+
+    start_time = time.time()
+    with Pool(num_workers, initializer=init_worker, initargs=(cache_path, lexicon_path)) as pool:
+        with tqdm(desc="Processing Sentences", unit="sent") as bar:
+            for batch_idx, offset, results, chunk_errors, stats in pool.imap_unordered(worker_task, tasks()):
+                entry = pending[batch_idx]
+                entry['tokens'][offset:offset + len(results)] = results
+                entry['remaining'] -= len(results)
+                counters.update(stats)
+                errors.extend((batch_idx, offset_i, msg) for offset_i, msg in chunk_errors)
+                counters['sentences'] += len(results)
+                bar.update(len(results))
+                if entry['remaining'] == 0:
+                    del pending[batch_idx]
+                    write_queue.put((batch_idx, entry['batch'], entry['tokens']))
+
+    write_queue.put(None)
+    writer_thread.join()
+
+    elapsed = time.time() - start_time
+    n = counters['sentences']
+    print(f"✅ 문장 {n:,}개 / batch {counters['batches']}개 / {elapsed:.1f}초 ({n / elapsed if elapsed else 0:,.0f} 문장/초)")
+    if errors:
+        error_file = os.path.join(output_folder, 'errors.csv')
+        pd.DataFrame(errors, columns=['batch', 'row', 'error']).to_csv(error_file, index=False, encoding='utf-8-sig')
+        print(f"⚠️ 토큰화 실패 {len(errors)}문장 (빈 리스트로 저장) -> {error_file}")
+    if cache_path:
+        cache_stats = Counter({k: counters[k] for k in ('lru_hits', 'disk_hits', 'misses')})
+        print(f"🗃️ 토큰화 캐시: {format_stats(cache_stats)}")
+    return counters
+
 
 # --- [4. 전체 실행 로직] ---
 if __name__ == "__main__":
-    import kss
-    from tqdm import tqdm
-    tqdm.pandas()
+    from sentence_split import merge_parts, split_corpus
 
     SENTENCE_FILE = 'df_sentences.parquet'
     if os.path.exists(SENTENCE_FILE):
-        print(f"✅ 이미 쪼개진 파일({SENTENCE_FILE})을 찾았습니다. 로드 중...")
-        df_sentences = pd.read_parquet(SENTENCE_FILE)
+        print(f"✅ 이미 쪼개진 파일({SENTENCE_FILE})을 찾았습니다. 나눠서 읽으며 처리합니다.")
     else:
-        # 1. 데이터 로드 (파일이 없을 때만 원본 CSV들을 읽어옵니다)
-        print("📂 원본 데이터를 로드하고 합치는 중...")
-        news = pd.read_csv('../db/preprocessing/news_preprocessed_fixed.csv', encoding='utf-8')
-        meetings = pd.read_csv('../db/preprocessing/meeting_preprocessed_fixed.csv', encoding='utf-8')
-        reports = pd.read_csv('../db/preprocessing/final_integrated_full_v2.csv', encoding='utf-8')
-        press = pd.read_csv('../db/preprocessing/press_preprocessed_fixed.csv', encoding='utf-8')
-
-        df_total = pd.concat([news, meetings, reports, press], ignore_index=True)
-        # 3. 문서 고유 Index
-        df_total['doc_id'] = df_total.index
-        final_cols = ['date', 'content', 'tokens', 'category', 'source', 'doc_id']
-        df_total = df_total[final_cols]
-        df_total = df_total.dropna(subset=['content'])
-
-        # 2. 문장 분리 작업 (KSS는 여기서 미리 수행)
+        # 1~2. 원본 CSV 를 chunk 단위로 읽으며 문장 분리(KSS, 멀티프로세스). 중단되면 남은 chunk 부터 이어서
         print("✂️ 문장 분리(KSS)를 시작합니다...")
-        df_working = df_total.copy()
-        df_working['content'] = df_working['content'].progress_apply(kss.split_sentences)
-        df_sentences = df_working.explode('content').reset_index(drop=True)
-
-        del df_total
-        del df_working
-
-        df_sentences['tokens'] = None
-        output_columns = ['doc_id', 'date', 'content', 'tokens', 'category', 'source']
-        df_sentences = df_sentences[output_columns]
-        
+        parts = split_corpus(out_dir='sentence_parts')
         print(f"💾 쪼개진 데이터를 {SENTENCE_FILE}로 저장합니다...")
-        df_sentences.to_parquet(SENTENCE_FILE)
+        merge_parts(parts, SENTENCE_FILE)
 
-    # 3. 멀티프로세싱 실행
-    run_production(df_sentences)
+    # 3. 멀티프로세싱 실행 (파일을 record batch 단위로 읽음)
+    run_production(SENTENCE_FILE)
     
-    print("✨ 모든 작업이 완료되었습니다! './processed_batches' 폴더를 확인하세요.")
\ No newline at end of file
+    print("✨ 모든 작업이 완료되었습니다! './processed_batches' 폴더를 확인하세요.")
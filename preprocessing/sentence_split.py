@@ -0,0 +1,134 @@
+import json
+import os
+import sys
+from multiprocessing import Pool
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from tqdm import tqdm
+
+# 문장 분리(KSS) 단계.
+# - 원본 CSV 들을 chunksize 행씩 읽고(한 번에 chunk 하나만 메모리에), 문서를 프로세스 풀로 나눠 KSS 실행
+# - chunk 마다 part 파일(parquet) 하나를 tmp 로 쓴 뒤 이름 변경 -> 중간에 멈추면 없는 part 만 다시 처리
+# - merge_parts 로 part 들을 df_sentences.parquet 하나로 합침 (part 하나 = row group 하나)
+# doc_id 는 기존과 같이 "모든 원본을 순서대로 이어 붙였을 때의 행 번호" (결측 제거 전)
+
+SOURCES = [
+    '../db/preprocessing/news_preprocessed_fixed.csv',
+    '../db/preprocessing/meeting_preprocessed_fixed.csv',
+    '../db/preprocessing/final_integrated_full_v2.csv',
+    '../db/preprocessing/press_preprocessed_fixed.csv',
+]
+OUTPUT_COLUMNS = ['doc_id', 'date', 'content', 'tokens', 'category', 'source']
+SENTENCE_SCHEMA = pa.schema([
+    ('doc_id', pa.int64()),
+    ('date', pa.string()),
+    ('content', pa.string()),
+    ('tokens', pa.list_(pa.string())),  # 다음 단계(run_production)에서 채움
+    ('category', pa.string()),
+    ('source', pa.string()),
+])
+
+worker_kss = None
+worker_backend = None
+
+
+def init_worker(backend=None):
+    global worker_kss, worker_backend
+    import kss
+    worker_kss = kss
+    worker_backend = backend
+
+
+def split_one(text):
+    """문서 하나 -> 문장 리스트. backend 를 지정하지 않으면 kss 기본값"""
+    try:
+        if worker_backend:
+            return worker_kss.split_sentences(text, backend=worker_backend)
+        return worker_kss.split_sentences(text)
+    except Exception as e:
+        print(f"⚠️ 문장 분리 실패 (문서 전체를 한 문장으로 둠): {type(e).__name__}: {e}")
+        return [text]
+
+
+def part_path(out_dir, file_idx, chunk_idx):
+    return Path(out_dir) / f"part-{file_idx:02d}-{chunk_idx:05d}.parquet"
+
+
+def _check_signature(out_dir, signature):
+    """원본 목록/설정이 바뀌었으면 예전 part 를 지움 (doc_id 가 달라지므로)"""
+    sig_file = Path(out_dir) / 'sources.json'
+    if sig_file.exists() and json.loads(sig_file.read_text(encoding='utf-8')) != signature:
+        print("♻️ 원본 설정이 바뀌어 기존 part 파일을 지웁니다.")
+        for p in Path(out_dir).glob('part-*.parquet'):
+            p.unlink()
+    sig_file.write_text(json.dumps(signature, ensure_ascii=False), encoding='utf-8')
+
+
+def split_corpus(sources=SOURCES, out_dir='sentence_parts', chunksize=5000, workers=None, backend=None,
+                 nrows=None):
+    """
+    sources(CSV 목록)를 문장 단위로 나눠 out_dir/part-*.parquet 로 저장. 반환: part 파일 목록
+    nrows: 파일마다 앞에서부터 읽을 행 수 (테스트용)
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    _check_signature(out_dir, {'sources': [str(s) for s in sources], 'chunksize': chunksize,
+                               'nrows': nrows, 'backend': backend})
+    workers = workers or os.cpu_count()
+
+    parts = []
+    offset = 0  # 앞 파일들의 행 수 합 (doc_id 시작 번호)
+    with Pool(workers, initializer=init_worker, initargs=(backend,)) as pool:
+        for file_idx, path in enumerate(sources):
+            rows_in_file = 0
+            reader = pd.read_csv(path, encoding='utf-8', chunksize=chunksize, nrows=nrows)
+            for chunk_idx, chunk in enumerate(tqdm(reader, desc=f"KSS {Path(path).name}", unit="chunk")):
+                doc_ids = offset + chunk.index.to_numpy()
+                rows_in_file += len(chunk)
+                part = part_path(out_dir, file_idx, chunk_idx)
+                parts.append(part)
+                if part.exists():
+                    continue  # 이미 처리한 chunk
+
+                chunk = chunk.assign(doc_id=doc_ids)[['date', 'content', 'category', 'source', 'doc_id']]
+                chunk = chunk.dropna(subset=['content'])
+                contents = chunk['content'].astype(str).tolist()
+                per_worker = max(1, len(contents) // (workers * 4))
+                chunk['content'] = list(pool.imap(split_one, contents, chunksize=per_worker))
+
+                sentences = chunk.explode('content').reset_index(drop=True)
+                sentences['tokens'] = None
+                for col in ('date', 'content', 'category', 'source'):
+                    sentences[col] = sentences[col].astype('string')
+                table = pa.Table.from_pandas(sentences[OUTPUT_COLUMNS], schema=SENTENCE_SCHEMA, preserve_index=False)
+
+                tmp = part.with_suffix('.tmp')
+                pq.write_table(table, tmp)
+                os.replace(tmp, part)
+            offset += rows_in_file
+    return parts
+
+
+def merge_parts(parts, out_file):
+    """part 파일들을 순서대로 out_file 하나로 합침 (part 하나씩 읽어서 row group 으로 추가)"""
+    tmp = Path(str(out_file) + '.tmp')
+    rows = 0
+    with pq.ParquetWriter(tmp, SENTENCE_SCHEMA) as writer:
+        for part in parts:
+            table = pq.read_table(part)
+            writer.write_table(table)
+            rows += table.num_rows
+    os.replace(tmp, out_file)
+    return rows
+
+
+# 사용법: python sentence_split.py [출력 파일(기본 df_sentences.parquet)] [KSS backend]
+if __name__ == "__main__":
+    out_file = sys.argv[1] if len(sys.argv) > 1 else 'df_sentences.parquet'
+    backend = sys.argv[2] if len(sys.argv) > 2 else None
+    parts = split_corpus(backend=backend)
+    rows = merge_parts(parts, out_file)
+    print(f"💾 문장 {rows:,}개를 {out_file}로 저장했습니다.")
@@ -0,0 +1,114 @@
+import hashlib
+import json
+import re
+import sqlite3
+from collections import Counter, OrderedDict
+
+# 문장 토큰화(tokenize + ngramize) 결과 캐시.
+# - 키: sha1(버전 + 정규화한 문장). 버전에는 토크나이저/사전/ngram 설정을 넣어서 바뀌면 자동으로 새 키
+# - 프로세스 안: LRU (같은 배치/같은 워커에서 반복되는 상용구 문장)
+# - 디스크: SQLite(WAL). 모든 Pool 워커가 같은 파일을 읽고 쓰며, 실행이 끝나도 남아서 다음 실행에 재사용
+
+_WS_RE = re.compile(r"\s+")
+_SQL_CHUNK = 500  # IN (...) 한 번에 넣는 키 개수 (SQLite 변수 개수 제한 아래로)
+
+
+def normalize_sentence(text) -> str:
+    """공백만 정리 (연속 공백/줄바꿈 -> 공백 하나, 앞뒤 제거)"""
+    return _WS_RE.sub(" ", str(text)).strip()
+
+
+def sentence_key(normalized: str, version: str) -> bytes:
+    return hashlib.sha1(f"{version}\x00{normalized}".encode("utf-8")).digest()
+
+
+class TokenCache:
+    def __init__(self, path="token_cache.sqlite", version: str = "v1", lru_size: int = 200_000):
+        self.path = str(path)
+        self.version = version
+        self.lru_size = lru_size
+        self.lru = OrderedDict()
+        self.stats = Counter()  # lru_hits / disk_hits / misses
+        self._conn = sqlite3.connect(self.path, timeout=60)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS tokens (key BLOB PRIMARY KEY, value TEXT NOT NULL)")
+        self._conn.commit()
+
+    def key(self, text) -> bytes:
+        return sentence_key(normalize_sentence(text), self.version)
+
+    def _remember(self, key, value):
+        self.lru[key] = value
+        self.lru.move_to_end(key)
+        if len(self.lru) > self.lru_size:
+            self.lru.popitem(last=False)
+
+    def get_many(self, keys) -> dict:
+        """{key: 결과 리스트} (캐시에 있는 것만). LRU 먼저, 없으면 SQLite 에서 한 번에 조회"""
+        found = {}
+        missing = []
+        for key in set(keys):
+            if key in self.lru:
+                self.lru.move_to_end(key)
+                found[key] = self.lru[key]
+            else:
+                missing.append(key)
+        for i in range(0, len(missing), _SQL_CHUNK):
+            part = missing[i:i + _SQL_CHUNK]
+            rows = self._conn.execute(
+                f"SELECT key, value FROM tokens WHERE key IN ({','.join('?' * len(part))})", part).fetchall()
+            for key, value in rows:
+                found[key] = json.loads(value)
+                self._remember(key, found[key])
+        return found
+
+    def put_many(self, items: dict):
+        """{key: 결과 리스트} 를 한 트랜잭션으로 저장"""
+        if not items:
+            return
+        for key, value in items.items():
+            self._remember(key, value)
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO tokens (key, value) VALUES (?, ?)",
+                [(key, json.dumps(value, ensure_ascii=False)) for key, value in items.items()],
+            )
+
+    def lookup(self, texts, compute):
+        """
+        texts 각각의 결과 리스트. 캐시에 없는 문장만 compute(정규화된 문장) 로 계산해서 저장.
+        같은 문장이 여러 번 나오면 한 번만 계산. compute 가 None 을 돌려주면(실패) 저장하지 않음.
+        """
+        keys = [self.key(t) for t in texts]
+        lru_before = set(k for k in keys if k in self.lru)
+        cached = self.get_many(keys)
+        new = {}
+        results = []
+        for text, key in zip(texts, keys):
+            if key in cached:
+                self.stats["lru_hits" if key in lru_before else "disk_hits"] += 1
+                results.append(cached[key])
+            elif key in new:
+                self.stats["lru_hits"] += 1
+                results.append(new[key])
+            else:
+                self.stats["misses"] += 1
+                new[key] = compute(normalize_sentence(text))
+                results.append(new[key])
+        self.put_many({key: value for key, value in new.items() if value is not None})
+        return results
+
+    def size(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM tokens").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
+
+
+def format_stats(stats: Counter) -> str:
+    total = sum(stats.values())
+    hits = stats["lru_hits"] + stats["disk_hits"]
+    rate = hits / total * 100 if total else 0.0
+    return (f"문장 {total:,}개 / 적중 {hits:,}개 ({rate:.1f}%: LRU {stats['lru_hits']:,}, "
+            f"디스크 {stats['disk_hits']:,}) / 새로 토큰화 {stats['misses']:,}개")
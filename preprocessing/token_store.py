@@ -0,0 +1,260 @@
+import ast
+import json
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# 정수 인코딩 토큰 코퍼스.
+#   corpus_dir/vocab.arrow  : token 컬럼 하나 (행 번호 = token_id)
+#   corpus_dir/tokens.arrow : 메타데이터 컬럼(doc_id, date, category, source ...) + tokens: list<int32>
+# 둘 다 Arrow IPC 파일이라 pa.memory_map 으로 열면 복사 없이 바로 읽힘.
+# 토큰을 문자열(JSON / 파이썬 리스트 표기)로 저장하고 매번 파싱하던 것을 대체한다.
+
+VOCAB_FILE = 'vocab.arrow'
+TOKENS_FILE = 'tokens.arrow'
+DEFAULT_META = ['doc_id', 'date', 'category', 'source']
+
+
+def parse_tokens(x):
+    """토큰 셀 -> 리스트. 이미 리스트/배열이면 그대로, 문자열이면 JSON -> 파이썬 리터럴 순서로 시도"""
+    if x is None:
+        return []
+    if isinstance(x, (list, tuple, np.ndarray)):
+        return list(x)
+    if isinstance(x, str):
+        s = x.strip()
+        if not s:
+            return []
+        try:
+            v = json.loads(s)
+        except ValueError:
+            try:
+                v = ast.literal_eval(s)
+            except (ValueError, SyntaxError):
+                return []
+        return v if isinstance(v, list) else []
+    return []  # NaN 등
+
+
+class Vocab:
+    """token(str) <-> token_id(int32)"""
+
+    def __init__(self, tokens=()):
+        self.tokens = list(tokens)
+        self.ids = {t: i for i, t in enumerate(self.tokens)}
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def add(self, token) -> int:
+        token_id = self.ids.get(token)
+        if token_id is None:
+            token_id = self.ids[token] = len(self.tokens)
+            self.tokens.append(token)
+        return token_id
+
+    def encode(self, tokens) -> list:
+        """새 토큰은 vocab 에 추가하면서 인코딩"""
+        add = self.add
+        return [add(t) for t in tokens]
+
+    def decode(self, ids) -> list:
+        return [self.tokens[i] for i in ids]
+
+    def mask(self, words) -> np.ndarray:
+        """words 에 들어 있는 token_id 위치만 True 인 bool 배열 (tokens 값으로 바로 인덱싱 가능)"""
+        m = np.zeros(len(self.tokens), dtype=bool)
+        idx = [self.ids[w] for w in words if w in self.ids]
+        m[idx] = True
+        return m
+
+    def save(self, path):
+        table = pa.table({'token': pa.array(self.tokens, pa.string())})
+        tmp = Path(str(path) + '.tmp')
+        with pa.OSFile(str(tmp), 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        table = pa.ipc.open_file(pa.memory_map(str(path), 'r')).read_all()
+        return cls(table.column('token').to_pylist())
+
+
+def _meta_field(field: pa.Field) -> pa.Field:
+    """전부 비어 있어서 null 타입으로 잡힌 컬럼은 string 으로"""
+    return pa.field(field.name, pa.string()) if pa.types.is_null(field.type) else field
+
+
+def source_meta_schema(source, meta_columns=DEFAULT_META) -> pa.Schema:
+    """
+    입력 전체 기준의 메타 컬럼 타입. chunk 마다 따로 추론하면 첫 chunk 에서 비어 있던 컬럼이 null 타입으로
+    고정되거나 int / float 가 갈리므로, 변환 전에 한 번 정해서 TokenCorpusWriter 에 넘긴다.
+    Parquet 은 파일 schema, CSV 는 메타 컬럼만 전체를 읽어서 pandas dtype 으로.
+    """
+    source = Path(source)
+    files = sorted(source.glob('*.parquet')) if source.is_dir() else [source]
+    types = {}
+    for path in files:
+        if path.suffix.lower() == '.csv':
+            meta = pd.read_csv(path, usecols=lambda c: c in meta_columns)
+            schema = pa.Schema.from_pandas(meta, preserve_index=False)
+        else:
+            schema = pq.ParquetFile(path).schema_arrow
+        for field in schema:
+            if field.name in meta_columns and (field.name not in types or pa.types.is_null(types[field.name].type)):
+                types[field.name] = field
+    return pa.schema([_meta_field(types[c]) for c in meta_columns if c in types])
+
+
+class TokenCorpusWriter:
+    """
+    DataFrame chunk 를 받아 tokens 를 정수로 바꾼 뒤 record batch 로 이어 씀.
+    chunk 하나씩만 메모리에 두므로 큰 CSV/Parquet 도 나눠서 변환 가능.
+    메타 컬럼 타입은 meta_schema(source_meta_schema 등)로 미리 정해 두면 모든 chunk 를 그 타입으로 맞춘다.
+    없으면 첫 chunk 에서 추론 (전부 비어 있는 컬럼은 string).
+    """
+
+    def __init__(self, corpus_dir, meta_columns=DEFAULT_META, vocab: Vocab = None, meta_schema: pa.Schema = None):
+        self.corpus_dir = Path(corpus_dir)
+        self.corpus_dir.mkdir(parents=True, exist_ok=True)
+        self.meta_columns = list(meta_columns)
+        self.meta_schema = meta_schema
+        self.vocab = vocab or Vocab()
+        self.rows = 0
+        self._tmp = self.corpus_dir / (TOKENS_FILE + '.tmp')
+        self._sink = None
+        self._writer = None
+        self._schema = None
+
+    def write(self, df: pd.DataFrame, token_col='tokens'):
+        token_lists = df[token_col].map(parse_tokens)
+        ids = [np.asarray(self.vocab.encode(toks), dtype=np.int32) for toks in token_lists]
+        lengths = np.fromiter((len(a) for a in ids), dtype=np.int32, count=len(ids))
+        offsets = np.zeros(len(ids) + 1, dtype=np.int32)
+        np.cumsum(lengths, out=offsets[1:])
+        values = np.concatenate(ids) if ids else np.zeros(0, dtype=np.int32)
+        tokens = pa.ListArray.from_arrays(pa.array(offsets), pa.array(values, pa.int32()))
+
+        meta = {c: df[c] for c in self.meta_columns if c in df.columns}
+        batch = pa.RecordBatch.from_pandas(pd.DataFrame(meta), preserve_index=False)
+        batch = pa.RecordBatch.from_arrays(list(batch.columns) + [tokens],
+                                           names=list(batch.schema.names) + ['tokens'])
+        if self._writer is None:
+            declared = self.meta_schema if self.meta_schema is not None else pa.schema([])
+            fields = [declared.field(f.name) if f.name in declared.names else _meta_field(f)
+                      for f in batch.schema if f.name != 'tokens']
+            self._schema = pa.schema(fields + [pa.field('tokens', pa.list_(pa.int32()))])
+            self._sink = pa.OSFile(str(self._tmp), 'wb')
+            self._writer = pa.ipc.new_file(self._sink, self._schema)
+        if batch.schema != self._schema:
+            # cast 가 chunk 를 나눌 수 있으므로 합친 뒤 전부 씀
+            for part in pa.Table.from_batches([batch]).cast(self._schema).combine_chunks().to_batches():
+                self._writer.write_batch(part)
+        else:
+            self._writer.write_batch(batch)
+        self.rows += len(df)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._sink.close()
+            os.replace(self._tmp, self.corpus_dir / TOKENS_FILE)
+        self.vocab.save(self.corpus_dir / VOCAB_FILE)
+
+
+class TokenCorpus:
+    """memory map 으로 연 코퍼스. table 의 tokens 컬럼은 list<int32>"""
+
+    def __init__(self, corpus_dir):
+        self.corpus_dir = Path(corpus_dir)
+        self.vocab = Vocab.load(self.corpus_dir / VOCAB_FILE)
+        self._source = pa.memory_map(str(self.corpus_dir / TOKENS_FILE), 'r')
+        self.table = pa.ipc.open_file(self._source).read_all()
+
+    def __len__(self):
+        return self.table.num_rows
+
+    def chunks(self):
+        """(row_start, offsets, token_ids) numpy 배열을 record batch 별로 (복사 없음)"""
+        row_start = 0
+        for chunk in self.table.column('tokens').chunks:
+            # slice 된 배열이면 offsets 가 0 에서 시작하지 않으므로 values 는 전체를 주고 offsets 를 그대로 씀
+            offsets = chunk.offsets.to_numpy()
+            values = chunk.values.to_numpy()
+            yield row_start, offsets, values
+            row_start += len(chunk)
+
+    def lengths(self) -> np.ndarray:
+        """문장(행)별 토큰 수"""
+        parts = [np.diff(offsets) for _, offsets, _ in self.chunks()]
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=np.int32)
+
+    def id_arrays(self) -> list:
+        """행별 token_id 배열 (memory map 위의 view 라 복사 없음)"""
+        return [values[offsets[j]:offsets[j + 1]]
+                for _, offsets, values in self.chunks() for j in range(len(offsets) - 1)]
+
+    def token_ids(self, i) -> np.ndarray:
+        return np.asarray(self.table.column('tokens')[i].values, dtype=np.int32)
+
+    def tokens(self, i) -> list:
+        return self.vocab.decode(self.token_ids(i))
+
+    def meta(self) -> pd.DataFrame:
+        """tokens 를 뺀 메타데이터 컬럼만 pandas 로"""
+        return self.table.drop(['tokens']).to_pandas()
+
+    def to_pandas(self, decode=False) -> pd.DataFrame:
+        """기존 형식처럼 tokens 를 문자열 리스트로 (decode=True, 느림) 또는 int32 배열로"""
+        df = self.meta()
+        ids = self.id_arrays()
+        df['tokens'] = [self.vocab.decode(a) for a in ids] if decode else ids
+        return df
+
+
+def open_corpus(corpus_dir) -> TokenCorpus:
+    return TokenCorpus(corpus_dir)
+
+
+# ---------- 기존 출력에서 변환 ----------
+def iter_frames(source, chunksize=100_000, columns=None):
+    """CSV / Parquet 파일 / batch_*.parquet 폴더를 chunksize 행씩 DataFrame 으로"""
+    source = Path(source)
+    if source.is_dir():
+        files = sorted(source.glob('*.parquet'),
+                       key=lambda p: (len(p.stem), p.stem))  # batch_2 가 batch_10 보다 먼저
+    else:
+        files = [source]
+    for path in files:
+        if path.suffix.lower() == '.csv':
+            yield from pd.read_csv(path, chunksize=chunksize, usecols=columns)
+        else:
+            pf = pq.ParquetFile(path)
+            cols = [c for c in columns if c in pf.schema_arrow.names] if columns else None
+            for batch in pf.iter_batches(batch_size=chunksize, columns=cols):
+                yield batch.to_pandas()
+
+
+def convert(source, corpus_dir, token_col='tokens', meta_columns=DEFAULT_META, chunksize=100_000) -> TokenCorpus:
+    """
+    preprocess_tokens(docs_tokens.csv), clean_tokens_v2(docs_tokens_clean_v2.csv),
+    run_production(processed_batches/) 이나 lexicon/tone 노트북의 parquet 을 코퍼스로 변환
+    """
+    writer = TokenCorpusWriter(corpus_dir, meta_columns, meta_schema=source_meta_schema(source, meta_columns))
+    for df in iter_frames(source, chunksize):
+        writer.write(df, token_col)
+    writer.close()
+    print(f"[DONE] {writer.rows:,} rows / vocab {len(writer.vocab):,} -> {corpus_dir}")
+    return open_corpus(corpus_dir)
+
+
+# 사용법: python token_store.py <입력 csv|parquet|폴더> <코퍼스 폴더> [메타 컬럼,...]
+if __name__ == "__main__":
+    meta = sys.argv[3].split(',') if len(sys.argv) > 3 else DEFAULT_META
+    convert(sys.argv[1], sys.argv[2], meta_columns=meta)
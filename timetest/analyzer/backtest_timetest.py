@@ -0,0 +1,82 @@
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import statsmodels.api as sm
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(ROOT / "analyzer"))
+from backtest import FEATURES, MEETINGS_PATH, MIN_TRAIN, load_meetings, load_point_in_time, walk_forward
+from lag_regression import TARGET
+
+N_MONTHS = 168
+
+
+def make_frame(seed=0):
+    """2012-01 부터 월별 거시/톤 변수 + 0.25 단위 delta_bok (회의 달에만 변경)"""
+    rng = np.random.default_rng(seed)
+    index = pd.period_range('2012-01', periods=N_MONTHS, freq='M')
+    df = pd.DataFrame({'cpi_infl_gap': rng.normal(size=N_MONTHS).cumsum() * 0.2,
+                       'output_gap': rng.normal(size=N_MONTHS),
+                       'tone': rng.normal(size=N_MONTHS)}, index=index)
+    meeting_months = load_meetings(ROOT / "analyzer" / MEETINGS_PATH).to_period('M')
+    signal = 0.15 * df['tone'].shift(1).fillna(0) + 0.1 * df['cpi_infl_gap'].shift(1).fillna(0)
+    signal += rng.normal(0, 0.1, N_MONTHS)
+    df[TARGET] = np.where(index.isin(meeting_months), np.round(signal / 0.25) * 0.25, 0.0)
+    df.iloc[[30, 31, 90], 1] = np.nan  # 중간 결측
+    df.index.name = 'date'
+    return df
+
+
+def walk_forward_reference(pit, min_train=MIN_TRAIN):
+    """회의마다 그 전 행 전체로 sm.OLS 를 새로 fit 해서 예측 (RLS 검증용)"""
+    x_cols = [c for c in pit.columns if c.startswith('x_')]
+    complete = pit[x_cols + ['y']].notna().all(axis=1).to_numpy()
+    out = []
+    for t in np.flatnonzero(pit['meeting_date'].notna().to_numpy() & complete):
+        train = pit.iloc[:t][complete[:t]]
+        if len(train) < max(min_train, len(x_cols) + 2):
+            continue
+        model = sm.OLS(train['y'], sm.add_constant(train[x_cols])).fit()
+        x = np.concatenate([[1.0], pit[x_cols].iloc[t].to_numpy(float)])
+        pred = model.get_prediction(x[None, :])
+        out.append((pit['meeting_date'].iloc[t], float(pred.predicted_mean[0]),
+                    float(np.sqrt(pred.var_pred_mean[0] + model.scale))))
+    return pd.DataFrame(out, columns=['meeting_date', 'forecast', 'forecast_sd'])
+
+
+if __name__ == "__main__":
+    df = make_frame()
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = Path(tmp) / 'final_monthly_merged_renamed.csv'
+        df.reset_index().assign(date=lambda x: x['date'].dt.to_timestamp()).to_csv(input_path, index=False)
+        meetings_path = ROOT / "analyzer" / MEETINGS_PATH
+
+        t0 = time.perf_counter()
+        pit = load_point_in_time(input_path, meetings_path, cache_dir=Path(tmp) / 'cache')
+        t_build = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        cached = load_point_in_time(input_path, meetings_path, cache_dir=Path(tmp) / 'cache')
+        t_cached = time.perf_counter() - t0
+        pd.testing.assert_frame_equal(pit, cached)
+
+    t0 = time.perf_counter()
+    results = walk_forward(pit)
+    t_rls = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    reference = walk_forward_reference(pit)
+    t_ref = time.perf_counter() - t0
+
+    assert (results['meeting_date'].to_numpy() == reference['meeting_date'].to_numpy()).all()
+    np.testing.assert_allclose(results['forecast'], reference['forecast'], rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(results['forecast_sd'], reference['forecast_sd'], rtol=1e-9)
+    assert set(f'x_{c}' for c in FEATURES) <= set(pit.columns)
+
+    print(f"[DONE] 회의 {len(results)}회 예측이 회의마다 다시 fit 한 결과와 일치")
+    print(f"point-in-time 행렬 생성 / 캐시 읽기 : {t_build * 1000:.1f}ms / {t_cached * 1000:.1f}ms")
+    print(f"statsmodels 회의마다 재추정       : {t_ref:.3f}초")
+    print(f"walk_forward (RLS)                 : {t_rls:.3f}초 ({t_ref / t_rls:.1f}배)")
@@ -0,0 +1,160 @@
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(ROOT / "analyzer"))
+from feature_store import FeatureStore, ingest, read_macro
+from lag_regression import load_frame
+
+N_MONTHS = 168
+MACRO_COLUMNS = ["경제정책 불확실성 지수(EPU)", "기준 금리", "기준 금리", "뉴스심리지수", "산업생산지수 갭", "산업생산증가율",
+                 "인플레이션 갭(소비자물가지수)", "콜 금리", "원/달러 환율"]  # 마지막은 RENAME_MAP 에 없는 컬럼
+
+
+# --- 기존 구현 (비교 기준, data_merge_final.ipynb 셀 그대로) ---
+def merge_reference(macro_path, tone_path):
+    macro = pd.read_csv(macro_path, encoding="utf-8-sig")
+    tone = pd.read_csv(tone_path, encoding="utf-8-sig")
+    macro.columns = macro.columns.str.strip()
+    tone.columns = tone.columns.str.strip()
+    macro["Date"] = macro["Date"].astype(str).str.strip()
+    s = (macro["Date"]
+         .str.replace("년", "-", regex=False)
+         .str.replace("월", "", regex=False)
+         .str.replace(".", "-", regex=False)
+         .str.replace("/", "-", regex=False)
+         .str.replace(" ", "", regex=False)
+         )
+    s = s.str.extract(r"(\d{4}-\d{1,2})", expand=False)
+
+    def pad_month(x):
+        if isinstance(x, str) and "-" in x:
+            y, m = x.split("-")
+            return f"{y}-{m.zfill(2)}"
+        return np.nan
+
+    s = s.apply(pad_month)
+    dt = pd.to_datetime(s, format="%Y-%m", errors="coerce")
+    macro["date"] = dt.dt.to_period("M")
+    macro = macro.dropna(subset=["date"]).copy()
+    macro = macro.drop(columns=["Date"], errors="ignore")
+    tone["date"] = pd.to_datetime(tone["date"], errors="coerce").dt.to_period("M")
+    tone = tone.dropna(subset=["date"]).copy()
+    tone = tone.loc[:, ~tone.columns.str.startswith("z_")]
+    df_final = pd.merge(macro, tone, on="date", how="outer", sort=True)
+    df_final = df_final.sort_values("date").set_index("date")
+    for c in df_final.columns:
+        df_final[c] = pd.to_numeric(
+            df_final[c].astype(str)
+                       .str.replace(",", "", regex=False)
+                       .str.replace("%", "", regex=False)
+                       .str.strip(),
+            errors="coerce"
+        )
+    rename_map = {
+        "경제정책 불확실성 지수(EPU)": "epu_index",
+        "기준 금리": "bok_rate",
+        "기준 금리.1": "delta_bok",
+        "뉴스심리지수": "news_sentiment",
+        "산업생산지수 갭": "output_gap",
+        "산업생산증가율": "ip_growth",
+        "인플레이션 갭(소비자물가지수)": "cpi_infl_gap",
+        "콜 금리": "call_rate_m",
+        "final_monthly_tone": "tone"
+    }
+    return df_final.rename(columns=rename_map)
+
+
+def write_sources(tmp, n_months=N_MONTHS, seed=0):
+    """macro.csv (날짜 형식 / 천 단위 콤마 / % 섞임), final_monthly_tone_index.csv, call_rate.csv"""
+    rng = np.random.default_rng(seed)
+    months = pd.period_range('2012-01', periods=n_months, freq='M')
+    formats = [lambda p: f"{p.year}년 {p.month}월", lambda p: f"{p.year}.{p.month:02d}",
+               lambda p: f"{p.year}/{p.month}", lambda p: f"{p.year}-{p.month:02d}"]
+    values = rng.normal(size=(n_months, len(MACRO_COLUMNS))) * [100, 1, 0.25, 10, 1, 1, 1, 1, 100]
+    macro = pd.DataFrame(values, columns=MACRO_COLUMNS).astype(object)
+    macro.iloc[:, 0] = [f"{v * 100:,.2f}" for v in macro.iloc[:, 0]]  # '12,345.67'
+    macro.iloc[:, 5] = [f"{v:.2f}%" for v in macro.iloc[:, 5]]
+    macro.insert(0, "Date", [formats[i % 4](p) for i, p in enumerate(months)])
+    macro.loc[len(macro)] = ["출처: 한국은행"] + [""] * len(MACRO_COLUMNS)
+    macro.to_csv(Path(tmp) / 'macro.csv', index=False, encoding='utf-8-sig')
+
+    tone_months = pd.period_range('2012-01', periods=n_months + 2, freq='M').to_timestamp()
+    z_news, z_min = rng.normal(size=len(tone_months)), rng.normal(size=len(tone_months))
+    pd.DataFrame({'date': tone_months, 'z_newsbonds': z_news, 'z_min': z_min,
+                  'final_monthly_tone': (2 * z_news + z_min) / 3}).to_csv(
+        Path(tmp) / 'final_monthly_tone_index.csv', index=False, encoding='utf-8-sig')
+
+    days = pd.bdate_range('2012-01-02', periods=n_months * 21)
+    pd.DataFrame({'date': days.strftime('%Y.%m.%d'), 'call_rate': np.round(2 + rng.normal(size=len(days)).cumsum()
+                                                                            * 0.01, 2)}).to_csv(
+        Path(tmp) / 'call_rate.csv', index=False)
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        write_sources(tmp)
+        store = FeatureStore(tmp / 'store')
+
+        t0 = time.perf_counter()
+        ingest(store, tmp / 'macro.csv', tmp / 'final_monthly_tone_index.csv', tmp / 'call_rate.csv')
+        t_ingest = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        reference = merge_reference(tmp / 'macro.csv', tmp / 'final_monthly_tone_index.csv')
+        reference.reset_index().to_csv(tmp / 'final_monthly_merged_renamed.csv', index=False, encoding='utf-8-sig')
+        csv_frame = load_frame(tmp / 'final_monthly_merged_renamed.csv')
+        t_reference = time.perf_counter() - t0
+
+        loaded = store.load('monthly')
+        assert sorted(loaded.columns) == sorted(reference.columns), (loaded.columns, reference.columns)
+        pd.testing.assert_frame_equal(loaded, reference[loaded.columns], check_freq=False)
+        # 추가된 컬럼은 _schema.json 으로 다시 열어도 유지
+        pd.testing.assert_frame_equal(FeatureStore(tmp / 'store').load('monthly'), loaded, check_freq=False)
+        pd.testing.assert_frame_equal(load_frame(tmp / 'store'), csv_frame[loaded.columns], check_freq=False)
+
+        # 필요한 컬럼 / 기간만
+        t0 = time.perf_counter()
+        part = store.load('monthly', ['delta_bok', 'tone'], start='2020-01', end='2021-12')
+        t_load = time.perf_counter() - t0
+        pd.testing.assert_frame_equal(part, reference.loc['2020-01':'2021-12', ['delta_bok', 'tone']],
+                                      check_freq=False)
+
+        # as-of: 문서 날짜 기준 콜금리
+        docs = pd.DataFrame({'date': pd.to_datetime('2013-01-01') + pd.to_timedelta(
+            np.random.default_rng(2).integers(0, 3000, 5000), unit='D').astype('timedelta64[ns]')})
+        rate_df = pd.read_csv(tmp / 'call_rate.csv')
+        rate_df['date'] = pd.to_datetime(rate_df['date'].str.replace('.', '-')).astype('datetime64[ns]')
+        expected = pd.merge_asof(docs.assign(row=np.arange(len(docs))).sort_values('date'),
+                                 rate_df.sort_values('date'), on='date', direction='backward')
+        expected = expected.sort_values('row').drop(columns='row').reset_index(drop=True)
+        t0 = time.perf_counter()
+        got = store.asof(docs, 'call_rate')
+        t_asof = time.perf_counter() - t0
+        pd.testing.assert_frame_equal(got, expected)
+
+
+        # 증분: 같은 파일 다시 넣으면 아무것도 안 씀, 새 달 하나 + 수정 한 달이면 두 파티션만
+        assert store.upsert('monthly', read_macro(tmp / 'macro.csv')) == 0
+        write_sources(tmp, N_MONTHS + 1)
+        macro = read_macro(tmp / 'macro.csv')
+        macro.loc[macro.index[5], 'bok_rate'] = 9.99
+        t0 = time.perf_counter()
+        written = store.upsert('monthly', macro)
+        t_append = time.perf_counter() - t0
+        assert written == 2, written
+        assert store.load('monthly', ['bok_rate']).iloc[5, 0] == 9.99
+        assert store.load('monthly', ['tone']).notna().sum().iloc[0] == N_MONTHS + 2  # tone 은 그대로
+
+    print(f"[DONE] feature_store 결과가 data_merge_final.ipynb 결과와 일치 ({len(loaded)}개월)")
+    print(f"노트북 방식 병합 + CSV 다시 파싱  : {t_reference * 1000:.1f}ms")
+    print(f"feature_store ingest (3개 원천)  : {t_ingest * 1000:.1f}ms")
+    print(f"feature_store 2개 컬럼 / 2년 읽기 : {t_load * 1000:.1f}ms")
+    print(f"새 달 + 수정 한 달 upsert        : {t_append * 1000:.1f}ms (파티션 {written}개)")
+    print(f"as-of 콜금리 {len(docs):,}건           : {t_asof * 1000:.1f}ms")
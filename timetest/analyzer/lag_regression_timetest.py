@@ -0,0 +1,74 @@
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import statsmodels.api as sm
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "analyzer"))
+from lag_regression import TARGET, search
+
+FEATURES = ['delta_bok', 'epu_index', 'output_gap', 'cpi_infl_gap', 'tone', 'news_sentiment', 'ip_growth',
+            'call_rate_m', 'bok_rate']
+N_MONTHS = 168
+N_CHECK = 200
+
+
+def make_frame(seed=0):
+    """월별 거시/톤 변수 (일부 변수는 앞 구간 결측, 중간 결측 몇 개)"""
+    rng = np.random.default_rng(seed)
+    index = pd.period_range('2012-01', periods=N_MONTHS, freq='M')
+    df = pd.DataFrame(rng.normal(size=(N_MONTHS, len(FEATURES))).cumsum(axis=0) * 0.1, index=index, columns=FEATURES)
+    df['tone'] = rng.normal(size=N_MONTHS)
+    df[TARGET] = 0.3 * df['tone'].shift(2).fillna(0) + 0.5 * df['cpi_infl_gap'] + rng.normal(0, 0.3, N_MONTHS)
+    df.iloc[:24, FEATURES.index('epu_index')] = np.nan
+    df.iloc[rng.choice(N_MONTHS, 5, replace=False), FEATURES.index('news_sentiment')] = np.nan
+    return df
+
+
+def fit_reference(df, lag, variables, cov_type):
+    """
+    cor_reg.ipynb 방식: shift -> dropna -> sm.OLS 한 번.
+    노트북은 delta_bok 을 feature_cols 에 넣고 df_ana[feature_cols].shift(1) 을 해서 y 까지 밀렸으므로
+    (ΔBOK(t-1) 을 자기 자신에 회귀, 계수 1) 여기서는 y 를 shift 전 값으로 둠
+    """
+    df_ana = df[list(variables)].shift(lag).add_prefix('x_')
+    df_ana['y'] = df[TARGET]
+    df_ana = df_ana.dropna()
+    X = sm.add_constant(df_ana.drop(columns='y'))
+    return sm.OLS(df_ana['y'], X).fit(cov_type=cov_type)
+
+
+if __name__ == "__main__":
+    df = make_frame()
+    for cov_type in ('nonrobust', 'HC1'):
+        t0 = time.perf_counter()
+        table = search(df, TARGET, FEATURES, cov_type=cov_type)
+        t_batch = time.perf_counter() - t0
+
+        rng = np.random.default_rng(1)
+        check = table.iloc[rng.choice(len(table), N_CHECK, replace=False)]
+        t0 = time.perf_counter()
+        for _, row in check.iterrows():
+            variables = row['variables'].split('+')
+            ref = fit_reference(df, row['lag'], variables, cov_type)
+            names = ['const'] + variables
+            np.testing.assert_allclose(row[[f'coef_{c}' for c in names]].to_numpy(float), ref.params.to_numpy(),
+                                       rtol=1e-8, atol=1e-10)
+            np.testing.assert_allclose(row[[f't_{c}' for c in names]].to_numpy(float), ref.tvalues.to_numpy(),
+                                       rtol=1e-8, atol=1e-10)
+            np.testing.assert_allclose(row[[f'p_{c}' for c in names]].to_numpy(float), ref.pvalues.to_numpy(),
+                                       rtol=1e-6, atol=1e-12)
+            np.testing.assert_allclose(row[['r2', 'adj_r2', 'aic', 'bic']].to_numpy(float),
+                                       [ref.rsquared, ref.rsquared_adj, ref.aic, ref.bic], rtol=1e-9)
+            assert row['nobs'] == ref.nobs
+        t_ref = (time.perf_counter() - t0) / N_CHECK
+
+        print(f"[DONE] {cov_type}: {N_CHECK}개 모델이 statsmodels 와 일치")
+        print(f"statsmodels 1개씩 : {t_ref * 1000:.2f}ms x {len(table):,}개 = {t_ref * len(table):.1f}초")
+        print(f"lag_regression    : {t_batch:.2f}초 ({t_ref * len(table) / t_batch:.1f}배)")
+
+    t0 = time.perf_counter()
+    search(df, TARGET, FEATURES, cov_type='HC1', workers=4)
+    print(f"lag_regression (프로세스 4개) : {time.perf_counter() - t0:.2f}초")
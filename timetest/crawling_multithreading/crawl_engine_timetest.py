@@ -0,0 +1,84 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "crawler"))
+from crawl_engine import CrawlEngine, percentile
+
+# crawl_engine 확인용 (네트워크 없음)
+# 1) percentile 이 nearest-rank 인지 (작은 리스트로 값 고정)
+# 2) 429/5xx 만 계속 오는 호스트에서 속도가 올라가지 않고 줄어드는지
+# 3) 응답이 바로 오는 세션으로 엔진 자체 오버헤드 (req/s)
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.headers = {}
+
+
+class FakeSession:
+    """status_codes 를 순서대로 돌려주는 세션 (다 쓰면 마지막 값 반복)"""
+
+    def __init__(self, status_codes):
+        self.status_codes = list(status_codes)
+        self.calls = 0
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        code = self.status_codes[min(self.calls, len(self.status_codes) - 1)]
+        self.calls += 1
+        return FakeResponse(code)
+
+
+def check_percentile():
+    values = list(range(1, 11))  # 1..10
+    assert percentile(values, 50) == 5
+    assert percentile(values, 90) == 9
+    assert percentile(values, 99) == 10
+    assert percentile(values, 0) == 1
+    assert percentile(values, 100) == 10
+    values = list(range(1, 21))  # 1..20
+    assert percentile(values, 95) == 19
+    assert percentile(values, 50) == 10
+    assert percentile([7.0], 50) == 7.0
+    assert percentile([], 50) == 0.0
+
+
+def no_wait(bucket):
+    """감속은 그대로, 백오프 대기만 0초로"""
+    penalize = bucket.penalize
+    bucket.penalize = lambda attempt, retry_after=None: penalize(attempt, 0.0)
+    return bucket
+
+
+async def check_retry_backoff():
+    engine = CrawlEngine(rate=1000.0, max_retries=2, session=FakeSession([503]))
+    bucket = no_wait(engine.bucket("example.com"))
+    res = await engine.fetch("http://example.com/a")
+    assert res.status_code == 503
+    assert bucket.rate == 1000.0 / 4, bucket.rate  # 두 번 모두 감속, 마지막에 reward 없음
+    assert engine.stats.retries == 1
+
+    engine = CrawlEngine(rate=1000.0, max_retries=3, session=FakeSession([429, 200]))
+    bucket = no_wait(engine.bucket("example.com"))
+    res = await engine.fetch("http://example.com/a")
+    assert res.status_code == 200
+    assert bucket.rate == 1000.0 / 2 + bucket.recover_step
+
+
+async def run_throughput(n):
+    engine = CrawlEngine(rate=1e6, concurrency=16, session=FakeSession([200]))
+    await engine.run_jobs(lambda i: engine.fetch(f"http://example.com/{i}"), range(n))
+    return engine.stats.report()
+
+
+if __name__ == "__main__":
+    check_percentile()
+    asyncio.run(check_retry_backoff())
+    t0 = time.perf_counter()
+    report = asyncio.run(run_throughput(2000))
+    elapsed = time.perf_counter() - t0
+    print("[DONE] percentile(nearest-rank) / 재시도 상태코드 감속 확인")
+    print(f"엔진 오버헤드: {report['requests']}건 {elapsed:.2f}초 ({report['requests'] / elapsed:.0f} req/s), "
+          f"p50 {report['p50_ms']}ms / p99 {report['p99_ms']}ms")
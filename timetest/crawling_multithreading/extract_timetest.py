@@ -0,0 +1,143 @@
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "crawler" / "news_crawler"))
+from news_extract import EXTRACTORS
+
+# 저장해 둔 HTML/JSON 으로 추출 백엔드 비교 (기본: 이 폴더의 fixtures/, 네트워크 없이 실행)
+#  - fixtures/articles/*.html : 기사 페이지 (+ .url)
+#  - fixtures/search/*.json   : 검색 API 응답
+#  - fixtures/expected.json   : 파일 이름별 기대 결과 {'articles': {이름: dict}, 'search': {이름: 정렬된 url}}
+#    (기본 fixtures 는 네이버 기사 / 검색 응답 마크업을 본떠 만든 페이지. 스크립트 / 템플릿 / 루비 / 엔티티 /
+#     날짜 속성 없음 / 본문 없음 등 두 백엔드가 갈리기 쉬운 경우를 넣어 둠)
+# 1) 각 백엔드가 expected(없는 파일은 bs4 결과)와 같은지 확인 (parity) -> 불일치가 있으면 exit 1
+# 2) 백엔드별 처리 속도 측정 (docs/sec)
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+
+def fetch_fixtures(fixtures_dir: Path, frontier_path: str, n: int):
+    """frontier 에서 수집 완료된 기사 n 개를 골라 원본 HTML 을 fixtures 로 저장"""
+    import requests
+    from naver_news import ARTICLE_HEADERS
+
+    out = fixtures_dir / "articles"
+    out.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(frontier_path)
+    urls = [r[0] for r in conn.execute("SELECT url FROM urls WHERE state = 'done' ORDER BY RANDOM() LIMIT ?", (n,))]
+    session = requests.Session()
+    for i, url in enumerate(urls):
+        res = session.get(url, headers=ARTICLE_HEADERS, timeout=15)
+        if res.status_code == 200:
+            (out / f"{i:04d}.html").write_text(res.text, encoding="utf-8")
+            (out / f"{i:04d}.url").write_text(url, encoding="utf-8")
+        time.sleep(0.3)
+    print(f"[DONE] {len(urls)}개 저장: {out}")
+
+
+def dump_search_fixtures(fixtures_dir: Path, cache_path: str, n: int):
+    """목록 캐시(http_cache)에 저장된 검색 API 응답 n 개를 fixtures 로 복사"""
+    out = fixtures_dir / "search"
+    out.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(cache_path)
+    rows = conn.execute("SELECT body, encoding FROM responses WHERE length(body) > 2 "
+                        "ORDER BY RANDOM() LIMIT ?", (n,)).fetchall()
+    for i, (body, encoding) in enumerate(rows):
+        (out / f"{i:04d}.json").write_text(body.decode(encoding or "utf-8"), encoding="utf-8")
+    print(f"[DONE] {len(rows)}개 저장: {out}")
+
+
+def load_fixtures(fixtures_dir: Path):
+    """-> (기사 이름 리스트, [(html, url)], 검색 이름 리스트, [json], expected)"""
+    article_paths = sorted((fixtures_dir / "articles").glob("*.html"))
+    articles = []
+    for p in article_paths:
+        url_file = p.with_suffix(".url")
+        url = url_file.read_text(encoding="utf-8").strip() if url_file.exists() else p.name
+        articles.append((p.read_text(encoding="utf-8"), url))
+    search_paths = sorted((fixtures_dir / "search").glob("*.json"))
+    searches = [json.loads(p.read_text(encoding="utf-8")) for p in search_paths]
+    expected_path = fixtures_dir / "expected.json"
+    expected = json.loads(expected_path.read_text(encoding="utf-8")) if expected_path.exists() else {}
+    return [p.stem for p in article_paths], articles, [p.stem for p in search_paths], searches, expected
+
+
+def write_expected(fixtures_dir: Path):
+    """bs4(reference) 결과로 expected.json 을 다시 만듦 (fixtures 를 새로 받은 뒤 눈으로 확인하고 실행)"""
+    article_names, articles, search_names, searches, _ = load_fixtures(fixtures_dir)
+    parse_fn, urls_fn = EXTRACTORS["bs4"]
+    expected = {"articles": {n: parse_fn(*a) for n, a in zip(article_names, articles)},
+                "search": {n: sorted(urls_fn(d)) for n, d in zip(search_names, searches)}}
+    (fixtures_dir / "expected.json").write_text(json.dumps(expected, ensure_ascii=False, indent=1) + "\n",
+                                                encoding="utf-8")
+    print(f"[DONE] expected.json 저장: 기사 {len(articles)}개 / 검색 응답 {len(searches)}개")
+
+
+def bench(fn, items, repeat):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        out = [fn(*item) for item in items]
+    elapsed = (time.perf_counter() - t0) / repeat
+    return out, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fixtures", default=str(FIXTURES_DIR))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--fetch", type=int, default=0, help="frontier 에서 기사 N개를 받아 fixtures 생성")
+    parser.add_argument("--frontier", default="news_frontier.sqlite")
+    parser.add_argument("--cache", default="naver_search_cache.sqlite")
+    parser.add_argument("--write-expected", action="store_true", help="bs4 결과로 expected.json 다시 생성")
+    args = parser.parse_args()
+
+    fixtures_dir = Path(args.fixtures)
+    if args.fetch:
+        fetch_fixtures(fixtures_dir, args.frontier, args.fetch)
+        dump_search_fixtures(fixtures_dir, args.cache, args.fetch)
+    if args.write_expected:
+        write_expected(fixtures_dir)
+
+    article_names, articles, search_names, searches, expected = load_fixtures(fixtures_dir)
+    if not articles and not searches:
+        print(f"❌ fixtures 가 없습니다: {fixtures_dir} (--fetch N 으로 생성)")
+        return 1
+
+    # 기대 결과: expected.json, 거기 없는 파일은 bs4(reference) 결과
+    expected_articles = expected.get("articles", {})
+    expected_search = expected.get("search", {})
+    ref_parse, ref_urls = EXTRACTORS["bs4"]
+    ref_articles = [expected_articles[n] if n in expected_articles else ref_parse(*a)
+                    for n, a in zip(article_names, articles)]
+    ref_search = [expected_search[n] if n in expected_search else sorted(ref_urls(d))
+                  for n, d in zip(search_names, searches)]
+
+    print(f"기사 {len(articles)}개 / 검색 응답 {len(searches)}개")
+    print("-" * 60)
+    failed = 0
+    for name, (parse_fn, urls_fn) in EXTRACTORS.items():
+        try:
+            out_articles, t_articles = bench(parse_fn, articles, args.repeat)
+            out_search, t_search = bench(lambda d: sorted(urls_fn(d)), [(d,) for d in searches], args.repeat)
+        except ImportError as e:
+            print(f"[{name}] 건너뜀 ({e})")
+            continue
+
+        mismatch = [a['url'] for a, r in zip(out_articles, ref_articles) if a != r]
+        mismatch_search = sum(1 for a, r in zip(out_search, ref_search) if a != r)
+        art_rate = len(articles) / t_articles if t_articles else 0
+        search_rate = len(searches) / t_search if t_search else 0
+        print(f"[{name}] 기사 {art_rate:8.1f} docs/s | 검색 {search_rate:8.1f} docs/s | "
+              f"불일치: 기사 {len(mismatch)} / 검색 {mismatch_search}")
+        for url in mismatch[:5]:
+            print(f"    ≠ {url}")
+        failed += len(mismatch) + mismatch_search
+    return 1 if failed else 0
+
+
+# 사용법: python extract_timetest.py [--fixtures DIR] [--repeat N] [--fetch N --frontier DB --cache DB] [--write-expected]
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+import json
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "preprocessing" / "press_preprocess"))
+from clean_tokens_v2 import TokenCleaner, clean_file
+
+WORDS = ["금리/NNG", "인상/NNG", "Tel/SL", "www/SL", "bok.or.kr/SL", "gdp/SL", "물가/NNG", "2024/SN", "%/SW", "하/XSV"]
+
+
+def make_parts(folder, rng, n_parts=5, rows_per_part=300):
+    """sentence_split 출력처럼 part-XX-XXXXX.parquet 여러 개. 첫 part 의 category 는 전부 null"""
+    folder.mkdir(parents=True, exist_ok=True)
+    frames = []
+    for i in range(n_parts):
+        rows = [{'doc_id': i * rows_per_part + j,
+                 'category': None if i == 0 else rng.choice(['news', 'minutes']),
+                 'tokens': [rng.choice(WORDS) for _ in range(rng.randint(0, 12))]}
+                for j in range(rows_per_part)]
+        df = pd.DataFrame(rows)
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), folder / f"part-00-{i:05d}.parquet")
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True)
+
+
+# 사용법: python clean_tokens_test.py [seed]
+# part 폴더를 그대로 넣은 결과가 part 를 하나로 합친 CSV 를 정제한 결과와 같은지 (행 순서 / 토큰 / removed 통계)
+if __name__ == "__main__":
+    seed = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+    rng = random.Random(seed)
+    tmp = Path(tempfile.mkdtemp(prefix="clean_tokens_test_"))
+    merged = make_parts(tmp / "sentence_parts", rng)
+
+    merged_csv = tmp / "merged.csv"
+    merged.assign(tokens=[json.dumps(t, ensure_ascii=False) for t in merged['tokens']]).to_csv(merged_csv, index=False)
+    expected = clean_file(merged_csv, tmp / "merged_clean.csv", chunksize=128)
+    expected_tokens = [json.loads(s) for s in pd.read_csv(tmp / "merged_clean.csv")['tokens']]
+
+    got = clean_file(tmp / "sentence_parts", tmp / "parts_clean.parquet", chunksize=128)
+    out = pq.read_table(tmp / "parts_clean.parquet")
+    assert out.schema.field('tokens').type == pa.list_(pa.string())
+    out = out.to_pandas()
+    assert out['doc_id'].tolist() == merged['doc_id'].tolist(), "행 순서가 다름"
+    assert [list(t) for t in out['tokens']] == expected_tokens, "정제 결과가 다름"
+    assert got.removed == expected.removed and got.n_docs == expected.n_docs == len(merged)
+
+    empty = tmp / "empty_parts"
+    empty.mkdir()
+    assert clean_file(empty, tmp / "empty_clean.parquet").n_docs == 0
+    print(f"[DONE] part {len(list((tmp / 'sentence_parts').glob('*.parquet')))}개 / 행 {len(out):,}개 "
+          f"폴더 입력 결과가 합친 파일과 같음 (토큰 {got.tokens_before:,} -> {got.tokens_after:,})")
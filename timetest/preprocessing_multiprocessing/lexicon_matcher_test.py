@@ -0,0 +1,50 @@
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "preprocessing"))
+from lexicon_matcher import LexiconTrie
+from ngram_utils import all_ngrams, ngramize
+from ngramize_equivalence_test import random_tokens
+
+
+def make_lexicon(rng, sentences, n_words=3000):
+    """실제로 나오는 n-gram 일부 + 안 나오는 단어를 섞어서 hawkish / dovish 사전"""
+    grams = set()
+    for tokens in sentences[:2000]:
+        grams.update(ngramize(tokens, 5))
+        grams.update(all_ngrams(tokens, 5))
+    grams = sorted(grams)
+    words = rng.sample(grams, min(n_words, len(grams))) + [f"없는단어{i}/NNG" for i in range(500)]
+    half = len(words) // 2
+    return set(words[:half]), set(words[half:])
+
+
+def count_reference(token_lists, hawkish_set, dovish_set, fn):
+    """tone.ipynb 방식: n-gram 리스트를 만들고 set 으로 셈"""
+    grams = [fn(tokens, 5) for tokens in token_lists]
+    return ([len([w for w in x if w in hawkish_set]) for x in grams],
+            [len([w for w in x if w in dovish_set]) for x in grams])
+
+
+# 사용법: python lexicon_matcher_test.py [문장 수(기본 20000)] [seed]
+# 무작위 MPCK 토큰열에 대해 (ngramize / all_ngrams + set) 와 트라이 매처의 문장별 개수가 같은지 확인하고 시간 비교
+if __name__ == "__main__":
+    n_sentences = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    rng = random.Random(seed)
+    sentences = [random_tokens(rng) for _ in range(n_sentences)]
+    hawkish_set, dovish_set = make_lexicon(rng, sentences)
+    trie = LexiconTrie.from_sets(hawkish_set, dovish_set)
+
+    for mode, fn in (('cover', ngramize), ('all', all_ngrams)):
+        expected = count_reference(sentences, hawkish_set, dovish_set, fn)
+        got = trie.count_many(sentences, mode)
+        assert got == expected, f"{mode} 결과가 다름"
+
+        t_ref = min(timeit.repeat(lambda: count_reference(sentences, hawkish_set, dovish_set, fn), number=1, repeat=3))
+        t_trie = min(timeit.repeat(lambda: trie.count_many(sentences, mode), number=1, repeat=3))
+        print(f"[DONE] {mode}: 문장 {n_sentences:,}개 결과 일치 / "
+              f"n-gram + set {t_ref * 1e6 / n_sentences:.2f} us/문장, 트라이 {t_trie * 1e6 / n_sentences:.2f} us/문장 "
+              f"(x{t_ref / t_trie:.1f})")
@@ -6,6 +6,10 @@ import sys
 from ekonlpy.sentiment import MPCK
 from multiprocessing import Pool
 from tqdm import tqdm
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "preprocessing"))
+from ngram_utils import ngramize  # 공용 구현 (기존 복사본과 결과 동일)
 
 # [패치] 윈도우 인코딩 에러 방지
 if sys.platform == 'win32':
@@ -28,31 +32,6 @@ def init_worker():
     if worker_mpck is None:
         worker_mpck = MPCK()
 
-# --- [1. ngramize 함수] ---
-def ngramize(tokens, max_n=5):
-    keep_tags = ['NNG', 'VA', 'VAX', 'MAG', 'VV']
-    filtered = [w for w in tokens if w.split('/')[1] in keep_tags]
-    all_ngrams = []
-    for pos in range(len(filtered)):
-        for n in range(1, max_n + 1):
-            if pos + n <= len(filtered):
-                ngram = ";".join(filtered[pos : pos + n])
-                all_ngrams.append({'ngram': ngram, 'start': pos, 'end': pos + n, 'len': n})   
-    final_ngrams = []
-    sorted_ngrams = sorted(all_ngrams, key=lambda x: x['len'], reverse=True)
-    covered_ranges = set()
-    for ngram in sorted_ngrams:
-        is_covered = False
-        for i in range(ngram['start'], ngram['end']):
-            if i in covered_ranges:
-                is_covered = True
-                break
-        if not is_covered:
-            final_ngrams.append(ngram['ngram'])
-            for i in range(ngram['start'], ngram['end']):
-                covered_ranges.add(i)
-    return final_ngrams
-
 # --- [2. 멀티프로세싱 일꾼 함수] ---
 def worker_task(text_list):
     global worker_mpck
@@ -0,0 +1,30 @@
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "preprocessing"))
+from ngram_utils import ngramize, ngramize_batch
+from ngramize_equivalence_test import ngramize_reference, random_tokens
+
+# 사용법: python ngramize_benchmark.py [문장 수(기본 20000)] [반복 횟수(기본 5)]
+# 같은 무작위 문장 묶음에 대해 기존 ngramize / 새 ngramize / ngramize_batch 의 문장당 시간 비교
+if __name__ == "__main__":
+    n_sentences = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    rng = random.Random(0)
+    sentences = [random_tokens(rng) for _ in range(n_sentences)]
+    n_tokens = sum(len(s) for s in sentences)
+    print(f"문장 {n_sentences:,}개 / 토큰 {n_tokens:,}개 (평균 {n_tokens / n_sentences:.1f})")
+
+    cases = {
+        "기존 ngramize": lambda: [ngramize_reference(s, 5) for s in sentences],
+        "ngram_utils.ngramize": lambda: [ngramize(s, 5) for s in sentences],
+        "ngram_utils.ngramize_batch": lambda: ngramize_batch(sentences, 5),
+    }
+    base = None
+    for name, fn in cases.items():
+        best = min(timeit.repeat(fn, number=1, repeat=repeat))
+        base = base or best
+        print(f"{name:<28} {best * 1e6 / n_sentences:8.2f} us/문장  (x{base / best:.1f})")
@@ -0,0 +1,97 @@
+import random
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "preprocessing"))
+from ngram_utils import KEEP_TAGS, NEWS_KEEP_TAGS, all_ngrams, ngramize, ngramize_batch
+
+
+# --- 기존 구현 (비교 기준, sentence_preprocessing.py 에 있던 그대로) ---
+def ngramize_reference(tokens, max_n=5, keep_tags=KEEP_TAGS):
+    filtered = [w for w in tokens if w.split('/')[1] in keep_tags]
+    all_ngrams = []
+    for pos in range(len(filtered)):
+        for n in range(1, max_n + 1):
+            if pos + n <= len(filtered):
+                ngram = ";".join(filtered[pos : pos + n])
+                all_ngrams.append({'ngram': ngram, 'start': pos, 'end': pos + n, 'len': n})
+    final_ngrams = []
+    sorted_ngrams = sorted(all_ngrams, key=lambda x: x['len'], reverse=True)
+    covered_ranges = set()
+    for ngram in sorted_ngrams:
+        is_covered = False
+        for i in range(ngram['start'], ngram['end']):
+            if i in covered_ranges:
+                is_covered = True
+                break
+        if not is_covered:
+            final_ngrams.append(ngram['ngram'])
+            for i in range(ngram['start'], ngram['end']):
+                covered_ranges.add(i)
+    return final_ngrams
+
+
+# news_preprocess.ipynb 의 겹치는 n-gram 버전
+def all_ngrams_reference(tokens, max_n=5, keep_tags=NEWS_KEEP_TAGS):
+    filtered = [w for w in tokens if w.split('/')[1] in keep_tags]
+    ngram_results = []
+    for pos in range(len(filtered)):
+        for n in range(1, max_n + 1):
+            if pos + n <= len(filtered):
+                ngram = ";".join(filtered[pos : pos + n])
+                ngram_results.append(ngram)
+    return ngram_results
+
+
+WORDS = ['금리', '인상', '물가', '상승', '높', '완화', '매우', '하', '경기', '둔화', '이', '가']
+TAGS = ['NNG', 'VA', 'VAX', 'MAG', 'VV', 'JKS', 'EC', 'SF', 'NNP', 'XSV']
+
+
+def random_tokens(rng: random.Random):
+    """빈 문장 / 전부 걸러지는 문장 / 같은 토큰 반복 / 긴 문장이 골고루 나오도록"""
+    length = rng.choice([0, 1, 2, rng.randint(3, 12), rng.randint(13, 80)])
+    tags = TAGS if rng.random() < 0.8 else rng.choice([TAGS[:5], TAGS[5:]])
+    words = WORDS if rng.random() < 0.8 else WORDS[:1]
+    return [f"{rng.choice(words)}/{rng.choice(tags)}" for _ in range(length)]
+
+
+# 사용법: python ngramize_equivalence_test.py [케이스 수(기본 20000)] [seed]
+# 무작위 토큰열(길이/품사 분포를 섞음)과 max_n 1~7 에 대해 기존 함수와 결과가 완전히 같은지 확인
+if __name__ == "__main__":
+    n_cases = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    rng = random.Random(seed)
+
+    failures = 0
+    batch, batch_expected, batch_n = [], [], 5
+    for case in range(n_cases):
+        tokens = random_tokens(rng)
+        max_n = rng.randint(1, 7)
+        keep_tags = KEEP_TAGS if rng.random() < 0.7 else tuple(rng.sample(TAGS, rng.randint(1, len(TAGS))))
+        checks = [
+            ("ngramize", ngramize(tokens, max_n, keep_tags), ngramize_reference(tokens, max_n, keep_tags)),
+            ("all_ngrams", all_ngrams(tokens, max_n, keep_tags), all_ngrams_reference(tokens, max_n, keep_tags)),
+        ]
+        for name, got, expected in checks:
+            if got != expected:
+                failures += 1
+                if failures <= 5:
+                    print(f"[FAIL] {name} max_n={max_n} keep={keep_tags}\n  tokens={tokens}\n  got={got}\n  expected={expected}")
+        batch.append(tokens)
+        batch_expected.append(ngramize_reference(tokens, batch_n))
+
+    if ngramize_batch(batch, batch_n) != batch_expected:
+        failures += 1
+        print("[FAIL] ngramize_batch")
+
+    # '/' 가 없는 토큰은 기존처럼 IndexError
+    for fn in (ngramize, ngramize_reference):
+        try:
+            fn(["금리"])
+            failures += 1
+            print(f"[FAIL] {fn.__name__}: IndexError 가 나야 함")
+        except IndexError:
+            pass
+
+    print(f"{n_cases}개 케이스 (seed={seed}): {'통과' if failures == 0 else f'실패 {failures}건'}")
+    sys.exit(1 if failures else 0)
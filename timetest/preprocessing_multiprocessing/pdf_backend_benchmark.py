@@ -0,0 +1,67 @@
+import difflib
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "crawler" / "bok_press_crawler"))
+import preprocess_config as cfg
+import preprocess_utils as ut
+
+REFERENCE = "pdfplumber"
+
+
+def char_agreement(ref: str, other: str) -> float:
+    """문자 단위 일치율: 2 * 일치 문자 수 / (두 문자열 길이 합)  (difflib.SequenceMatcher.ratio)"""
+    if not ref and not other:
+        return 1.0
+    return difflib.SequenceMatcher(None, ref, other, autojunk=False).ratio()
+
+
+def no_space(text: str) -> str:
+    return re.sub(r"\s+", "", text)
+
+
+# 사용법: python pdf_backend_benchmark.py [PDF 개수(기본 30)] [백엔드 ...]
+# 백엔드마다 같은 PDF 를 순서대로 추출해 pages/sec 를 재고,
+# clean_text 후 텍스트가 pdfplumber(기준)와 문자 단위로 얼마나 같은지 비교한다.
+if __name__ == "__main__":
+    n_files = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    backends = sys.argv[2:] or list(ut.PDF_BACKENDS)
+    if REFERENCE not in backends:
+        backends.insert(0, REFERENCE)
+
+    pdf_files = sorted(cfg.PDF_ROOT.rglob("*.pdf"))[:n_files]
+    print(f"PDF {len(pdf_files)}개 / backends={backends}")
+
+    texts = {}
+    for backend in backends:
+        texts[backend] = {}
+        pages = 0
+        start = time.time()
+        for pdf_path in pdf_files:
+            try:
+                text, page_count = ut.extract_text_from_pdf(pdf_path, backend)
+            except Exception as e:
+                print(f"[WARN] {backend} 실패: {pdf_path.name} / {e}")
+                continue
+            texts[backend][pdf_path] = ut.clean_text(text)
+            pages += page_count
+        elapsed = time.time() - start
+        print(f"[{backend}] {pages}페이지 / {elapsed:.2f}초 / {pages / elapsed:.1f} pages/sec")
+
+    print(f"\n기준({REFERENCE}) 대비 문자 일치율 (clean_text 후, 문서 평균)")
+    ref = texts[REFERENCE]
+    for backend in backends:
+        if backend == REFERENCE:
+            continue
+        common = [p for p in ref if p in texts[backend]]
+        if not common:
+            print(f"[{backend}] 비교할 문서 없음")
+            continue
+        exact = sum(ref[p] == texts[backend][p] for p in common)
+        ratio = sum(char_agreement(ref[p], texts[backend][p]) for p in common) / len(common)
+        ratio_ns = sum(char_agreement(no_space(ref[p]), no_space(texts[backend][p])) for p in common) / len(common)
+        print(f"[{backend}] 완전일치 {exact}/{len(common)} / 문자 일치율 {ratio:.4f} / 공백 제외 {ratio_ns:.4f}")
+        worst = min(common, key=lambda p: char_agreement(ref[p], texts[backend][p]))
+        print(f"    가장 다른 문서: {worst.name}")
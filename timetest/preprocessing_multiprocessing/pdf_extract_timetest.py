@@ -0,0 +1,54 @@
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# bok_press_crawler 의 추출 함수들을 그대로 사용
+sys.path.append(str(Path(__file__).resolve().parents[2] / "crawler" / "bok_press_crawler"))
+import preprocess_config as cfg
+import preprocess_utils as ut
+import text_extract as te
+
+# 사용법: python pdf_extract_timetest.py [PDF 개수(기본 50)] [워커 수]
+if __name__ == "__main__":
+    n_files = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+
+    pdf_files = sorted(cfg.PDF_ROOT.rglob("*.pdf"))[:n_files]
+    print(f"PDF {len(pdf_files)}개 / workers={workers or 'cpu_count'}")
+
+    # 1) 기존 방식: 파일 하나씩 순서대로
+    start = time.time()
+    serial = {}
+    for pdf_path in pdf_files:
+        try:
+            serial[pdf_path] = ut.extract_text_from_pdf(pdf_path, cfg.PDF_BACKEND)
+        except Exception as e:
+            print(f"[WARN] 실패: {pdf_path.name} / {e}")
+    t_serial = time.time() - start
+    print(f"[1] 순차 추출: {t_serial:.2f}초")
+
+    cache_dir = Path(tempfile.mkdtemp(prefix="text_cache_"))
+    try:
+        cache = te.TextCache(cache_dir, cfg.EXTRACTOR_VERSION, cfg.PDF_BACKEND)
+
+        # 2) 페이지 단위 프로세스 병렬 (캐시가 비어 있음)
+        start = time.time()
+        parallel = te.extract_texts(pdf_files, cache=cache, workers=workers, backend=cfg.PDF_BACKEND)
+        t_parallel = time.time() - start
+        print(f"[2] 병렬 추출: {t_parallel:.2f}초 (x{t_serial / t_parallel:.2f})")
+
+        # 3) 같은 파일 재실행 -> 전부 캐시 적중
+        start = time.time()
+        cached = te.extract_texts(pdf_files, cache=cache, workers=workers, backend=cfg.PDF_BACKEND)
+        t_cached = time.time() - start
+        print(f"[3] 캐시 적중: {t_cached:.2f}초 (x{t_serial / max(t_cached, 1e-9):.1f})")
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    # 결과가 기존 방식과 글자 하나까지 같은지 확인
+    mismatch = [p.name for p in serial if serial[p] != parallel.get(p) or serial[p] != cached.get(p)]
+    print(f"일치: {len(serial) - len(mismatch)}/{len(serial)}")
+    for name in mismatch[:10]:
+        print(f"  불일치: {name}")
@@ -0,0 +1,58 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "preprocessing"))
+import multipreprocessing_timetest as barrier     # 기존: batch 마다 np.array_split + pool.map (8코어 고정)
+import sentence_preprocessing as streaming        # 새 방식: record batch + imap_unordered + writer 스레드
+
+# 사용법: python scheduler_timetest.py [문장 수(기본 전체)] [워커 수(기본 8)]
+# 같은 문장 파일을 두 스케줄러로 처리해서 문장/초를 비교한다.
+# 토큰화 캐시는 끄고(cache_path=None) 스케줄링 차이만 측정하며, 두 결과가 같은지도 확인한다.
+if __name__ == "__main__":
+    SENTENCE_FILE = 'df_sentences_timetest.parquet'
+    if not os.path.exists(SENTENCE_FILE):
+        print(f"❌ '{SENTENCE_FILE}' 파일이 없습니다. sentence_kss_test.py 를 먼저 실행하세요.")
+        sys.exit(1)
+
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    df = pd.read_parquet(SENTENCE_FILE)
+    if n_rows:
+        df = df.head(n_rows)
+    df = df.reset_index(drop=True)
+    input_file = os.path.join(tempfile.gettempdir(), 'scheduler_timetest_input.parquet')
+    df.to_parquet(input_file)
+    print(f"📂 문장 {len(df):,}개 / 워커 {workers}개")
+
+    out_barrier = tempfile.mkdtemp(prefix='barrier_')
+    out_streaming = tempfile.mkdtemp(prefix='streaming_')
+    try:
+        start = time.time()
+        barrier.run_production(df, output_folder=out_barrier)
+        t_barrier = time.time() - start
+
+        start = time.time()
+        streaming.run_production(input_file, output_folder=out_streaming, cache_path=None, num_workers=workers)
+        t_streaming = time.time() - start
+
+        def load(folder):
+            files = sorted(Path(folder).glob('batch_*.parquet'), key=lambda p: int(p.stem.split('_')[1]))
+            return pd.concat([pd.read_parquet(f) for f in files], ignore_index=True)
+
+        same = load(out_barrier)['tokens'].map(list).equals(load(out_streaming)['tokens'].map(list))
+    finally:
+        shutil.rmtree(out_barrier, ignore_errors=True)
+        shutil.rmtree(out_streaming, ignore_errors=True)
+        os.remove(input_file)
+
+    print("-" * 40)
+    print(f"[barrier]   {t_barrier:8.1f}초  {len(df) / t_barrier:10,.0f} 문장/초")
+    print(f"[streaming] {t_streaming:8.1f}초  {len(df) / t_streaming:10,.0f} 문장/초  (x{t_barrier / t_streaming:.2f})")
+    print(f"결과 일치: {same}")
@@ -16,32 +16,10 @@ os.environ['PYTHONUTF8'] = '1'
 import pandas as pd
 from ekonlpy.sentiment import MPCK
 from tqdm import tqdm
+from pathlib import Path
 
-# --- [2. ngramize 함수] ---
-def ngramize(tokens, max_n=5):
-    keep_tags = ['NNG', 'VA', 'VAX', 'MAG', 'VV']
-    filtered = [w for w in tokens if w.split('/')[1] in keep_tags]
-    all_ngrams = []
-    for pos in range(len(filtered)):
-        for n in range(1, max_n + 1):
-            if pos + n <= len(filtered):
-                ngram = ";".join(filtered[pos : pos + n])
-                all_ngrams.append({'ngram': ngram, 'start': pos, 'end': pos + n, 'len': n})
-                
-    final_ngrams = []
-    sorted_ngrams = sorted(all_ngrams, key=lambda x: x['len'], reverse=True)
-    covered_ranges = set()
-    for ngram in sorted_ngrams:
-        is_covered = False
-        for i in range(ngram['start'], ngram['end']):
-            if i in covered_ranges:
-                is_covered = True
-                break
-        if not is_covered:
-            final_ngrams.append(ngram['ngram'])
-            for i in range(ngram['start'], ngram['end']):
-                covered_ranges.add(i)
-    return final_ngrams
+sys.path.append(str(Path(__file__).resolve().parents[2] / "preprocessing"))
+from ngram_utils import ngramize  # 공용 구현 (기존 복사본과 결과 동일)
 
 # --- [3. MPCK 선언 및 토큰화 함수] ---
 # 패치 적용 후에 선언해야 안전합니다.
@@ -0,0 +1,77 @@
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "preprocessing"))
+from token_store import convert, open_corpus, parse_tokens
+
+
+def make_synthetic_batches(folder, n_batches=4, rows_per_batch=5_000, vocab_size=20_000, seed=0):
+    """run_production 출력처럼 batch_{i}.parquet 폴더를 만듦 (tokens 는 JSON 문자열)"""
+    rng = random.Random(seed)
+    words = [f"단어{i}/NNG" for i in range(vocab_size)]
+    folder = Path(folder)
+    folder.mkdir(parents=True, exist_ok=True)
+    for b in range(n_batches):
+        rows = []
+        for i in range(rows_per_batch):
+            tokens = [rng.choice(words) for _ in range(rng.randint(5, 60))]
+            rows.append({'doc_id': f"doc{b * rows_per_batch + i // 20}",
+                         'date': f"2024-{b % 12 + 1:02d}-01",
+                         'category': rng.choice(['news', 'minutes', None]),
+                         'tokens': json.dumps(tokens, ensure_ascii=False)})
+        pd.DataFrame(rows).to_parquet(folder / f"batch_{b}.parquet", index=False)
+    return folder
+
+
+# 사용법: python token_store_timetest.py [토큰 parquet/csv/batch 폴더] [코퍼스 폴더(기본 ./token_corpus)]
+# 입력을 안 주면 임시 폴더에 합성 batch 폴더를 만들어서 씀
+# 기존 방식(pandas 로 읽고 문자열 토큰 파싱)과 정수 코퍼스(memory map) 로딩 시간/메모리 비교
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        source = sys.argv[1]
+        corpus_dir = sys.argv[2] if len(sys.argv) > 2 else './token_corpus'
+    else:
+        tmp = Path(tempfile.mkdtemp(prefix='token_store_timetest_'))
+        source = make_synthetic_batches(tmp / 'processed_batches')
+        corpus_dir = tmp / 'token_corpus'
+        print(f"[INFO] 입력이 없어서 합성 데이터 사용: {source}")
+
+    if not (Path(corpus_dir) / 'tokens.arrow').exists():
+        start = time.time()
+        convert(source, corpus_dir)
+        print(f"[변환] {time.time() - start:.1f}초")
+
+    tracemalloc.start()
+    start = time.time()
+    src = Path(source)
+    if src.is_dir():
+        df = pd.concat([pd.read_parquet(p) for p in sorted(src.glob('*.parquet'))], ignore_index=True)
+    elif src.suffix.lower() == '.csv':
+        df = pd.read_csv(src)
+    else:
+        df = pd.read_parquet(src)
+    df['tokens'] = df['tokens'].map(parse_tokens)
+    t_old = time.time() - start
+    _, peak_old = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    n_rows = len(df)
+    del df
+
+    tracemalloc.start()
+    start = time.time()
+    corpus = open_corpus(corpus_dir)
+    n_tokens = int(corpus.lengths().sum())
+    t_new = time.time() - start
+    _, peak_new = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"행 {n_rows:,}개 / 토큰 {n_tokens:,}개 / vocab {len(corpus.vocab):,}")
+    print(f"[기존: 문자열 파싱] {t_old:7.2f}초  Python 힙 최대 {peak_old / 2**20:9.1f} MB")
+    print(f"[정수 코퍼스 mmap] {t_new:7.2f}초  Python 힙 최대 {peak_new / 2**20:9.1f} MB  (vocab 포함)")
@@ -0,0 +1,79 @@
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.naive_bayes import MultinomialNB
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "tone_score"))
+from lexicon_builder import build_lexicon, split_lexicon
+
+N_DOCS = 5000
+N_WORDS = 5000
+N_ROUNDS = 30
+
+
+# --- 기존 구현 (비교 기준, lexicon.ipynb 의 NBC 학습 셀 그대로) ---
+def lexicon_reference(df_test, n_test_rounds):
+    bagging_results = []
+    for i in range(n_test_rounds):
+        train_data = df_test.sample(frac=0.9, random_state=i)
+        cv = CountVectorizer(tokenizer=lambda x: x, lowercase=False, preprocessor=lambda x: x, token_pattern=None)
+        X_train = cv.fit_transform(train_data['tokens'])
+        nbc = MultinomialNB()
+        nbc.fit(X_train, train_data['label'])
+        dovish_idx = np.where(nbc.classes_ == 'dovish')[0][0]
+        hawkish_idx = np.where(nbc.classes_ == 'hawkish')[0][0]
+        prob_hawkish = np.exp(nbc.feature_log_prob_[hawkish_idx])
+        prob_dovish = np.exp(nbc.feature_log_prob_[dovish_idx])
+        score_df = pd.DataFrame({'word': cv.get_feature_names_out(),
+                                 f'score_{i}': prob_hawkish / (prob_dovish + 1e-10)}).set_index('word')
+        bagging_results.append(score_df)
+    final_lexicon = pd.concat(bagging_results, axis=1)
+    final_lexicon['polarity_score'] = final_lexicon.mean(axis=1)
+    return final_lexicon
+
+
+def make_docs(seed=0):
+    rng = np.random.default_rng(seed)
+    # 단어 빈도를 Zipf 비슷하게 + 일부 단어는 라벨과 상관
+    weights = 1 / np.arange(1, N_WORDS + 1)
+    weights /= weights.sum()
+    vocab = np.array([f"단어{i}/NNG" for i in range(N_WORDS)], dtype=object)
+    labels = rng.choice(['hawkish', 'dovish'], N_DOCS)
+    tokens = []
+    for label in labels:
+        words = list(vocab[rng.choice(N_WORDS, size=rng.integers(5, 80), p=weights)])
+        words += [f"{label}{rng.integers(20)}/NNG"] * int(rng.integers(0, 3))
+        tokens.append(words)
+    return pd.DataFrame({'tokens': tokens, 'label': labels})
+
+
+if __name__ == "__main__":
+    df = make_docs()
+
+    t0 = time.perf_counter()
+    ref = lexicon_reference(df, N_ROUNDS)
+    t_ref = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    new = build_lexicon(df, n_rounds=N_ROUNDS, workers=1)
+    t_new = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    new_mp = build_lexicon(df, n_rounds=N_ROUNDS, workers=4, keep_rounds=False)
+    t_mp = time.perf_counter() - t0
+
+    assert list(new.index) == list(ref.index), "단어 순서가 다름"
+    assert list(new.columns) == list(ref.columns), "컬럼이 다름"
+    assert np.allclose(new.to_numpy(), ref.to_numpy(), rtol=1e-12, equal_nan=True), "score 가 다름"
+    assert np.allclose(new_mp['polarity_score'], ref['polarity_score'], rtol=1e-12), "병렬 결과가 다름"
+    assert split_lexicon(new).index.equals(
+        pd.concat([ref[ref['polarity_score'] > 1.3], ref[ref['polarity_score'] < 1 / 1.3]]).index)
+
+    print(f"[DONE] 결과 일치 (단어 {len(new):,}개, {N_ROUNDS} 라운드)")
+    print(f"기존(CountVectorizer + MultinomialNB) : {t_ref:.2f}초")
+    print(f"lexicon_builder (1 프로세스)          : {t_new:.2f}초 ({t_ref / t_new:.1f}배)")
+    print(f"lexicon_builder (4 프로세스, 평균만)   : {t_mp:.2f}초 ({t_ref / t_mp:.1f}배)")
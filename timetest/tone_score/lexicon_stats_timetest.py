@@ -0,0 +1,130 @@
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "tone_score"))
+import lexicon_builder
+from lexicon_builder import build_lexicon, lexicon_frame, split_lexicon
+from lexicon_stats import N_SEEDS, LexiconStats, doc_keys, export, in_sample
+
+N_DOCS = 6000
+N_WORDS = 3000
+N_MONTHS = 12
+WINDOW_MONTHS = 6
+
+
+def make_docs(seed=0):
+    """df_for_tone 형식 (date, category, content, tokens, rate_1m, label). neutral / rate_1m 결측도 섞음"""
+    rng = np.random.default_rng(seed)
+    weights = 1 / np.arange(1, N_WORDS + 1)
+    weights /= weights.sum()
+    vocab = np.array([f"단어{i}/NNG" for i in range(N_WORDS)], dtype=object)
+    labels = rng.choice(['hawkish', 'dovish', 'neutral'], N_DOCS, p=[0.4, 0.4, 0.2])
+    tokens = []
+    for label in labels:
+        words = list(vocab[rng.choice(N_WORDS, size=rng.integers(5, 60), p=weights)])
+        words += [f"{label}{rng.integers(20)}/NNG"] * int(rng.integers(0, 3))
+        tokens.append(words)
+    months = pd.period_range('2024-01', periods=N_MONTHS, freq='M')
+    dates = [months[m].to_timestamp() + pd.Timedelta(days=int(d))
+             for m, d in zip(rng.integers(0, N_MONTHS, N_DOCS), rng.integers(0, 28, N_DOCS))]
+    rate_1m = np.where(rng.random(N_DOCS) < 0.05, np.nan, 3.5)
+    df = pd.DataFrame({'date': dates, 'category': rng.choice(['news', 'bond', '의사록'], N_DOCS),
+                       'content': [f"문서 {i}" for i in range(N_DOCS)], 'tokens': tokens,
+                       'rate_1m': rate_1m, 'label': labels})
+    return df.sort_values('date', ignore_index=True)
+
+
+def reference_lexicon(df_lex: pd.DataFrame) -> pd.DataFrame:
+    """
+    lexicon_builder.build_lexicon 으로 전체 데이터에서 한 번에 만든 total_lexicon.
+    라운드 표본만 df.sample 대신 저장소와 같은 문서 키 해시 표본 (in_sample) 으로 바꿔 끼움
+    """
+    df_lex = df_lex.reset_index(drop=True)
+    mask = in_sample(doc_keys(df_lex), N_SEEDS)
+    original = lexicon_builder.bootstrap_rows
+    lexicon_builder.bootstrap_rows = lambda n_docs, seed, frac=None: np.flatnonzero(mask[:, seed])
+    try:
+        return split_lexicon(build_lexicon(df_lex, n_rounds=N_SEEDS, workers=1))
+    finally:
+        lexicon_builder.bootstrap_rows = original
+
+
+def assert_same_lexicon(expected: pd.DataFrame, csv_path: Path, name: str):
+    got = pd.read_csv(csv_path, index_col='word', encoding='utf-8-sig')
+    assert list(got.index) == list(expected.index), f"{name}: 단어 / 순서가 다름"
+    assert list(got.columns) == list(expected.columns), f"{name}: 컬럼이 다름"
+    assert (got['label'] == expected['label']).all(), f"{name}: label 이 다름"
+    scores = [c for c in expected.columns if c != 'label']
+    # 빈도는 정수로 같고, polarity_score 평균의 합산 순서만 다름
+    np.testing.assert_allclose(got[scores].to_numpy(float), expected[scores].to_numpy(float),
+                               rtol=1e-12, equal_nan=True, err_msg=name)
+
+
+def month(df):
+    return pd.to_datetime(df['date']).dt.strftime('%Y-%m')
+
+
+# 사용법: python lexicon_stats_timetest.py
+# 저장소(lexicon_stats) 로 만든 total_lexicon.csv 가 전체 데이터로 build_lexicon 한 결과와 같은지
+# 1) 한 번에 넣기 2) 한 달씩 증분 추가 (같은 달 재추가는 무시) 3) drop_periods / window_months 로 기간 이동
+if __name__ == "__main__":
+    df = make_docs()
+    df_lex = lexicon_frame(df)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        t0 = time.perf_counter()
+        expected = reference_lexicon(df_lex)
+        t_full = time.perf_counter() - t0
+
+        # 1) 전체를 한 번에
+        stats = LexiconStats(tmp / 'all.sqlite')
+        assert stats.add_documents(df_lex) == len(df_lex)
+        export(stats, tmp / 'all.csv')
+        assert_same_lexicon(expected, tmp / 'all.csv', "한 번에")
+        stats.close()
+
+        # 2) 한 달씩 증분 추가 + 이미 넣은 달을 다시 넣어도 빈도가 두 번 더해지지 않음
+        stats = LexiconStats(tmp / 'incremental.sqlite')
+        t_add = []
+        for period, batch in df_lex.groupby(month(df_lex)):
+            t0 = time.perf_counter()
+            assert stats.add_documents(batch) == len(batch)
+            t_add.append(time.perf_counter() - t0)
+            assert stats.add_documents(batch) == 0, f"{period} 재추가가 반영됨"
+        t0 = time.perf_counter()
+        export(stats, tmp / 'incremental.csv')
+        t_export = time.perf_counter() - t0
+        assert_same_lexicon(expected, tmp / 'incremental.csv', "증분 추가")
+
+        # 3-1) 최근 WINDOW_MONTHS 개월 윈도우 (저장소는 그대로)
+        periods = stats.periods()
+        start = periods[-WINDOW_MONTHS]
+        recent = df_lex[month(df_lex) >= start]
+        export(stats, tmp / 'window.csv', window_months=WINDOW_MONTHS)
+        assert_same_lexicon(reference_lexicon(recent), tmp / 'window.csv', "window_months")
+
+        # 3-2) 오래된 달을 지우고 다음 달을 더 넣어서 윈도우를 한 칸 밀기
+        new_start = periods[1]
+        assert stats.drop_periods(new_start) == int((month(df_lex) < new_start).sum())
+        assert stats.periods()[0] == new_start
+        extra = make_docs(seed=1)
+        extra = lexicon_frame(extra[month(extra) == periods[0]].assign(
+            date=lambda d: pd.to_datetime(d['date']) + pd.DateOffset(years=1),
+            content=lambda d: '추가 ' + d['content']))
+        assert stats.add_documents(extra) == len(extra)
+        export(stats, tmp / 'shifted.csv')
+        shifted = pd.concat([df_lex[month(df_lex) >= new_start], extra])
+        assert_same_lexicon(reference_lexicon(shifted), tmp / 'shifted.csv', "drop_periods 후 추가")
+        stats.close()
+
+    print(f"[DONE] 저장소 total_lexicon.csv == build_lexicon (전체 / 월별 증분 / 윈도우 / drop_periods 후 추가), "
+          f"문서 {len(df_lex):,}개")
+    print(f"build_lexicon 전체 다시 계산     : {t_full:.2f}초")
+    print(f"저장소 한 달 추가 (평균)         : {np.mean(t_add):.3f}초")
+    print(f"저장소 -> total_lexicon.csv      : {t_export:.2f}초")
@@ -0,0 +1,120 @@
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(ROOT / "tone_score"))
+sys.path.append(str(ROOT / "preprocessing"))
+from tone_engine import PolarityLookup, compute_tone, count_hits_corpus
+from token_store import TokenCorpusWriter, open_corpus
+
+N_DOCS = 20000
+SENTS_PER_DOC = 15
+N_WORDS = 20000
+
+
+# --- 기존 구현 (비교 기준, tone.ipynb 셀 그대로) ---
+def calculate_tone(n_hawkish, n_dovish):
+    denominator = n_hawkish + n_dovish
+    if denominator == 0:
+        return 0
+    return (n_hawkish - n_dovish) / denominator
+
+
+def sentence_reference(df_tone, hawkish_set, dovish_set):
+    df_tone.loc[:, 'n_h_feat'] = df_tone['tokens'].apply(lambda x: len([w for w in x if w in hawkish_set]) if x is not None else 0)
+    df_tone.loc[:, 'n_d_feat'] = df_tone['tokens'].apply(lambda x: len([w for w in x if w in dovish_set]) if x is not None else 0)
+    df_tone.loc[:, 'tone_s'] = df_tone.apply(lambda row: calculate_tone(row['n_h_feat'], row['n_d_feat']), axis=1)
+    df_tone.loc[:, 'is_h_sent'] = df_tone['tone_s'] > 0
+    df_tone.loc[:, 'is_d_sent'] = df_tone['tone_s'] < 0
+    doc_level = df_tone.groupby(['doc_id', 'date']).agg(
+        n_h_sents=('is_h_sent', 'sum'),
+        n_d_sents=('is_d_sent', 'sum')
+    ).reset_index()
+    doc_level['tone_i'] = doc_level.apply(lambda row: calculate_tone(row['n_h_sents'], row['n_d_sents']), axis=1)
+    return doc_level
+
+
+def tone_reference(df, hawkish_set, dovish_set, date_mapping):
+    df_tone = df.copy()
+    df_tone = df_tone[df_tone['category'] != '의사록'].reset_index(drop=True).copy()
+    df_tone = df_tone[df_tone['category'] != 'press'].reset_index(drop=True).copy()
+    doc_level = sentence_reference(df_tone, hawkish_set, dovish_set)
+    daily_tone = doc_level.groupby('date')['tone_i'].mean().reset_index()
+    daily_tone.columns = ['date', 'z_newsbonds']
+    daily_tone = daily_tone.sort_values(by='date', ascending=True).reset_index(drop=True)
+    monthly_newsbonds = daily_tone.resample('MS', on='date')['z_newsbonds'].mean().reset_index()
+    monthly_newsbonds.columns = ['date', 'z_newsbonds']
+
+    df_meeting_tone = df[df['category'] == '의사록'].copy()
+    df_meeting_tone['date'] = pd.to_datetime(df_meeting_tone['date'])
+    df_meeting_tone = pd.merge(df_meeting_tone, date_mapping, left_on='date', right_on='회의 날짜', how='left')
+    df_meeting_tone['date'] = df_meeting_tone['업로드 날짜'].fillna(df_meeting_tone['date'])
+    df_meeting_tone = df_meeting_tone.drop(columns=['회의 날짜', '업로드 날짜'])
+    doc_meeting_level = sentence_reference(df_meeting_tone, hawkish_set, dovish_set)
+    monthly_minutes_tone = doc_meeting_level.resample('MS', on='date')['tone_i'].mean().reset_index()
+    monthly_minutes_tone.columns = ['date', 'z_min']
+
+    final_tone_df = pd.merge(monthly_newsbonds, monthly_minutes_tone, on='date', how='left')
+    final_tone_df['final_monthly_tone'] = np.where(
+        final_tone_df['z_min'].notnull(),
+        (final_tone_df['z_newsbonds'] * 2 + final_tone_df['z_min']) / 3,
+        final_tone_df['z_newsbonds']
+    )
+    return daily_tone, monthly_minutes_tone, final_tone_df
+
+
+def make_data(seed=0):
+    rng = np.random.default_rng(seed)
+    vocab = np.array([f"단어{i}/NNG" for i in range(N_WORDS)], dtype=object)
+    hawkish_set = set(vocab[rng.choice(N_WORDS, 800, replace=False)])
+    dovish_set = set(vocab[rng.choice(N_WORDS, 800, replace=False)]) - hawkish_set
+    categories = rng.choice(['news', 'bond', '의사록', 'press'], N_DOCS, p=[0.6, 0.3, 0.05, 0.05])
+    doc_dates = pd.Timestamp('2012-01-01') + pd.to_timedelta(rng.integers(0, 365 * 12, N_DOCS), unit='D')
+    doc_ids = np.repeat(np.arange(N_DOCS), SENTS_PER_DOC)
+    tokens = [list(vocab[rng.integers(0, N_WORDS, rng.integers(0, 25))]) for _ in doc_ids]
+    df = pd.DataFrame({'doc_id': doc_ids, 'date': doc_dates[doc_ids], 'tokens': tokens,
+                       'category': categories[doc_ids]})
+    meetings = np.unique(df.loc[df['category'] == '의사록', 'date'])
+    date_mapping = pd.DataFrame({'회의 날짜': meetings, '업로드 날짜': meetings + np.timedelta64(14, 'D')})
+    return df, hawkish_set, dovish_set, date_mapping
+
+
+if __name__ == "__main__":
+    df, hawkish_set, dovish_set, date_mapping = make_data()
+
+    t0 = time.perf_counter()
+    daily_ref, minutes_ref, final_ref = tone_reference(df, hawkish_set, dovish_set, date_mapping)
+    t_ref = time.perf_counter() - t0
+
+    lookup = PolarityLookup.from_sets(hawkish_set, dovish_set)
+    t0 = time.perf_counter()
+    result = compute_tone(df, lookup, date_mapping=date_mapping)
+    t_new = time.perf_counter() - t0
+
+    # 정수 인코딩 코퍼스(token_store)에서 바로 세는 경우
+    with tempfile.TemporaryDirectory() as corpus_dir:
+        writer = TokenCorpusWriter(corpus_dir, meta_columns=['doc_id', 'date', 'category'])
+        writer.write(df)
+        writer.close()
+        corpus = open_corpus(corpus_dir)
+        t0 = time.perf_counter()
+        meta = corpus.meta()
+        result_corpus = compute_tone(meta, lookup, date_mapping=date_mapping, counts=count_hits_corpus(corpus, lookup))
+        t_corpus = time.perf_counter() - t0
+        del corpus
+
+    for ref, new, new_corpus in ((daily_ref, result['daily'], result_corpus['daily']),
+                                 (minutes_ref, result['monthly_minutes'], result_corpus['monthly_minutes']),
+                                 (final_ref, result['final'], result_corpus['final'])):
+        assert ref.to_csv(index=False) == new.to_csv(index=False), "CSV 출력이 다름"
+        assert ref.to_csv(index=False) == new_corpus.to_csv(index=False), "CSV 출력이 다름 (코퍼스)"
+
+    print(f"[DONE] 결과 일치 (문장 {len(df):,}개, 일별 {len(daily_ref):,}일, 월별 {len(final_ref):,}개월)")
+    print(f"기존(apply / 리스트 컴프리헨션) : {t_ref:.2f}초")
+    print(f"tone_engine                    : {t_new:.2f}초 ({t_ref / t_new:.1f}배)")
+    print(f"tone_engine (token_store 코퍼스) : {t_corpus:.2f}초 ({t_ref / t_corpus:.1f}배)")
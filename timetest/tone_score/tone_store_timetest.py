@@ -0,0 +1,85 @@
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "tone_score"))
+sys.path.append(str(Path(__file__).resolve().parent))
+from tone_engine import PolarityLookup, compute_tone
+from tone_engine_timetest import make_data
+from tone_store import ToneStore
+
+N_REVISED = 500
+N_DELETED = 500
+
+
+def assert_close(expected: pd.DataFrame, got: pd.DataFrame, name: str):
+    assert list(expected.columns) == list(got.columns), name
+    assert len(expected) == len(got), f"{name}: 행 수 다름 {len(expected)} != {len(got)}"
+    assert (expected['date'].to_numpy() == got['date'].to_numpy()).all(), f"{name}: 날짜 다름"
+    for col in expected.columns[1:]:
+        # 평균의 합산 순서만 다름 (pandas 보정 합 vs math.fsum) -> 마지막 자리 반올림 차이까지만 허용
+        np.testing.assert_allclose(got[col].to_numpy(float), expected[col].to_numpy(float), rtol=1e-12, atol=1e-15,
+                                   err_msg=f"{name}.{col}")
+
+
+if __name__ == "__main__":
+    df, hawkish_set, dovish_set, date_mapping = make_data()
+    lookup = PolarityLookup.from_sets(hawkish_set, dovish_set)
+    rng = np.random.default_rng(1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ToneStore(Path(tmp) / 'tone_store.sqlite')
+
+        # 1) 한 달 치씩 넣기
+        t0 = time.perf_counter()
+        for _, batch in df.groupby(df['date'].dt.to_period('M')):
+            store.add_sentences(batch, lookup, date_mapping=date_mapping)
+        t_build = time.perf_counter() - t0
+
+        # 2) 일부 문서 수정 (토큰 교체 / category 변경) + 일부 삭제
+        doc_ids = df['doc_id'].unique()
+        revised = rng.choice(doc_ids, N_REVISED, replace=False)
+        deleted = rng.choice(np.setdiff1d(doc_ids, revised), N_DELETED, replace=False)
+        is_revised = df['doc_id'].isin(revised)
+        df.loc[is_revised, 'tokens'] = pd.Series(df.loc[is_revised, 'tokens'].map(lambda t: t[::-1][:len(t) // 2]))
+        moved = df['doc_id'].isin(revised[:N_REVISED // 5])
+        df.loc[moved, 'category'] = df.loc[moved, 'category'].map({'news': 'press', 'bond': '의사록',
+                                                                   '의사록': 'news', 'press': 'bond'})
+        store.add_sentences(df[is_revised], lookup, date_mapping=date_mapping)
+        store.delete_docs(deleted)
+        df = df[~df['doc_id'].isin(deleted)]
+
+        t0 = time.perf_counter()
+        expected = compute_tone(df, lookup, date_mapping=date_mapping)
+        t_full = time.perf_counter() - t0
+
+        assert_close(expected['daily'], store.daily(), 'daily')
+        assert_close(expected['monthly_minutes'], store.monthly_minutes(), 'monthly_minutes')
+        assert_close(expected['final'], store.final(), 'final')
+
+        # 3) 하루 치 새 뉴스 반영 + 지수 조회
+        last_day = df['date'].max()
+        new_day = df[df['date'] == last_day].assign(doc_id=lambda x: x['doc_id'] + 10 ** 6,
+                                                    date=last_day + pd.Timedelta(days=1))
+        t0 = time.perf_counter()
+        store.add_sentences(new_day, lookup, date_mapping=date_mapping)
+        t_add = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        daily, final = store.daily(), store.final()
+        t_query = time.perf_counter() - t0
+
+        df = pd.concat([df, new_day], ignore_index=True)
+        expected = compute_tone(df, lookup, date_mapping=date_mapping)
+        assert_close(expected['daily'], daily, 'daily (추가 후)')
+        assert_close(expected['final'], final, 'final (추가 후)')
+        store.close()
+
+    print(f"[DONE] 결과 일치 (문장 {len(df):,}개, 수정 {N_REVISED}개 / 삭제 {N_DELETED}개 문서)")
+    print(f"tone_store 전체 적재 (월별 {df['date'].dt.to_period('M').nunique()}번) : {t_build:.2f}초")
+    print(f"compute_tone 전체 재계산            : {t_full:.2f}초")
+    print(f"tone_store 하루 치 추가 ({len(new_day):,}문장)     : {t_add * 1000:.1f}ms")
+    print(f"tone_store daily + final 조회        : {t_query * 1000:.1f}ms")
@@ -0,0 +1,57 @@
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "tone_score"))
+sys.path.append(str(Path(__file__).resolve().parent))
+from tone_engine import PolarityLookup, compute_tone
+from tone_engine_timetest import N_WORDS, make_data
+from tone_sweep import candidate_sets, prepare_lexicon, sweep
+
+THRESHOLDS = np.round(np.arange(1.05, 2.55, 0.05), 2)  # 30개 x 변형 3개 = candidate 90개
+BAD_WORD_RATE = 0.02
+
+
+def make_lexicon(seed=0):
+    """연속 점수 사전 (log 점수가 0 근처에 몰린 분포) + 일부 단어는 뉴스 템플릿 단어"""
+    rng = np.random.default_rng(seed)
+    words = [f"단어{i}/NNG" for i in range(N_WORDS)]
+    words = [f"기자{w}" if rng.random() < BAD_WORD_RATE else w for w in words]
+    return pd.DataFrame({'polarity_score': 10 ** rng.normal(0, 0.15, N_WORDS)}, index=pd.Index(words, name='word'))
+
+
+if __name__ == "__main__":
+    df, _, _, date_mapping = make_data()
+    lexicon = make_lexicon()
+    # make_data 의 토큰 이름에 맞춤
+    rename = {f"단어{i}/NNG": w for i, w in enumerate(lexicon.index)}
+    df['tokens'] = [[rename[w] for w in tokens] for tokens in df['tokens']]
+
+    t0 = time.perf_counter()
+    table = sweep(df, lexicon, THRESHOLDS, date_mapping=date_mapping)
+    t_sweep = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    sweep(df, lexicon, [1.3], {'base': {'drop_bad_words': False, 'iqr_k': None}}, date_mapping=date_mapping)
+    t_sweep_one = time.perf_counter() - t0
+
+    # 기존 방식: candidate 마다 사전을 만들고 tone 전체 재계산 (비교는 몇 개만)
+    lex = prepare_lexicon(lexicon)
+    candidates = candidate_sets(lex, THRESHOLDS)
+    check = candidates[::15]
+    t0 = time.perf_counter()
+    for c in check:
+        labels = pd.Series(np.where(c['hawkish'], 'hawkish', np.where(c['dovish'], 'dovish', '')), index=lex.index)
+        result = compute_tone(df, PolarityLookup(labels[labels != ''].to_frame('label')), date_mapping=date_mapping)
+        got = table[table['candidate'] == c['candidate']][['date', 'z_newsbonds', 'z_min', 'final_monthly_tone']]
+        expected = result['final']
+        assert got.reset_index(drop=True).to_csv(index=False) == expected.to_csv(index=False), c['candidate']
+    t_one = (time.perf_counter() - t0) / len(check)
+
+    print(f"[DONE] {len(check)}개 candidate 가 tone_engine 결과와 일치")
+    print(f"tone_engine candidate 1개        : {t_one:.2f}초 (x{len(candidates)} = {t_one * len(candidates):.1f}초)")
+    print(f"tone_sweep candidate 1개         : {t_sweep_one:.2f}초")
+    print(f"tone_sweep candidate {len(candidates)}개 한 번에 : {t_sweep:.2f}초")
@@ -0,0 +1,208 @@
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Naive Bayes bagging 으로 hawkish/dovish 단어 사전 만들기 (lexicon.ipynb 의 NBC 학습 셀을 대체).
+# 노트북은 매 라운드 df.sample(frac=0.9) 에 CountVectorizer 를 새로 fit 하고 MultinomialNB 를 학습했는데,
+# 여기서는
+#   - 문서-단어 행렬(DTM)을 전체 문서로 한 번만 만들고
+#   - 라운드별 표본은 같은 random_state 로 뽑은 "행 번호"로만 표현해서
+#   - 라운드 묶음의 클래스별 단어 빈도를 (표본 지시 행렬 @ DTM) 희소 행렬 곱 한 번으로 계산
+# 한다. MultinomialNB(alpha=1) 의 확률 계산을 그대로 따르므로 score_i / polarity_score 는 노트북과 같다.
+#   p(w|c) = (count_c(w) + alpha) / (total_c + alpha * V_i)   (V_i: 그 라운드 표본에 나온 단어 수)
+#   score_i(w) = p(w|hawkish) / (p(w|dovish) + 1e-10)          (표본에 없는 단어는 NaN)
+#   polarity_score = score_i 의 평균 (NaN 제외)
+
+INPUT_PATH = '../db/tone/df_for_tone_260107.parquet'
+OUTPUT_PATH = '../db/lexicon/total_lexicon.csv'
+FULL_LEXICON_PATH = '../db/lexicon/full_lexicon.csv'  # threshold 적용 전 전체 단어 polarity_score (tone_sweep 입력)
+
+N_ROUNDS = 30
+SAMPLE_FRAC = 0.9
+THRESHOLD = 1.3
+ALPHA = 1.0
+EPS = 1e-10
+ROUNDS_PER_TASK = 8  # 작업 하나가 한 번에 계산하는 라운드 수 (라운드 x 단어 수 만큼 dense 배열을 만듦)
+
+_worker = {}
+
+
+def lexicon_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """df_for_tone(df_study) -> 사전 학습용 df_lex (rate_1m 결측 / 빈 tokens / neutral 제외)"""
+    df = df.dropna(subset=['rate_1m'])
+    df = df[df['tokens'].map(len) > 0]
+    return df[df['label'] != 'neutral']
+
+
+def build_dtm(token_lists):
+    """
+    토큰 리스트들 -> (CSR 행렬 문서 x 단어, 단어 배열).
+    열 순서는 CountVectorizer 와 같이 단어 사전순, 같은 문서에 여러 번 나온 토큰은 그 횟수만큼 셈
+    """
+    lengths = np.fromiter((len(t) for t in token_lists), dtype=np.int64, count=len(token_lists))
+    flat = [w for tokens in token_lists for w in tokens]
+    codes, words = pd.factorize(np.asarray(flat, dtype=object), sort=True)
+    rows = np.repeat(np.arange(len(lengths)), lengths)
+    dtm = sparse.csr_matrix((np.ones(len(codes)), (rows, codes)), shape=(len(lengths), len(words)))
+    dtm.sum_duplicates()
+    return dtm, np.asarray(words, dtype=object)
+
+
+def bootstrap_rows(n_docs: int, seed: int, frac: float = SAMPLE_FRAC) -> np.ndarray:
+    """df.sample(frac=frac, random_state=seed) 가 고르는 행 위치 (노트북과 같은 표본)"""
+    return pd.RangeIndex(n_docs).to_series().sample(frac=frac, random_state=seed).to_numpy()
+
+
+def polarity_from_counts(count_h, count_d, alpha: float = ALPHA, eps: float = EPS) -> np.ndarray:
+    """
+    클래스별 단어 빈도 -> hawkish/dovish 확률비. 1차원(라운드 하나) 또는 2차원(라운드 x 단어) 배열.
+    두 클래스 모두 0 인 단어는 그 라운드 vocabulary 에 없는 것으로 보고 NaN
+    """
+    count_h = np.asarray(count_h, dtype=np.float64)
+    count_d = np.asarray(count_d, dtype=np.float64)
+    present = (count_h + count_d) > 0
+    n_words = present.sum(axis=-1, keepdims=True)
+    p_h = (count_h + alpha) / (count_h.sum(axis=-1, keepdims=True) + alpha * n_words)
+    p_d = (count_d + alpha) / (count_d.sum(axis=-1, keepdims=True) + alpha * n_words)
+    ratio = p_h / (p_d + eps)
+    ratio[~present] = np.nan
+    return ratio
+
+
+def _init_worker(dtm, is_hawkish, frac, alpha, keep_rounds):
+    _worker.update(dtm=dtm, is_hawkish=is_hawkish, frac=frac, alpha=alpha, keep_rounds=keep_rounds)
+
+
+def _selection(rows_per_round, n_docs):
+    """라운드별 행 번호 -> (라운드 x 문서) 0/1 희소 행렬"""
+    indptr = np.zeros(len(rows_per_round) + 1, dtype=np.int64)
+    np.cumsum([len(r) for r in rows_per_round], out=indptr[1:])
+    indices = np.concatenate(rows_per_round) if rows_per_round else np.zeros(0, dtype=np.int64)
+    return sparse.csr_matrix((np.ones(len(indices)), indices, indptr), shape=(len(rows_per_round), n_docs))
+
+
+def score_rounds(seeds):
+    """
+    (프로세스 풀에서 실행) 라운드 묶음 -> (score 합, 등장 라운드 수, 처음 등장한 라운드, 라운드별 score)
+    라운드별 score 는 keep_rounds 일 때만 [(seed, 단어 위치, 값), ...], 아니면 None
+    """
+    dtm, is_hawkish = _worker['dtm'], _worker['is_hawkish']
+    n_docs, n_words = dtm.shape
+    samples = [bootstrap_rows(n_docs, seed, _worker['frac']) for seed in seeds]
+    hawkish = _selection([r[is_hawkish[r]] for r in samples], n_docs)
+    dovish = _selection([r[~is_hawkish[r]] for r in samples], n_docs)
+    scores = polarity_from_counts((hawkish @ dtm).toarray(), (dovish @ dtm).toarray(), _worker['alpha'])
+
+    present = ~np.isnan(scores)
+    first = np.full(n_words, np.iinfo(np.int64).max, dtype=np.int64)
+    for seed, mask in zip(reversed(seeds), present[::-1]):
+        first[mask] = seed
+    per_round = None
+    if _worker['keep_rounds']:
+        per_round = []
+        for seed, row, mask in zip(seeds, scores, present):
+            idx = np.flatnonzero(mask)
+            per_round.append((seed, idx, row[idx]))
+    return np.nansum(scores, axis=0), present.sum(axis=0), first, per_round
+
+
+def build_lexicon(df: pd.DataFrame, n_rounds: int = N_ROUNDS, frac: float = SAMPLE_FRAC, alpha: float = ALPHA,
+                  workers: int = 1, rounds_per_task: int = ROUNDS_PER_TASK, keep_rounds: bool = True,
+                  token_col: str = 'tokens', label_col: str = 'label') -> pd.DataFrame:
+    """
+    df_lex(tokens, label) -> final_lexicon (index: word / score_0 ... score_{n-1} / polarity_score).
+    - 라운드 i 의 표본은 노트북과 같이 df.sample(frac, random_state=i)
+    - 단어 순서도 노트북의 pd.concat 결과와 같음 (처음 나온 라운드 순, 같은 라운드 안에서는 사전순)
+    - workers > 1 이면 라운드 묶음을 프로세스 풀에 나눠서 계산
+    - keep_rounds=False 면 score_i 컬럼 없이 polarity_score 만 (라운드 수가 많을 때 메모리 절약)
+    """
+    labels = df[label_col].to_numpy()
+    if not {'hawkish', 'dovish'} <= set(labels):
+        raise ValueError(f"{label_col} 에 hawkish / dovish 가 모두 있어야 합니다: {sorted(set(labels))}")
+    dtm, words = build_dtm(df[token_col].tolist())
+    is_hawkish = labels == 'hawkish'
+    print(f"[INFO] DTM {dtm.shape[0]:,} 문서 x {dtm.shape[1]:,} 단어 / {n_rounds} 라운드")
+
+    tasks = [list(range(s, min(s + rounds_per_task, n_rounds))) for s in range(0, n_rounds, rounds_per_task)]
+    init_args = (dtm, is_hawkish, frac, alpha, keep_rounds)
+    if workers == 1 or len(tasks) == 1:
+        _init_worker(*init_args)
+        results = map(score_rounds, tasks)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init_args)
+        results = pool.map(score_rounds, tasks)
+
+    total = np.zeros(len(words))
+    n_present = np.zeros(len(words), dtype=np.int64)
+    first = np.full(len(words), np.iinfo(np.int64).max, dtype=np.int64)
+    per_round = []
+    try:
+        for seeds, (total_i, n_present_i, first_i, per_round_i) in zip(tasks, results):
+            total += total_i
+            n_present += n_present_i
+            np.minimum(first, first_i, out=first)
+            if keep_rounds:
+                per_round.extend(per_round_i)
+            print(f"[INFO] {seeds[-1] + 1}/{n_rounds} 라운드 완료")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    seen = np.flatnonzero(n_present > 0)
+    order = seen[np.lexsort((seen, first[seen]))]
+    lexicon = pd.DataFrame(index=pd.Index(words[order], name='word'))
+    if keep_rounds:
+        position = np.full(len(words), -1, dtype=np.int64)
+        position[order] = np.arange(len(order))
+        columns = {}
+        for seed, idx, values in per_round:
+            col = np.full(len(order), np.nan)
+            col[position[idx]] = values
+            columns[f'score_{seed}'] = col
+        lexicon = pd.DataFrame(columns, index=lexicon.index)
+    lexicon['polarity_score'] = total[order] / n_present[order]
+    return lexicon
+
+
+def split_lexicon(final_lexicon: pd.DataFrame, threshold: float = THRESHOLD) -> pd.DataFrame:
+    """polarity_score > threshold -> hawkish, < 1/threshold -> dovish. hawkish 먼저, 그다음 dovish (total_lexicon.csv)"""
+    hawkish = final_lexicon[final_lexicon['polarity_score'] > threshold].assign(label='hawkish')
+    dovish = final_lexicon[final_lexicon['polarity_score'] < (1 / threshold)].assign(label='dovish')
+    return pd.concat([hawkish, dovish])
+
+
+def main(input_path=INPUT_PATH, output_path=OUTPUT_PATH, n_rounds=N_ROUNDS, threshold=THRESHOLD,
+         workers=None, keep_rounds=True):
+    df = pd.read_parquet(input_path)
+    df_lex = lexicon_frame(df)
+    print(f"[INFO] 사전 학습 문서 {len(df_lex):,}개 ({df_lex['label'].value_counts().to_dict()})")
+
+    final_lexicon = build_lexicon(df_lex, n_rounds=n_rounds, workers=workers or os.cpu_count(),
+                                  keep_rounds=keep_rounds)
+    full_path = Path(output_path).with_name(Path(FULL_LEXICON_PATH).name)
+    full_path.parent.mkdir(parents=True, exist_ok=True)
+    final_lexicon[['polarity_score']].to_csv(full_path, encoding='utf-8-sig', index=True)
+    master_lexicon = split_lexicon(final_lexicon, threshold)
+    n_hawkish = int((master_lexicon['label'] == 'hawkish').sum())
+    print(f"hawkish 단어: {n_hawkish}개 발견")
+    print(f"dovish 단어: {len(master_lexicon) - n_hawkish}개 발견")
+
+    master_lexicon.to_csv(output_path, encoding='utf-8-sig', index=True)
+    print(f"✨ 총 {len(master_lexicon)}개의 단어가 담긴 마스터 사전이 저장되었습니다! -> {output_path}")
+    return master_lexicon
+
+
+# 사용법: python lexicon_builder.py [입력 parquet] [출력 csv] [라운드 수] [threshold]
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(args[0] if len(args) > 0 else INPUT_PATH,
+         args[1] if len(args) > 1 else OUTPUT_PATH,
+         int(args[2]) if len(args) > 2 else N_ROUNDS,
+         float(args[3]) if len(args) > 3 else THRESHOLD,
+         keep_rounds=int(args[2]) <= 100 if len(args) > 2 else True)
@@ -0,0 +1,305 @@
+import hashlib
+import sqlite3
+import sys
+from datetime import timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from lexicon_builder import (ALPHA, SAMPLE_FRAC, THRESHOLD, build_dtm, lexicon_frame, polarity_from_counts,
+                             split_lexicon)
+
+# 사전(total_lexicon.csv)을 다시 만들 때 필요한 충분통계량 저장소.
+# NB 확률비는 "라운드별 클래스별 단어 빈도"만 있으면 계산되므로 문서를 다시 읽지 않고 빈도만 SQLite 에 누적한다.
+#   counts(period, seed, label, word_id, count)
+#     - seed = -1 : 그 달(period)의 클래스별 전체 빈도
+#     - seed = s  : 라운드 s 표본에서 "빠진" 문서들의 빈도 (라운드 s 빈도 = 전체 - 빠진 것)
+#   docs(doc_key, period, label) : 이미 반영한 문서 (같은 문서를 두 번 더하지 않도록)
+# 라운드 표본은 df.sample 대신 문서 키 해시로 정한다 (문서마다 라운드 s 에 들어갈지가 다른 문서와 무관하게 고정).
+# 그래서 새 문서가 들어와도 기존 라운드 구성은 그대로이고, 빈도에 더하기만 하면 됨.
+# 표본 방식이 다르므로 lexicon_builder(df.sample 재현)와 score_i 값이 정확히 같지는 않다.
+
+STATS_PATH = '../db/lexicon/lexicon_stats.sqlite'
+INPUT_PATH = '../db/tone/df_for_tone_260107.parquet'
+RATE_PATH = '../db/rates/call_rate.csv'
+OUTPUT_PATH = '../db/lexicon/total_lexicon.csv'
+
+N_SEEDS = 30
+LABEL_IDS = {'dovish': 0, 'hawkish': 1}
+KEY_COLUMNS = ('date', 'category', 'source', 'content')
+SEEDS_PER_CHUNK = 32  # 사전 계산 시 한 번에 dense 로 만드는 라운드 수
+
+_SQL_CHUNK = 500
+_MASK64 = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+# ---------- 라벨링 (lexicon.ipynb 의 콜금리 merge_asof 셀) ----------
+def load_rates(path=RATE_PATH) -> pd.DataFrame:
+    rate_df = pd.read_csv(path)
+    rate_df['date'] = pd.to_datetime(rate_df['date'].str.replace('.', '-'))
+    return rate_df.sort_values('date')
+
+
+def label_documents(df: pd.DataFrame, rate_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    문서 날짜 기준 콜금리(rate_today)와 30일 뒤 콜금리(rate_1m)를 붙이고 diff 로 라벨링 (df_for_tone 과 같은 형식).
+    30일 뒤 금리가 아직 없으면 rate_1m 이 NaN -> 사전 학습에서 빠지고, 다음 업데이트 때 다시 들어옴
+    """
+    df_study = df.copy()
+    df_study['date'] = pd.to_datetime(df_study['date'])
+    df_study = df_study.sort_values('date')
+    df_study['date_1m'] = df_study['date'] + timedelta(days=30)
+
+    df_study = pd.merge_asof(df_study, rate_df.rename(columns={'call_rate': 'rate_today'}),
+                             on='date', direction='backward')
+    df_study = pd.merge_asof(df_study, rate_df.rename(columns={'date': 'date_1m', 'call_rate': 'rate_1m'}),
+                             on='date_1m', direction='forward')
+
+    df_study['diff'] = df_study['rate_1m'] - df_study['rate_today']
+    df_study['label'] = np.where(df_study['diff'] > 0.03, 'hawkish',
+                                 np.where(df_study['diff'] < -0.03, 'dovish', 'neutral'))
+    return df_study[df_study['tokens'].map(len) > 0]
+
+
+# ---------- 문서 키 / 해시 표본 ----------
+def doc_keys(df: pd.DataFrame, key_cols=None) -> np.ndarray:
+    """
+    문서 식별 키 (sha1 hex). key_cols 값 + 같은 값이 몇 번째로 나왔는지(cumcount).
+    같은 달을 다시 넣어도 같은 키가 나와서 중복 반영되지 않음 (그래서 하루치 문서는 한 번에 넣을 것)
+    """
+    cols = [c for c in (key_cols or KEY_COLUMNS) if c in df.columns] or ['tokens']
+    text = df[cols[0]].astype(str)
+    for c in cols[1:]:
+        text = text + '\x1f' + df[c].astype(str)
+    nth = text.groupby(text).cumcount().astype(str)
+    return np.array([hashlib.sha1(f"{t}\x1e{n}".encode('utf-8')).hexdigest() for t, n in zip(text, nth)],
+                    dtype=object)
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    with np.errstate(over='ignore'):
+        x = (x + np.uint64(0x9E3779B97F4A7C15)) & _MASK64
+        x = ((x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)) & _MASK64
+        x = ((x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)) & _MASK64
+    return x ^ (x >> np.uint64(31))
+
+
+def in_sample(keys, n_seeds: int, frac: float = SAMPLE_FRAC) -> np.ndarray:
+    """(문서 x 라운드) bool. 문서 키와 라운드 번호만으로 정해지는 표본 포함 여부 (포함 확률 frac)"""
+    base = np.array([int(k[:16], 16) for k in keys], dtype=np.uint64)
+    seeds = np.arange(n_seeds, dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        mixed = _splitmix64(base[:, None] ^ _splitmix64(seeds)[None, :])
+    return (mixed >> np.uint64(11)).astype(np.float64) / float(1 << 53) < frac
+
+
+# ---------- 저장소 ----------
+class LexiconStats:
+    def __init__(self, path=STATS_PATH, n_seeds: int = N_SEEDS, frac: float = SAMPLE_FRAC):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=60)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS words (word_id INTEGER PRIMARY KEY, word TEXT NOT NULL UNIQUE);
+            CREATE TABLE IF NOT EXISTS docs (doc_key TEXT PRIMARY KEY, period TEXT NOT NULL, label INTEGER NOT NULL);
+            CREATE TABLE IF NOT EXISTS counts (
+                period TEXT NOT NULL, seed INTEGER NOT NULL, label INTEGER NOT NULL,
+                word_id INTEGER NOT NULL, count INTEGER NOT NULL,
+                PRIMARY KEY (period, seed, label, word_id)
+            ) WITHOUT ROWID;
+        """)
+        self.n_seeds, self.frac = self._check_meta(n_seeds, frac)
+        self.words = [w for _, w in self._conn.execute("SELECT word_id, word FROM words ORDER BY word_id")]
+        self.word_ids = {w: i for i, w in enumerate(self.words)}
+
+    def _check_meta(self, n_seeds, frac):
+        """라운드 수 / 표본 비율은 저장소를 만들 때 고정 (바꾸려면 새 파일로 다시 쌓아야 함)"""
+        meta = dict(self._conn.execute("SELECT key, value FROM meta"))
+        if not meta:
+            with self._conn:
+                self._conn.executemany("INSERT INTO meta VALUES (?, ?)",
+                                       [('n_seeds', str(n_seeds)), ('frac', repr(frac))])
+            return n_seeds, frac
+        stored = int(meta['n_seeds']), float(meta['frac'])
+        if stored != (n_seeds, frac):
+            raise ValueError(f"{self.path} 는 n_seeds={stored[0]}, frac={stored[1]} 로 만들어졌습니다 "
+                             f"(요청: n_seeds={n_seeds}, frac={frac})")
+        return stored
+
+    def _known(self, keys) -> np.ndarray:
+        found = set()
+        for i in range(0, len(keys), _SQL_CHUNK):
+            part = list(keys[i:i + _SQL_CHUNK])
+            found.update(k for (k,) in self._conn.execute(
+                f"SELECT doc_key FROM docs WHERE doc_key IN ({','.join('?' * len(part))})", part))
+        return np.fromiter((k in found for k in keys), dtype=bool, count=len(keys))
+
+    def _ids(self, words) -> np.ndarray:
+        """단어 -> word_id (새 단어는 뒤에 추가, id 는 바뀌지 않음)"""
+        new = [w for w in words if w not in self.word_ids]
+        for w in new:
+            self.word_ids[w] = len(self.words)
+            self.words.append(w)
+        self._conn.executemany("INSERT INTO words VALUES (?, ?)", [(self.word_ids[w], w) for w in new])
+        return np.array([self.word_ids[w] for w in words], dtype=np.int64)
+
+    def add_documents(self, df_lex: pd.DataFrame, key_cols=None) -> int:
+        """
+        라벨링된 문서(date, tokens, label: hawkish/dovish)의 빈도를 저장소에 더함. 반환: 새로 반영한 문서 수.
+        neutral / rate_1m 결측은 lexicon_frame 으로 먼저 걸러서 넣을 것
+        """
+        keys = doc_keys(df_lex, key_cols)
+        new = ~self._known(keys)
+        df, keys = df_lex[new], keys[new]
+        if not len(df):
+            return 0
+
+        dtm, words = build_dtm(df['tokens'].tolist())
+        labels = df['label'].map(LABEL_IDS).to_numpy()
+        periods = pd.to_datetime(df['date']).dt.strftime('%Y-%m').to_numpy()
+        excluded = ~in_sample(keys, self.n_seeds, self.frac)
+
+        try:
+            self._write(dtm, words, keys, labels, periods, excluded)
+        except Exception:
+            # 롤백된 새 단어를 메모리에서도 되돌림
+            self.words = [w for _, w in self._conn.execute("SELECT word_id, word FROM words ORDER BY word_id")]
+            self.word_ids = {w: i for i, w in enumerate(self.words)}
+            raise
+        return len(df)
+
+    def _write(self, dtm, words, keys, labels, periods, excluded):
+        with self._conn:
+            word_ids = self._ids(words)
+            rows = []
+            groups = pd.DataFrame({'period': periods, 'label': labels}).groupby(['period', 'label']).indices
+            for (period, label), idx in groups.items():
+                sub = dtm[idx]
+                total = np.asarray(sub.sum(axis=0)).ravel()
+                nz = np.flatnonzero(total)
+                rows += zip([period] * len(nz), [-1] * len(nz), [int(label)] * len(nz),
+                            word_ids[nz].tolist(), total[nz].astype(np.int64).tolist())
+                out = (sparse.csr_matrix(excluded[idx].T.astype(np.float64)) @ sub).tocoo()
+                rows += zip([period] * out.nnz, out.row.tolist(), [int(label)] * out.nnz,
+                            word_ids[out.col].tolist(), out.data.astype(np.int64).tolist())
+            self._conn.executemany(
+                "INSERT INTO counts VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(period, seed, label, word_id) DO UPDATE SET count = count + excluded.count", rows)
+            self._conn.executemany("INSERT INTO docs VALUES (?, ?, ?)",
+                                   zip(keys.tolist(), periods.tolist(), labels.tolist()))
+
+    def periods(self) -> list:
+        return [p for (p,) in self._conn.execute("SELECT DISTINCT period FROM docs ORDER BY period")]
+
+    def drop_periods(self, before: str) -> int:
+        """before('YYYY-MM') 이전 달의 빈도/문서를 저장소에서 뺌. 반환: 지운 문서 수"""
+        with self._conn:
+            self._conn.execute("DELETE FROM counts WHERE period < ?", (before,))
+            return self._conn.execute("DELETE FROM docs WHERE period < ?", (before,)).rowcount
+
+    def class_counts(self, start: str = None, end: str = None):
+        """
+        [start, end] 기간('YYYY-MM')을 합친 라운드별 클래스 빈도 -> (hawkish, dovish), 각각 (라운드 x 단어) 배열
+        """
+        where, params = [], []
+        if start:
+            where.append("period >= ?")
+            params.append(start)
+        if end:
+            where.append("period <= ?")
+            params.append(end)
+        sql = "SELECT seed, label, word_id, count FROM counts"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        data = np.array(self._conn.execute(sql, params).fetchall(), dtype=np.int64).reshape(-1, 4)
+
+        n_words = len(self.words)
+        flat = ((data[:, 0] + 1) * 2 + data[:, 1]) * n_words + data[:, 2]  # seed -1 -> 행 0
+        acc = np.bincount(flat, weights=data[:, 3], minlength=(self.n_seeds + 1) * 2 * n_words)
+        acc = acc.reshape(self.n_seeds + 1, 2, n_words)
+        full, out = acc[0], acc[1:]
+        h, d = LABEL_IDS['hawkish'], LABEL_IDS['dovish']
+        return full[h] - out[:, h], full[d] - out[:, d]
+
+    def build_lexicon(self, start: str = None, end: str = None, alpha: float = ALPHA,
+                      keep_rounds: bool = True) -> pd.DataFrame:
+        """저장된 빈도로 final_lexicon (lexicon_builder.build_lexicon 과 같은 형식)"""
+        count_h, count_d = self.class_counts(start, end)
+        n_words = len(self.words)
+        total = np.zeros(n_words)
+        n_present = np.zeros(n_words, dtype=np.int64)
+        first = np.full(n_words, self.n_seeds, dtype=np.int64)
+        columns = {}
+        for s in range(0, self.n_seeds, SEEDS_PER_CHUNK):
+            scores = polarity_from_counts(count_h[s:s + SEEDS_PER_CHUNK], count_d[s:s + SEEDS_PER_CHUNK], alpha)
+            present = ~np.isnan(scores)
+            total += np.nansum(scores, axis=0)
+            n_present += present.sum(axis=0)
+            hit = present.any(axis=0)
+            first = np.where(hit & (first == self.n_seeds), s + present.argmax(axis=0), first)
+            if keep_rounds:
+                columns.update((f'score_{s + j}', row) for j, row in enumerate(scores))
+
+        # 처음 나온 라운드 순, 같은 라운드 안에서는 사전순 (lexicon_builder 와 같은 규칙)
+        words = np.array(self.words, dtype=object)
+        seen = np.flatnonzero(n_present > 0)
+        order = seen[np.lexsort((words[seen], first[seen]))]
+        lexicon = pd.DataFrame({c: v[order] for c, v in columns.items()}, index=pd.Index(words[order], name='word'))
+        lexicon['polarity_score'] = total[order] / n_present[order]
+        return lexicon
+
+    def close(self):
+        self._conn.close()
+
+
+def window_range(stats: LexiconStats, months: int, end: str = None):
+    """최근 months 개월 구간 (start, end). end 를 주지 않으면 저장소의 마지막 달"""
+    end = end or (stats.periods() or [None])[-1]
+    if end is None:
+        return None, None
+    start = (pd.Period(end, freq='M') - (months - 1)).strftime('%Y-%m')
+    return start, end
+
+
+def update(df: pd.DataFrame, stats: LexiconStats, rate_df: pd.DataFrame = None) -> int:
+    """새 문서(date, tokens, ...)를 라벨링해서 저장소에 추가. 이미 label/rate_1m 이 있으면 rate_df 없이도 됨"""
+    if rate_df is not None:
+        df = label_documents(df, rate_df)
+    added = stats.add_documents(lexicon_frame(df))
+    print(f"[INFO] 새 문서 {added:,}개 반영 (기간 {stats.periods()[:1]} ~ {stats.periods()[-1:]})")
+    return added
+
+
+def export(stats: LexiconStats, output_path=OUTPUT_PATH, threshold: float = THRESHOLD, window_months: int = None,
+           end: str = None, keep_rounds: bool = True) -> pd.DataFrame:
+    """저장소 -> total_lexicon.csv. window_months 를 주면 최근 그 개월 수만 사용 (슬라이딩 윈도우)"""
+    start, end = window_range(stats, window_months, end) if window_months else (None, end)
+    master_lexicon = split_lexicon(stats.build_lexicon(start, end, keep_rounds=keep_rounds), threshold)
+    n_hawkish = int((master_lexicon['label'] == 'hawkish').sum())
+    print(f"hawkish 단어: {n_hawkish}개 / dovish 단어: {len(master_lexicon) - n_hawkish}개 "
+          f"(기간 {start or '처음'} ~ {end or '끝'})")
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    master_lexicon.to_csv(output_path, encoding='utf-8-sig', index=True)
+    print(f"✨ 총 {len(master_lexicon)}개의 단어가 담긴 마스터 사전이 저장되었습니다! -> {output_path}")
+    return master_lexicon
+
+
+# 사용법:
+#   python lexicon_stats.py add [tokens parquet (date, tokens, ...)] [call_rate.csv]
+#   python lexicon_stats.py export [출력 csv] [최근 개월 수]
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else 'export'
+    stats = LexiconStats()
+    if command == 'add':
+        df = pd.read_parquet(sys.argv[2] if len(sys.argv) > 2 else INPUT_PATH)
+        has_label = {'label', 'rate_1m'} <= set(df.columns)
+        update(df, stats, None if has_label else load_rates(sys.argv[3] if len(sys.argv) > 3 else RATE_PATH))
+    else:
+        export(stats, sys.argv[2] if len(sys.argv) > 2 else OUTPUT_PATH,
+               window_months=int(sys.argv[3]) if len(sys.argv) > 3 else None)
+    stats.close()
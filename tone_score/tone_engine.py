@@ -0,0 +1,232 @@
+import ast
+import sys
+from itertools import chain, repeat
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# tone.ipynb 의 tone 산출을 함수로 옮긴 것.
+# 노트북은 문장마다 파이썬 리스트 컴프리헨션으로 hawkish/dovish 단어를 세고(두 번), apply(axis=1) 로 tone 을 계산했다.
+# 여기서는
+#   - 모든 문장의 토큰을 이어서 한 번만 훑으며 극성(+1 hawkish / -1 dovish / 0) int8 배열로 바꾸고
+#   - 문장 번호별 bincount 로 개수를 센다. (token_store 코퍼스면 vocab 크기의 극성 배열을 token_id 로 인덱싱)
+#   - 문서/일/월 집계는 groupby 합계/평균 + 벡터 연산
+# 계산식과 집계 순서는 노트북과 같아서 결과 CSV 가 같다.
+#   tone = (h - d) / (h + d), h + d = 0 이면 0
+#   문장: 사전 단어 수 -> tone_s,  문서: tone_s > 0 / < 0 인 문장 수 -> tone_i
+#   뉴스/채권: 날짜별 tone_i 평균(z_newsbonds) -> 월평균,  의사록: 업로드 날짜 기준 월평균(z_min)
+#   final_monthly_tone = (2 * z_newsbonds + z_min) / 3  (z_min 이 없는 달은 z_newsbonds)
+
+LEXICON_PATH = '../db/lexicon/total_lexicon.csv'
+INPUT_PATH = '../db/tone/df_for_tone_260107.parquet'
+DATE_MAPPING_PATH = '../db/tone/meeting_date_change.xlsx'
+
+MINUTES_CATEGORY = '의사록'
+EXCLUDE_CATEGORIES = ('의사록', 'press')  # 뉴스/채권 지수에서 빼는 category
+NEWS_WEIGHT = 2
+MINUTES_WEIGHT = 1
+
+HAWKISH, DOVISH = 1, -1
+
+
+def load_lexicon(path=LEXICON_PATH) -> pd.DataFrame:
+    return pd.read_csv(path, encoding='utf-8-sig', index_col=0)
+
+
+class PolarityLookup:
+    """사전 단어 -> 극성 (+1 hawkish / -1 dovish). 토큰 전체를 한 번에 int8 배열로 조회"""
+
+    def __init__(self, lexicon: pd.DataFrame):
+        labels = lexicon['label'][~lexicon.index.duplicated()]
+        labels = labels[labels.isin(['hawkish', 'dovish'])]
+        self.polarity = dict(zip(labels.index, np.where(labels.to_numpy() == 'hawkish', HAWKISH, DOVISH).tolist()))
+
+    @classmethod
+    def from_sets(cls, hawkish_set, dovish_set):
+        """노트북의 hawkish_set / dovish_set 으로 바로 만들기"""
+        lexicon = pd.DataFrame({'label': ['hawkish'] * len(hawkish_set) + ['dovish'] * len(dovish_set)},
+                               index=list(hawkish_set) + list(dovish_set))
+        return cls(lexicon)
+
+    def lookup(self, words, count: int = -1) -> np.ndarray:
+        """단어 iterable -> 극성 배열 (사전에 없으면 0)"""
+        return np.fromiter(map(self.polarity.get, words, repeat(0)), dtype=np.int8, count=count)
+
+    def for_vocab(self, vocab_tokens) -> np.ndarray:
+        """token_store 코퍼스의 vocab(token_id -> 단어) 에 맞춘 극성 배열. token_id 로 바로 인덱싱"""
+        return self.lookup(vocab_tokens, len(vocab_tokens))
+
+
+def convert_to_list(x):
+    """문자열로 저장된 토큰 리스트는 파싱 (노트북과 같음), None 은 빈 리스트"""
+    if isinstance(x, str):
+        return ast.literal_eval(x)
+    return x if x is not None else []
+
+
+def count_hits(tokens, lookup: PolarityLookup):
+    """문장별 (hawkish 단어 수, dovish 단어 수). tokens: 토큰 리스트들 (Series / list)"""
+    token_lists = [convert_to_list(x) for x in tokens]
+    lengths = np.fromiter((len(t) for t in token_lists), dtype=np.int64, count=len(token_lists))
+    polarity = lookup.lookup(chain.from_iterable(token_lists), int(lengths.sum()))
+    return _bincount(lengths, polarity)
+
+
+def count_hits_corpus(corpus, lookup: PolarityLookup):
+    """token_store.TokenCorpus(int32 토큰) 의 문장별 (hawkish, dovish) 단어 수. 문자열을 만들지 않음"""
+    by_id = lookup.for_vocab(corpus.vocab.tokens)
+    n_h, n_d = [], []
+    for _, offsets, values in corpus.chunks():
+        polarity = by_id[values[offsets[0]:offsets[-1]]]
+        h, d = _bincount(np.diff(offsets), polarity)
+        n_h.append(h)
+        n_d.append(d)
+    if not n_h:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return np.concatenate(n_h), np.concatenate(n_d)
+
+
+def _bincount(lengths, polarity):
+    rows = np.repeat(np.arange(len(lengths)), lengths)
+    n_h = np.bincount(rows[polarity == HAWKISH], minlength=len(lengths))
+    n_d = np.bincount(rows[polarity == DOVISH], minlength=len(lengths))
+    return n_h, n_d
+
+
+def calculate_tone(n_hawkish, n_dovish) -> np.ndarray:
+    """(h - d) / (h + d), 분모가 0 이면 0 (배열 연산)"""
+    n_hawkish = np.asarray(n_hawkish, dtype=np.float64)
+    n_dovish = np.asarray(n_dovish, dtype=np.float64)
+    denominator = n_hawkish + n_dovish
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(denominator == 0, 0.0, (n_hawkish - n_dovish) / denominator)
+
+
+def sentence_tone(df: pd.DataFrame, lookup: PolarityLookup, counts=None) -> pd.DataFrame:
+    """
+    문장별 n_h_feat / n_d_feat / tone_s / is_h_sent / is_d_sent 컬럼 추가.
+    counts: 미리 센 (n_h, n_d) (예: count_hits_corpus 결과, df 와 같은 행 순서).
+    tokens 없이 n_h_feat / n_d_feat 만 있는 df (run_production 의 사전 매칭 모드 출력)는 그 값을 그대로 씀
+    """
+    if counts is None and 'tokens' not in df.columns and {'n_h_feat', 'n_d_feat'} <= set(df.columns):
+        counts = (df['n_h_feat'].to_numpy(), df['n_d_feat'].to_numpy())
+    n_h, n_d = counts if counts is not None else count_hits(df['tokens'], lookup)
+    df = df.copy()
+    df['n_h_feat'] = n_h
+    df['n_d_feat'] = n_d
+    df['tone_s'] = calculate_tone(n_h, n_d)
+    df['is_h_sent'] = df['tone_s'] > 0
+    df['is_d_sent'] = df['tone_s'] < 0
+    return df
+
+
+def doc_tone(sentences: pd.DataFrame) -> pd.DataFrame:
+    """문서(doc_id, date)별 hawkish/dovish 문장 수 -> tone_i"""
+    doc_level = sentences.groupby(['doc_id', 'date']).agg(
+        n_h_sents=('is_h_sent', 'sum'),
+        n_d_sents=('is_d_sent', 'sum')
+    ).reset_index()
+    doc_level['tone_i'] = calculate_tone(doc_level['n_h_sents'], doc_level['n_d_sents'])
+    return doc_level
+
+
+def daily_tone(doc_level: pd.DataFrame, name='z_newsbonds') -> pd.DataFrame:
+    daily = doc_level.groupby('date')['tone_i'].mean().reset_index()
+    daily.columns = ['date', name]
+    return daily.sort_values(by='date', ascending=True).reset_index(drop=True)
+
+
+def monthly_mean(df: pd.DataFrame, column: str, name: str = None) -> pd.DataFrame:
+    """날짜 컬럼 기준 월초(MS) 평균"""
+    monthly = df.resample('MS', on='date')[column].mean().reset_index()
+    monthly.columns = ['date', name or column]
+    return monthly
+
+
+def load_date_mapping(path=DATE_MAPPING_PATH) -> pd.DataFrame:
+    date_mapping = pd.read_excel(path)
+    date_mapping['회의 날짜'] = pd.to_datetime(date_mapping['회의 날짜'])
+    date_mapping['업로드 날짜'] = pd.to_datetime(date_mapping['업로드 날짜'])
+    return date_mapping
+
+
+def remap_meeting_dates(df: pd.DataFrame, date_mapping: pd.DataFrame) -> pd.DataFrame:
+    """의사록 날짜(회의 날짜) -> 공개(업로드) 날짜. 매핑에 없는 날짜는 그대로"""
+    df = df.copy()
+    df['date'] = pd.to_datetime(df['date'])
+    df = pd.merge(df, date_mapping, left_on='date', right_on='회의 날짜', how='left')
+    df['date'] = df['업로드 날짜'].fillna(df['date'])
+    return df.drop(columns=['회의 날짜', '업로드 날짜'])
+
+
+def combine_monthly(monthly_newsbonds: pd.DataFrame, monthly_minutes: pd.DataFrame) -> pd.DataFrame:
+    final_tone_df = pd.merge(monthly_newsbonds, monthly_minutes, on='date', how='left')
+    final_tone_df['final_monthly_tone'] = np.where(
+        final_tone_df['z_min'].notnull(),
+        (final_tone_df['z_newsbonds'] * NEWS_WEIGHT + final_tone_df['z_min'] * MINUTES_WEIGHT)
+        / (NEWS_WEIGHT + MINUTES_WEIGHT),
+        final_tone_df['z_newsbonds']
+    )
+    return final_tone_df
+
+
+def compute_tone(df: pd.DataFrame, lookup: PolarityLookup, exclude_categories=EXCLUDE_CATEGORIES,
+                 minutes_category=MINUTES_CATEGORY, date_mapping: pd.DataFrame = None, counts=None) -> dict:
+    """
+    문장 단위 df(doc_id, date, tokens, category) -> {'daily': 뉴스/채권 일별, 'monthly_newsbonds': 월별,
+    'monthly_minutes': 의사록 월별, 'final': 합산 월별}.
+    - 단어 수는 전체 문장에 대해 한 번만 세고 category 로 나눔
+    - date_mapping 을 주면 의사록 날짜를 업로드 날짜로 바꿔서 월별 집계 (None 이면 그대로)
+    - minutes_category=None 이면 의사록 지수 없이 final = z_newsbonds
+    """
+    sentences = sentence_tone(df, lookup, counts)
+    sentences['date'] = pd.to_datetime(sentences['date'])
+    category = sentences['category']
+
+    news = sentences[~category.isin(list(exclude_categories))]
+    daily = daily_tone(doc_tone(news))
+    monthly_newsbonds = monthly_mean(daily, 'z_newsbonds')
+
+    if minutes_category is not None:
+        minutes = sentences[category == minutes_category]
+        if date_mapping is not None:
+            minutes = remap_meeting_dates(minutes, date_mapping)
+        monthly_minutes = monthly_mean(doc_tone(minutes), 'tone_i', 'z_min')
+    else:
+        monthly_minutes = pd.DataFrame({'date': pd.Series(dtype='datetime64[ns]'), 'z_min': pd.Series(dtype=float)})
+
+    return {
+        'daily': daily,
+        'monthly_newsbonds': monthly_newsbonds,
+        'monthly_minutes': monthly_minutes,
+        'final': combine_monthly(monthly_newsbonds, monthly_minutes),
+    }
+
+
+def main(input_path=INPUT_PATH, lexicon_path=LEXICON_PATH, date_mapping_path=DATE_MAPPING_PATH, output_dir='.'):
+    lexicon = load_lexicon(lexicon_path)
+    lookup = PolarityLookup(lexicon)
+    n_hawkish = sum(1 for p in lookup.polarity.values() if p == HAWKISH)
+    print(f"✅ 사전 로드 완료: 매파 단어 {n_hawkish}개, 비둘기파 단어 {len(lookup.polarity) - n_hawkish}개")
+
+    df = pd.read_parquet(input_path)
+    date_mapping = load_date_mapping(date_mapping_path) if date_mapping_path else None
+    result = compute_tone(df, lookup, date_mapping=date_mapping)
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    result['daily'].to_csv(output_dir / 'daily_tone_news_bonds.csv', index=False, encoding='utf-8-sig')
+    result['monthly_minutes'].to_csv(output_dir / 'monthly_minutes_tone.csv', index=False, encoding='utf-8-sig')
+    result['final'].to_csv(output_dir / 'final_monthly_tone_index.csv', index=False, encoding='utf-8-sig')
+    print(f"💾 일별 {len(result['daily']):,}일 / 월별 {len(result['final']):,}개월 -> {output_dir}")
+    return result
+
+
+# 사용법: python tone_engine.py [df_for_tone parquet] [total_lexicon.csv] [meeting_date_change.xlsx] [출력 폴더]
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(args[0] if len(args) > 0 else INPUT_PATH,
+         args[1] if len(args) > 1 else LEXICON_PATH,
+         args[2] if len(args) > 2 else DATE_MAPPING_PATH,
+         args[3] if len(args) > 3 else '.')
@@ -0,0 +1,203 @@
+import math
+import sqlite3
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from tone_engine import (DATE_MAPPING_PATH, EXCLUDE_CATEGORIES, LEXICON_PATH, MINUTES_CATEGORY, PolarityLookup,
+                         calculate_tone, combine_monthly, doc_tone, load_date_mapping, load_lexicon,
+                         remap_meeting_dates, sentence_tone)
+
+# tone 지수 집계 상태를 SQLite 에 저장해서 새 문서만 반영하는 저장소.
+#   docs   : 문서(doc_id, date)별 hawkish/dovish 문장 수와 tone_i, 어느 지수에 들어가는지(stream: news / minutes)
+#   days   : 뉴스/채권 날짜별 문서 수, tone_i 합, 평균(z_newsbonds)
+#   months : stream 별 월 합계/평균. news 는 일별 z 의 월평균, minutes 는 의사록 문서 tone_i 의 월평균
+# 문서를 넣거나 지우면 그 문서가 속한 날/달만 자식 행에서 다시 합산한다 (math.fsum).
+# 빼기로 누적하지 않으므로 추가/삭제를 반복해도 오차가 쌓이지 않고, 값은 tone_engine(노트북)의 식과 같다.
+# 조회(daily / monthly_minutes / final)는 이미 집계된 행만 읽음.
+
+STORE_PATH = '../db/tone/tone_store.sqlite'
+NEWS, MINUTES = 'news', 'minutes'
+_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+_SQL_CHUNK = 500
+
+
+class ToneStore:
+    def __init__(self, path=STORE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=60)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS docs (
+                doc_id TEXT NOT NULL, date TEXT NOT NULL, stream TEXT NOT NULL, month TEXT NOT NULL,
+                n_h_sents INTEGER NOT NULL, n_d_sents INTEGER NOT NULL, tone_i REAL NOT NULL,
+                PRIMARY KEY (doc_id, date)
+            );
+            CREATE INDEX IF NOT EXISTS docs_stream_date ON docs (stream, date);
+            CREATE INDEX IF NOT EXISTS docs_stream_month ON docs (stream, month);
+            CREATE TABLE IF NOT EXISTS days (
+                date TEXT PRIMARY KEY, month TEXT NOT NULL, n_docs INTEGER NOT NULL, tone_sum REAL NOT NULL,
+                z REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS months (
+                stream TEXT NOT NULL, month TEXT NOT NULL, n INTEGER NOT NULL, tone_sum REAL NOT NULL,
+                z REAL NOT NULL, PRIMARY KEY (stream, month)
+            );
+        """)
+
+    # ---------- 쓰기 ----------
+    def _old_rows(self, doc_ids):
+        rows = []
+        for i in range(0, len(doc_ids), _SQL_CHUNK):
+            part = doc_ids[i:i + _SQL_CHUNK]
+            rows += self._conn.execute(
+                f"SELECT stream, date, month FROM docs WHERE doc_id IN ({','.join('?' * len(part))})", part).fetchall()
+        return rows
+
+    def _delete(self, doc_ids):
+        for i in range(0, len(doc_ids), _SQL_CHUNK):
+            part = doc_ids[i:i + _SQL_CHUNK]
+            self._conn.execute(f"DELETE FROM docs WHERE doc_id IN ({','.join('?' * len(part))})", part)
+
+    def upsert_docs(self, doc_level: pd.DataFrame, stream: str) -> int:
+        """
+        doc_tone 결과(doc_id, date, n_h_sents, n_d_sents) 를 stream 에 반영. 같은 doc_id 가 이미 있으면 통째로 교체
+        (수정된 문서). 한 문서의 문장은 한 번에 넣을 것. 반환: 반영한 문서 행 수
+        """
+        if not len(doc_level):
+            return 0
+        dates = pd.to_datetime(doc_level['date'])
+        rows = list(zip(doc_level['doc_id'].astype(str), dates.dt.strftime(_DATE_FORMAT), [stream] * len(dates),
+                        dates.dt.to_period('M').dt.start_time.dt.strftime(_DATE_FORMAT),
+                        doc_level['n_h_sents'].astype(int).tolist(), doc_level['n_d_sents'].astype(int).tolist(),
+                        calculate_tone(doc_level['n_h_sents'], doc_level['n_d_sents']).tolist()))
+        doc_ids = sorted(set(r[0] for r in rows))
+        with self._conn:
+            touched = self._old_rows(doc_ids)
+            self._delete(doc_ids)
+            self._conn.executemany("INSERT INTO docs VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self._refresh(touched + [(r[2], r[1], r[3]) for r in rows])
+        return len(rows)
+
+    def delete_docs(self, doc_ids) -> int:
+        """문서 삭제 (그 문서가 들어 있던 날/달 집계에서 빠짐). 반환: 지운 문서 행 수"""
+        doc_ids = sorted(set(str(d) for d in doc_ids))
+        with self._conn:
+            touched = self._old_rows(doc_ids)
+            self._delete(doc_ids)
+            self._refresh(touched)
+        return len(touched)
+
+    def _refresh(self, touched):
+        """(stream, date, month) 목록의 날/달 집계를 자식 행에서 다시 계산"""
+        news_days = sorted(set(d for s, d, _ in touched if s == NEWS))
+        months = sorted(set((s, m) for s, _, m in touched))
+
+        for date in news_days:
+            tones = [t for (t,) in self._conn.execute(
+                "SELECT tone_i FROM docs WHERE stream = ? AND date = ?", (NEWS, date))]
+            if tones:
+                total = math.fsum(tones)
+                month = self._conn.execute("SELECT month FROM docs WHERE stream = ? AND date = ? LIMIT 1",
+                                           (NEWS, date)).fetchone()[0]
+                self._conn.execute("INSERT OR REPLACE INTO days VALUES (?, ?, ?, ?, ?)",
+                                   (date, month, len(tones), total, total / len(tones)))
+            else:
+                self._conn.execute("DELETE FROM days WHERE date = ?", (date,))
+
+        for stream, month in months:
+            if stream == NEWS:
+                values = [z for (z,) in self._conn.execute("SELECT z FROM days WHERE month = ?", (month,))]
+            else:
+                values = [t for (t,) in self._conn.execute(
+                    "SELECT tone_i FROM docs WHERE stream = ? AND month = ?", (stream, month))]
+            if values:
+                total = math.fsum(values)
+                self._conn.execute("INSERT OR REPLACE INTO months VALUES (?, ?, ?, ?, ?)",
+                                   (stream, month, len(values), total, total / len(values)))
+            else:
+                self._conn.execute("DELETE FROM months WHERE stream = ? AND month = ?", (stream, month))
+
+    def add_sentences(self, df: pd.DataFrame, lookup: PolarityLookup = None, counts=None,
+                      exclude_categories=EXCLUDE_CATEGORIES, minutes_category=MINUTES_CATEGORY,
+                      date_mapping: pd.DataFrame = None) -> dict:
+        """
+        문장 단위 df(doc_id, date, tokens 또는 n_h_feat/n_d_feat, category) 를 점수화해서 반영.
+        category 나누기 / 의사록 날짜 변환은 tone_engine.compute_tone 과 같음.
+        어느 지수에도 안 들어가는 category(press 등)로 바뀐 문서는 기존 집계에서 빠짐
+        """
+        sentences = sentence_tone(df, lookup, counts)
+        sentences['date'] = pd.to_datetime(sentences['date'])
+        category = sentences['category']
+        news = sentences[~category.isin(list(exclude_categories))]
+        minutes = sentences[category == minutes_category] if minutes_category is not None else sentences.iloc[:0]
+        if date_mapping is not None:
+            minutes = remap_meeting_dates(minutes, date_mapping)
+
+        others = set(sentences['doc_id'].astype(str)) - set(news['doc_id'].astype(str)) \
+            - set(minutes['doc_id'].astype(str))
+        result = {NEWS: self.upsert_docs(doc_tone(news), NEWS),
+                  MINUTES: self.upsert_docs(doc_tone(minutes), MINUTES),
+                  'removed': self.delete_docs(others) if others else 0}
+        return result
+
+    # ---------- 조회 ----------
+    def _months(self, stream: str) -> pd.Series:
+        rows = self._conn.execute("SELECT month, z FROM months WHERE stream = ? ORDER BY month", (stream,)).fetchall()
+        if not rows:
+            return pd.Series(dtype=float, index=pd.DatetimeIndex([], name='date'))
+        index = pd.DatetimeIndex(pd.to_datetime([m for m, _ in rows]), name='date')
+        z = pd.Series([v for _, v in rows], index=index)
+        # resample('MS') 처럼 처음~끝 사이 빈 달은 NaN
+        return z.reindex(pd.date_range(index[0], index[-1], freq='MS', name='date'))
+
+    def daily(self) -> pd.DataFrame:
+        """daily_tone_news_bonds.csv 와 같은 형식 (date, z_newsbonds)"""
+        rows = self._conn.execute("SELECT date, z FROM days ORDER BY date").fetchall()
+        return pd.DataFrame({'date': pd.to_datetime([d for d, _ in rows]),
+                             'z_newsbonds': np.array([z for _, z in rows], dtype=float)})
+
+    def monthly_newsbonds(self) -> pd.DataFrame:
+        return self._months(NEWS).rename('z_newsbonds').reset_index()
+
+    def monthly_minutes(self) -> pd.DataFrame:
+        """monthly_minutes_tone.csv 와 같은 형식 (date, z_min)"""
+        return self._months(MINUTES).rename('z_min').reset_index()
+
+    def final(self) -> pd.DataFrame:
+        """final_monthly_tone_index.csv 와 같은 형식"""
+        return combine_monthly(self.monthly_newsbonds(), self.monthly_minutes())
+
+    def export(self, output_dir='.'):
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        self.daily().to_csv(output_dir / 'daily_tone_news_bonds.csv', index=False, encoding='utf-8-sig')
+        self.monthly_minutes().to_csv(output_dir / 'monthly_minutes_tone.csv', index=False, encoding='utf-8-sig')
+        self.final().to_csv(output_dir / 'final_monthly_tone_index.csv', index=False, encoding='utf-8-sig')
+
+    def close(self):
+        self._conn.close()
+
+
+# 사용법:
+#   python tone_store.py add <문장 parquet> [total_lexicon.csv] [meeting_date_change.xlsx]
+#   python tone_store.py delete <doc_id,...>
+#   python tone_store.py export [출력 폴더]
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else 'export'
+    store = ToneStore()
+    if command == 'add':
+        df = pd.read_parquet(sys.argv[2])
+        lookup = PolarityLookup(load_lexicon(sys.argv[3] if len(sys.argv) > 3 else LEXICON_PATH))
+        mapping = load_date_mapping(sys.argv[4] if len(sys.argv) > 4 else DATE_MAPPING_PATH)
+        print(f"[INFO] 반영: {store.add_sentences(df, lookup, date_mapping=mapping)}")
+    elif command == 'delete':
+        print(f"[INFO] 삭제한 문서 {store.delete_docs(sys.argv[2].split(','))}개")
+    else:
+        store.export(sys.argv[2] if len(sys.argv) > 2 else '.')
+        print("[DONE] daily_tone_news_bonds.csv / monthly_minutes_tone.csv / final_monthly_tone_index.csv")
+    store.close()
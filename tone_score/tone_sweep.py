@@ -0,0 +1,231 @@
+import sys
+from itertools import chain, repeat
+
+import numpy as np
+import pandas as pd
+
+from tone_engine import (DATE_MAPPING_PATH, EXCLUDE_CATEGORIES, INPUT_PATH, MINUTES_CATEGORY, calculate_tone,
+                         combine_monthly, convert_to_list, load_date_mapping)
+
+# 사전 threshold / 필터 변형(candidate) 여러 개의 월별 tone 을 토큰을 한 번만 훑어서 계산.
+# 노트북에서는 threshold(1.3)나 lexicon_visual.ipynb 의 변형(뉴스 템플릿 단어 제거, 로그 점수 IQR 울타리)마다
+# 사전을 다시 만들고 tone.ipynb 를 처음부터 다시 돌려야 했다.
+#
+# 방법
+#   - 연속 점수 사전(polarity_score)의 단어를 (뉴스 템플릿 단어 여부, 점수) 순으로 정렬해 번호(code)를 붙이면
+#     candidate 의 hawkish/dovish 단어 집합은 이 번호의 구간 몇 개가 된다 (점수 조건이 단조라서).
+#   - 모든 candidate 의 구간 경계를 모아 버킷을 나누고, 문장별 버킷 히스토그램의 누적합을 한 번 만들면
+#     candidate 하나의 문장별 hawkish/dovish 단어 수는 누적합 열 몇 개의 차이.
+#   - 문장 -> 문서 -> 일 -> 월 집계는 tone_engine 과 같은 순서/연산 (candidate 는 열로 한꺼번에 groupby)
+# 사전에 한 번도 안 걸린 문장은 모든 candidate 에서 tone_s = 0 이라 건너뛴다.
+
+LEXICON_PATH = '../db/lexicon/full_lexicon.csv'  # split 전 final_lexicon (polarity_score 전체)
+OUTPUT_PATH = 'tone_sweep.csv'
+
+THRESHOLDS = (1.1, 1.2, 1.3, 1.4, 1.5, 1.75, 2.0)
+BAD_WORDS = ['기자', '포토', '뉴스', '무단', '전재', '배포', '금지', '구독', '신청', '갤러리', '화보', '티타임']
+VARIANTS = {
+    'base': {'drop_bad_words': False, 'iqr_k': None},
+    'no_news': {'drop_bad_words': True, 'iqr_k': None},  # lexicon_visual.ipynb 의 df_no_news
+    'iqr': {'drop_bad_words': True, 'iqr_k': 1.2},  # lexicon_visual.ipynb 의 df_clean
+}
+HIST_CELLS = 10_000_000  # 누적합 chunk 크기 (문장 수 x 버킷 수)
+
+
+def prepare_lexicon(lexicon: pd.DataFrame, bad_words=BAD_WORDS) -> pd.DataFrame:
+    """
+    사전 -> 번호 순서로 정렬한 표 (index: word / polarity_score, log_score, is_bad).
+    뉴스 템플릿 단어가 아닌 것 먼저, 그 안에서는 점수 오름차순. 행 번호가 곧 code
+    """
+    lex = lexicon.loc[~lexicon.index.duplicated(), ['polarity_score']].dropna()
+    lex = lex.assign(log_score=np.log10(lex['polarity_score']),
+                     is_bad=lex.index.to_series().astype(str).str.contains('|'.join(bad_words)).to_numpy())
+    return lex.sort_values(['is_bad', 'polarity_score'], kind='mergesort')
+
+
+def candidate_sets(lex: pd.DataFrame, thresholds=THRESHOLDS, variants=VARIANTS) -> list:
+    """
+    (threshold, variant) 마다 hawkish/dovish 단어 mask (lex 행 순서).
+    threshold: score > t -> hawkish, score < 1/t -> dovish (lexicon.ipynb)
+    iqr_k: 남은 단어들의 log10 점수 Q1 - k*IQR ~ Q3 + k*IQR 밖은 제외 (lexicon_visual.ipynb)
+    """
+    score = lex['polarity_score'].to_numpy()
+    log_score = lex['log_score'].to_numpy()
+    is_bad = lex['is_bad'].to_numpy()
+    candidates = []
+    for variant, opts in variants.items():
+        allowed = ~is_bad if opts.get('drop_bad_words') else np.ones(len(lex), dtype=bool)
+        for t in thresholds:
+            hawkish = allowed & (score > t)
+            dovish = allowed & (score < (1 / t))
+            k = opts.get('iqr_k')
+            if k is not None:
+                selected = pd.Series(log_score[hawkish | dovish])
+                q1, q3 = selected.quantile(0.25), selected.quantile(0.75)
+                fence = (log_score >= q1 - k * (q3 - q1)) & (log_score <= q3 + k * (q3 - q1))
+                hawkish &= fence
+                dovish &= fence
+            candidates.append({'candidate': f"{variant}@{t:g}", 'threshold': t, 'variant': variant,
+                               'hawkish': hawkish, 'dovish': dovish})
+    return candidates
+
+
+def _runs(mask) -> list:
+    """bool mask -> [(start, end), ...] 연속 구간"""
+    edges = np.flatnonzero(np.diff(np.concatenate([[False], mask, [False]]).astype(np.int8)))
+    return list(zip(edges[::2].tolist(), edges[1::2].tolist()))
+
+
+def token_codes(df: pd.DataFrame, lex: pd.DataFrame):
+    """사전에 있는 토큰만 (문장 번호, code) 배열로. 토큰을 한 번만 훑음"""
+    code_of = dict(zip(lex.index, range(len(lex))))
+    token_lists = [convert_to_list(x) for x in df['tokens']]
+    lengths = np.fromiter((len(t) for t in token_lists), dtype=np.int64, count=len(token_lists))
+    codes = np.fromiter(map(code_of.get, chain.from_iterable(token_lists), repeat(-1)),
+                        dtype=np.int64, count=int(lengths.sum()))
+    rows = np.repeat(np.arange(len(lengths)), lengths)
+    hit = codes >= 0
+    return rows[hit], codes[hit]
+
+
+def corpus_codes(corpus, lex: pd.DataFrame):
+    """token_store.TokenCorpus 버전: vocab 크기의 code 배열을 token_id 로 인덱싱"""
+    code_of = dict(zip(lex.index, range(len(lex))))
+    by_id = np.fromiter(map(code_of.get, corpus.vocab.tokens, repeat(-1)), dtype=np.int64,
+                        count=len(corpus.vocab))
+    rows, codes = [], []
+    for row_start, offsets, values in corpus.chunks():
+        c = by_id[values[offsets[0]:offsets[-1]]]
+        r = row_start + np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+        rows.append(r[c >= 0])
+        codes.append(c[c >= 0])
+    if not rows:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return np.concatenate(rows), np.concatenate(codes)
+
+
+def _doc_index(df: pd.DataFrame, exclude_categories, minutes_category, date_mapping):
+    """
+    문장 -> 문서 번호 (뉴스/채권 문서 먼저, 그다음 의사록 문서, 나머지 category 는 -1).
+    문서 순서는 tone_engine 의 groupby(['doc_id', 'date']) 와 같음. 의사록 날짜는 업로드 날짜로 바꿈
+    """
+    dates = pd.to_datetime(df['date'])
+    category = df['category']
+    is_news = ~category.isin(list(exclude_categories)).to_numpy()
+    is_minutes = (category == minutes_category).to_numpy() if minutes_category is not None \
+        else np.zeros(len(df), dtype=bool)
+    if date_mapping is not None:
+        mapping = date_mapping.drop_duplicates('회의 날짜').set_index('회의 날짜')['업로드 날짜']
+        remapped = dates.map(mapping).fillna(dates)
+        dates = dates.where(~is_minutes, remapped)
+
+    doc_of_row = np.full(len(df), -1, dtype=np.int64)
+    doc_frames = []
+    offset = 0
+    for part in (is_news, is_minutes):
+        keys = pd.DataFrame({'doc_id': df['doc_id'].to_numpy()[part], 'date': dates.to_numpy()[part]})
+        grouped = keys.groupby(['doc_id', 'date'], sort=True)
+        doc_of_row[part] = offset + grouped.ngroup().to_numpy()
+        docs = grouped.size().reset_index()[['doc_id', 'date']]
+        doc_frames.append(docs)
+        offset += len(docs)
+    return doc_of_row, doc_frames[0], doc_frames[1]
+
+
+def sweep(df: pd.DataFrame, lexicon: pd.DataFrame, thresholds=THRESHOLDS, variants=VARIANTS,
+          exclude_categories=EXCLUDE_CATEGORIES, minutes_category=MINUTES_CATEGORY,
+          date_mapping: pd.DataFrame = None, corpus=None) -> pd.DataFrame:
+    """
+    문장 단위 df(doc_id, date, tokens, category) -> candidate x 월 tidy 표
+    (candidate, threshold, variant, n_hawkish_words, n_dovish_words, date, z_newsbonds, z_min, final_monthly_tone).
+    corpus 를 주면 토큰은 token_store 코퍼스에서 읽음 (df 는 같은 행 순서의 메타데이터)
+    """
+    lex = prepare_lexicon(lexicon)
+    candidates = candidate_sets(lex, thresholds, variants)
+    n_cand = len(candidates)
+
+    # 구간 경계 -> 버킷. 누적합 cum[:, k] = code < edges[k] 인 토큰 수
+    runs = [(_runs(c['hawkish']), _runs(c['dovish'])) for c in candidates]
+    edges = np.unique([b for h, d in runs for s, e in h + d for b in (s, e)]).astype(np.int64)
+    col = {int(e): i for i, e in enumerate(edges)}
+
+    rows, codes = corpus_codes(corpus, lex) if corpus is not None else token_codes(df, lex)
+    doc_of_row, news_docs, minutes_docs = _doc_index(df, exclude_categories, minutes_category, date_mapping)
+    keep = doc_of_row[rows] >= 0
+    rows, codes = rows[keep], codes[keep]
+    buckets = np.searchsorted(edges, codes, side='right')
+    n_docs = len(news_docs) + len(minutes_docs)
+    print(f"[INFO] candidate {n_cand}개 / 버킷 {len(edges) + 1}개 / 사전 단어 등장 {len(codes):,}회 / 문서 {n_docs:,}개")
+
+    # 사전에 걸린 문장만 (sent = 0..n_hit-1)
+    hit_rows, sent = np.unique(rows, return_inverse=True)
+    hit_docs = doc_of_row[hit_rows]
+    n_buckets = len(edges) + 1
+    chunk = max(1, HIST_CELLS // n_buckets)
+    doc_h = np.zeros((n_cand, n_docs), dtype=np.int32)
+    doc_d = np.zeros((n_cand, n_docs), dtype=np.int32)
+    bounds = np.searchsorted(sent, np.arange(0, len(hit_rows) + chunk, chunk))
+    for i, s0 in enumerate(range(0, len(hit_rows), chunk)):
+        s1 = min(s0 + chunk, len(hit_rows))
+        a, b = bounds[i], bounds[i + 1]
+        hist = np.bincount((sent[a:b] - s0) * n_buckets + buckets[a:b], minlength=(s1 - s0) * n_buckets)
+        cum = np.cumsum(hist.reshape(s1 - s0, n_buckets), axis=1)
+        docs, local = np.unique(hit_docs[s0:s1], return_inverse=True)
+        for c, (h_runs, d_runs) in enumerate(runs):
+            n_h = sum((cum[:, col[e]] - cum[:, col[s]] for s, e in h_runs), np.zeros(s1 - s0, dtype=np.int64))
+            n_d = sum((cum[:, col[e]] - cum[:, col[s]] for s, e in d_runs), np.zeros(s1 - s0, dtype=np.int64))
+            # tone_s > 0 <=> n_h > n_d
+            doc_h[c, docs] += np.bincount(local[n_h > n_d], minlength=len(docs)).astype(np.int32)
+            doc_d[c, docs] += np.bincount(local[n_d > n_h], minlength=len(docs)).astype(np.int32)
+
+    names = [c['candidate'] for c in candidates]
+    tone_i = pd.DataFrame(calculate_tone(doc_h, doc_d).T, columns=names)
+    n_news = len(news_docs)
+
+    # 뉴스/채권: 날짜별 문서 평균 -> 월평균 (tone_engine.daily_tone / monthly_mean 과 같은 연산)
+    news = tone_i.iloc[:n_news].assign(date=news_docs['date'].to_numpy())
+    daily = news.groupby('date')[names].mean().sort_index()
+    monthly_news = daily.resample('MS').mean()
+    # 의사록: 문서 -> 월평균
+    minutes = tone_i.iloc[n_news:].set_index(pd.DatetimeIndex(minutes_docs['date'].to_numpy(), name='date'))
+    monthly_minutes = minutes.resample('MS').mean() if len(minutes) else minutes
+
+    frames = []
+    for c in candidates:
+        name = c['candidate']
+        final = combine_monthly(
+            monthly_news[name].rename('z_newsbonds').reset_index(),
+            monthly_minutes[name].rename('z_min').reset_index() if len(monthly_minutes)
+            else pd.DataFrame({'date': pd.Series(dtype='datetime64[ns]'), 'z_min': pd.Series(dtype=float)}),
+        )
+        frames.append(final.assign(candidate=name, threshold=c['threshold'], variant=c['variant'],
+                                   n_hawkish_words=int(c['hawkish'].sum()), n_dovish_words=int(c['dovish'].sum())))
+    columns = ['candidate', 'threshold', 'variant', 'n_hawkish_words', 'n_dovish_words',
+               'date', 'z_newsbonds', 'z_min', 'final_monthly_tone']
+    return pd.concat(frames, ignore_index=True)[columns]
+
+
+def to_wide(table: pd.DataFrame, value: str = 'final_monthly_tone') -> pd.DataFrame:
+    """tidy 표 -> date x candidate (final_monthly_merged_renamed.csv 의 tone 열과 나란히 붙이기 좋게)"""
+    return table.pivot(index='date', columns='candidate', values=value)
+
+
+def main(input_path=INPUT_PATH, lexicon_path=LEXICON_PATH, date_mapping_path=DATE_MAPPING_PATH,
+         output_path=OUTPUT_PATH, thresholds=THRESHOLDS):
+    lexicon = pd.read_csv(lexicon_path, encoding='utf-8-sig', index_col=0)
+    df = pd.read_parquet(input_path)
+    date_mapping = load_date_mapping(date_mapping_path) if date_mapping_path else None
+    table = sweep(df, lexicon, thresholds, date_mapping=date_mapping)
+    table.to_csv(output_path, index=False, encoding='utf-8-sig')
+    print(f"💾 candidate {table['candidate'].nunique()}개 x 월 {table['date'].nunique()}개 -> {output_path}")
+    return table
+
+
+# 사용법: python tone_sweep.py [df_for_tone parquet] [polarity_score 사전 csv] [출력 csv] [threshold,...]
+# 사전은 split 전 전체 단어 사전 (lexicon_builder.build_lexicon 결과). total_lexicon.csv 를 주면 1.3 이상만 의미 있음
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(args[0] if len(args) > 0 else INPUT_PATH,
+         args[1] if len(args) > 1 else LEXICON_PATH,
+         output_path=args[2] if len(args) > 2 else OUTPUT_PATH,
+         thresholds=[float(t) for t in args[3].split(',')] if len(args) > 3 else THRESHOLDS)